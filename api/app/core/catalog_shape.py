@@ -0,0 +1,98 @@
+"""
+Normalized catalog payloads (``?shape=normalized``).
+
+The default ("nested") product lists embed the full farmer in every
+product, and the consumer retail list repeats ``source_product`` and the
+farmer's name in every item, so a farmer with 40 products is serialized 40
+times. The normalized shape sends each item with ``farmer_id`` (and, for
+retail items, ``source_product_id``) references plus one map per referenced
+entity::
+
+    {"items": [{"id": 1, "farmer_id": 3, ...}], "farmers": {"3": {...}}, "total": ..., "skip": ..., "limit": ...}
+
+Both helpers return a ready ``Response`` through the fast JSON path
+(``app.core.fast_json``), so headers set on the route's injected response
+have to be passed in. Validated farmer entries are reused while the
+farmer's ``row_version`` is unchanged (``updated_at`` can stay the same
+across edits, see ``app.core.http_cache``).
+"""
+from typing import Dict, List, Literal, Optional, Sequence
+
+from fastapi import Response
+
+from app.core.cache import TTLCache
+from app.core.fast_json import FastJSONResponse, model_response
+from app.schemas.farmer import FarmerResponse
+from app.schemas.product import NormalizedProductListResponse
+
+CatalogShape = Literal["nested", "normalized"]
+
+_farmer_entries = TTLCache(maxsize=1024, ttl=300.0)
+
+
+def farmer_entry(farmer) -> FarmerResponse:
+    """``FarmerResponse`` for ``farmer``, reused until the row's ``row_version`` changes."""
+    key = (farmer.id, farmer.row_version)
+    entry = _farmer_entries.get(key)
+    if entry is None:
+        entry = FarmerResponse.model_validate(farmer)
+        _farmer_entries.set(key, entry)
+    return entry
+
+
+def normalized_products(
+    products: Sequence,
+    total: int,
+    skip: int,
+    limit: int,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """``NormalizedProductListResponse`` for ``Product`` rows loaded with ``Product.farmer``."""
+    farmers: Dict[int, FarmerResponse] = {}
+    for product in products:
+        farmer = product.farmer
+        if farmer is not None and farmer.id not in farmers:
+            farmers[farmer.id] = farmer_entry(farmer)
+    payload = {"items": products, "farmers": farmers, "total": total, "skip": skip, "limit": limit}
+    return model_response(NormalizedProductListResponse, payload, headers=headers)
+
+
+def normalized_retail_items(
+    items: List[dict],
+    total: int,
+    skip: int,
+    limit: int,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Normalize consumer retail list dicts (``_retail_to_dict`` / ``_product_to_retail_dict``).
+
+    ``source_product`` moves to ``source_products`` and the farmer's name and
+    ``info_confirmed_at`` to ``farmers``; each item keeps ``source_product_id``
+    and gains ``farmer_id``.
+    """
+    source_products: Dict[int, dict] = {}
+    farmers: Dict[int, dict] = {}
+    normalized = []
+    for item in items:
+        item = dict(item)
+        source = item.pop("source_product", None)
+        info_confirmed_at = item.pop("info_confirmed_at", None)
+        farmer_id = source["farmer_id"] if source else None
+        item["farmer_id"] = farmer_id
+        if source and source["id"] not in source_products:
+            source = dict(source)
+            farmer_name = source.pop("farmer_name", None)
+            source_products[source["id"]] = source
+            if farmer_id is not None and farmer_id not in farmers:
+                farmers[farmer_id] = {"id": farmer_id, "name": farmer_name, "info_confirmed_at": info_confirmed_at}
+        normalized.append(item)
+    payload = {
+        "items": normalized,
+        "source_products": source_products,
+        "farmers": farmers,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+    }
+    return FastJSONResponse(payload, headers=headers)
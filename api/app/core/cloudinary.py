@@ -1,19 +1,26 @@
 import logging
-import cloudinary
-import cloudinary.uploader
 from app.core.config import settings
+from app.core.lazy import LazyModule
 
 logger = logging.getLogger(__name__)
 
-# Initialize Cloudinary
-if settings.CLOUDINARY_CLOUD_NAME:
-    cloudinary.config( 
-      cloud_name = settings.CLOUDINARY_CLOUD_NAME, 
-      api_key = settings.CLOUDINARY_API_KEY, 
+
+def _configure(uploader) -> None:
+    # Importing cloudinary.uploader also imports the cloudinary package
+    import cloudinary
+
+    cloudinary.config(
+      cloud_name = settings.CLOUDINARY_CLOUD_NAME,
+      api_key = settings.CLOUDINARY_API_KEY,
       api_secret = settings.CLOUDINARY_API_SECRET,
       secure = True
     )
-else:
+
+
+# Initialize Cloudinary on first upload (the SDK is imported lazily)
+cloudinary_uploader = LazyModule("cloudinary.uploader", configure=_configure)
+
+if not settings.CLOUDINARY_CLOUD_NAME:
     logger.warning("Cloudinary is not configured. Uploads will fail.")
 
 def upload_image(file_obj, folder: str = "refarm"):
@@ -36,7 +43,7 @@ def upload_image(file_obj, folder: str = "refarm"):
         return None
 
     try:
-        response = cloudinary.uploader.upload(
+        response = cloudinary_uploader.upload(
             file_obj,
             folder=folder,
             resource_type="image"
@@ -74,7 +81,7 @@ def upload_file(file_obj, folder: str = "refarm/docs", resource_type: str = "aut
         if hasattr(file_obj, 'name') and file_obj.name.endswith('.pdf') and resource_type != "raw":
              options["format"] = "pdf"
 
-        response = cloudinary.uploader.upload(file_obj, **options)
+        response = cloudinary_uploader.upload(file_obj, **options)
         return response
     except Exception as e:
         logger.error(f"Cloudinary file upload error: {e}")
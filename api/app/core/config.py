@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+
+    # Startup (disable migrations when a release step runs `alembic upgrade head`)
+    RUN_MIGRATIONS_ON_STARTUP: bool = True
+    RUN_SEED_ON_STARTUP: bool = True
     
     # Security
     SECRET_KEY: str
@@ -105,6 +109,11 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: str = ""
     STRIPE_PUBLISHABLE_KEY: str = ""
     STRIPE_WEBHOOK_SECRET: str = ""
+    STRIPE_GATEWAY: str = "stripe"  # stripe | stub (in-memory, no network)
+    STRIPE_MAX_WORKERS: int = 8  # Threads (and keep-alive connections) for Stripe calls
+    STRIPE_MAX_NETWORK_RETRIES: int = 2  # SDK retries (idempotent via Idempotency-Key)
+    STRIPE_CUSTOMER_CACHE_TTL: int = 3600  # Seconds a verified customer id is trusted
+    STRIPE_CARD_CACHE_TTL: int = 300  # Seconds saved-card listings are cached
 
     # Cloudinary
     CLOUDINARY_CLOUD_NAME: str = ""
@@ -119,9 +128,63 @@ class Settings(BaseSettings):
     EMAIL_FROM: str = ""
     EMAIL_TO: str = "refarmkobe@gmail.com"
     EMAIL_USE_TLS: bool = True
+    EMAIL_SMTP_TIMEOUT: float = 30.0
+    EMAIL_SMTP_POOL_SIZE: int = 2  # Authenticated connections kept open
+    EMAIL_SMTP_MAX_IDLE: float = 240.0  # Seconds before an idle connection is replaced
+    EMAIL_BATCH_WINDOW: float = 0.5  # Seconds to collect messages into one session
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_QUEUE_CAPACITY: int = 1000  # Oldest messages are dropped beyond this
 
     # Timezone
     TZ: str = "Asia/Tokyo"
+
+    # System settings (app_settings table)
+    SETTINGS_POLL_INTERVAL: float = 5.0  # Seconds between version checks for changes made by other workers
+
+    # HTTP conditional responses (ETag / Last-Modified on public catalog endpoints)
+    HTTP_VALIDATOR_TTL: float = 1.0  # Seconds a table's (count, max id, max updated_at) is reused per process
+
+    # Catalog delta sync (/api/catalog/changes)
+    CATALOG_SYNC_OVERLAP: float = 5.0  # Seconds re-scanned before a change token (covers transactions still open when it was issued)
+
+    # Delivery slot cache (public listing / checkout)
+    DELIVERY_SLOT_POLL_INTERVAL: float = 10.0  # Seconds between change checks for slots edited by other workers
+
+    # PDF rendering (invoice / delivery slip)
+    PDF_RENDERER: str = "weasyprint"  # weasyprint | reportlab
+    PDF_FONT_PATH: str = ""  # TTF for the ReportLab renderer (default: installed IPA Gothic, else CID font)
+    PDF_WARMUP_ON_STARTUP: bool = True  # Load fonts/stylesheets/templates in the background after startup
+
+    # Consumer event ingestion (write-behind buffer)
+    CONSUMER_EVENT_BUFFER_ENABLED: bool = True
+    CONSUMER_EVENT_BUFFER_CAPACITY: int = 20000  # max queued rows per process
+    CONSUMER_EVENT_FLUSH_SIZE: int = 500
+    CONSUMER_EVENT_FLUSH_INTERVAL: float = 2.0  # seconds
+    CONSUMER_EVENT_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest | drop_newest | reject
+    CONSUMER_EVENT_BATCH_MAX: int = 100  # events per batch request
+
+    # Log retention / archival (app/services/retention.py)
+    LOG_RETENTION_MONTHS: int = 12  # closed months kept in the database
+    ARCHIVE_DIR: str = "./archive"  # CSV.gz exports of purged months
+
+    # Live consumer analytics (in-process sketches, persisted per worker)
+    LIVE_ANALYTICS_ENABLED: bool = True
+    LIVE_ANALYTICS_CAPACITY: int = 200  # Space-Saving counters per summary
+    LIVE_ANALYTICS_FLUSH_INTERVAL: float = 30.0  # seconds
+
+    # Guest (QR) telemetry buffer
+    GUEST_TELEMETRY_BUFFER_ENABLED: bool = True
+    GUEST_TELEMETRY_CAPACITY: int = 20000  # max pending visits + updates + interactions
+    GUEST_TELEMETRY_FLUSH_INTERVAL: float = 2.0  # seconds
+    GUEST_VISIT_ID_BLOCK_SIZE: int = 50  # visit ids prefetched per sequence round trip
+    GUEST_TELEMETRY_VISIT_WAIT_FLUSHES: int = 3  # flushes to wait for a visit queued in another worker
+
+    # Query profiler (N+1 / slow query detection, always on when DEBUG)
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_MAX_STATEMENTS: int = 50  # statements per request
+    QUERY_PROFILER_MAX_REPEATS: int = 10  # same fingerprint per request
+    QUERY_PROFILER_SLOW_MS: int = 200  # EXPLAIN is captured above this latency
+    QUERY_PROFILER_RAISE: bool = False
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,137 @@
+"""
+HTTP conditional responses (ETag / Last-Modified) and cache policies.
+
+Public read endpoints derive a validator from cheap data versions -- the
+row count, highest id, sum of ``row_version`` and latest ``updated_at`` of
+the tables behind the response (``table_state``), or an in-memory cache
+generation -- plus the query string. ``updated_at`` alone is not enough:
+it is the transaction start on PostgreSQL and whole seconds on SQLite, so
+an edit can leave it unchanged; ``row_version`` (``RowVersionMixin``) is
+bumped by every UPDATE. The validator is checked *before* the response is built, so
+a revalidation costs one aggregate query and returns 304 without loading or
+serializing anything::
+
+    validator = make_validator("products", request.url.query, await table_state(db, Product, Farmer))
+    if (cached := not_modified(request, response, validator, "catalog")) is not None:
+        return cached
+
+``Cache-Control`` comes from ``CACHE_POLICIES``: per route, how long browsers
+and a shared cache (CDN) may reuse a response before revalidating.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+from typing import Any, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+CACHE_POLICIES = {
+    # Catalogs: admin and farmer screens read the same endpoints right after
+    # editing, so browsers revalidate every time (cheap 304); a shared cache
+    # may serve a copy for a few seconds.
+    "catalog": "public, max-age=0, s-maxage=30, stale-while-revalidate=60",
+    # Guest (QR) pages: farmer profiles and restaurant messages change rarely
+    "guest": "public, max-age=60, s-maxage=300, stale-while-revalidate=600",
+    # Delivery slots: a closed slot has to disappear quickly
+    "slots": "public, max-age=0, s-maxage=15",
+}
+
+_table_states = TTLCache(maxsize=256, ttl=settings.HTTP_VALIDATOR_TTL)
+
+
+class Validator(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # Naive timestamps come from func.now() on SQLite, which is UTC
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _flatten(parts):
+    for part in parts:
+        if isinstance(part, (tuple, list)):
+            yield from _flatten(part)
+        else:
+            yield part
+
+
+def make_validator(*parts: Any, last_modified: Optional[datetime] = None) -> Validator:
+    """Weak ETag over ``parts`` (and the app version); ``last_modified`` defaults to the newest datetime in them."""
+    digest = hashlib.sha1(repr((settings.APP_VERSION,) + parts).encode()).hexdigest()[:24]
+    if last_modified is None:
+        stamps = [_as_utc(p) for p in _flatten(parts) if isinstance(p, datetime)]
+        last_modified = max(stamps) if stamps else None
+    return Validator(f'W/"{digest}"', _as_utc(last_modified))
+
+
+async def table_state(db: AsyncSession, *models) -> Tuple[tuple, ...]:
+    """
+    ``(count, max(id), sum(row_version), max(updated_at))`` per model, in one
+    round trip (cached ``HTTP_VALIDATOR_TTL`` s). Models need ``RowVersionMixin``.
+    """
+    key = tuple(model.__tablename__ for model in models)
+    cached = _table_states.get(key)
+    if cached is not None:
+        return cached
+    columns = []
+    for model in models:
+        columns += [
+            select(func.count()).select_from(model).scalar_subquery(),
+            select(func.max(model.id)).scalar_subquery(),
+            select(func.sum(model.row_version)).scalar_subquery(),
+            select(func.max(model.updated_at)).scalar_subquery(),
+        ]
+    row = (await db.execute(select(*columns))).one()
+    state = tuple(tuple(row[i:i + 4]) for i in range(0, len(row), 4))
+    _table_states.set(key, state)
+    return state
+
+
+def is_fresh(request: Request, validator: Validator) -> bool:
+    """Whether the client's copy matches (If-None-Match wins over If-Modified-Since, RFC 9110 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = validator.etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validator.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return validator.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(request: Request, response: Response, validator, policy: Optional[str] = None) -> Optional[Response]:
+    """
+    Set ETag / Last-Modified / Cache-Control on ``response`` and return a 304
+    response when the client copy is current (``None`` otherwise).
+
+    ``validator`` is a ``Validator`` or a bare ETag string; ``policy`` names a
+    ``CACHE_POLICIES`` entry (default: revalidate every time).
+    """
+    if isinstance(validator, str):
+        validator = Validator(validator)
+    response.headers["ETag"] = validator.etag
+    if validator.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(validator.last_modified, usegmt=True)
+    response.headers["Cache-Control"] = CACHE_POLICIES[policy] if policy else "no-cache"
+    if request.method in ("GET", "HEAD") and is_fresh(request, validator):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
@@ -0,0 +1,48 @@
+"""
+Deferred imports for heavy optional integrations.
+
+``LazyModule("stripe")`` behaves like the ``stripe`` module but performs the
+import (and optional one-time configuration) on first attribute access, so
+importing a router does not pay for SDKs it may never use in this process.
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Callable, Optional
+
+
+class LazyModule:
+    """Module proxy that imports ``name`` on first attribute access."""
+
+    def __init__(self, name: str, configure: Optional[Callable[[ModuleType], None]] = None) -> None:
+        self.__dict__["_name"] = name
+        self.__dict__["_configure"] = configure
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is not None:
+            return module
+        with self.__dict__["_lock"]:
+            if self.__dict__["_module"] is None:
+                module = importlib.import_module(self.__dict__["_name"])
+                configure = self.__dict__["_configure"]
+                if configure is not None:
+                    configure(module)
+                self.__dict__["_module"] = module
+        return self.__dict__["_module"]
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value) -> None:
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyModule {self.__dict__['_name']!r} ({state})>"
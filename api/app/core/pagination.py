@@ -0,0 +1,191 @@
+"""
+Pagination helpers for list endpoints.
+
+``paginate()`` is the entry point used by the list routers. By default it
+fetches a page and its total in one statement by adding
+``COUNT(*) OVER ()`` to the page query (the window is evaluated before
+LIMIT/OFFSET, so every row carries the full filtered count).
+
+Keyset ("cursor") paging walks an index on ``(created_at, id)`` instead of
+using OFFSET, so the cost of a page does not grow with its position. The
+cursor is an opaque token encoding the sort key of the last row returned.
+For very large tables ``count="approximate"`` caps the count (see
+``estimated_count``).
+"""
+import base64
+from datetime import datetime
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# Counts stop at this many rows; beyond it totals are reported as estimates
+COUNT_CAP = 10000
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in payload]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query: Select, columns: Sequence, cursor: Optional[str], limit: int, descending: bool = True) -> Select:
+    """
+    Order ``query`` by ``columns`` and restrict it to rows after ``cursor``.
+
+    Fetches ``limit + 1`` rows so the caller can tell whether a next page
+    exists (see ``split_page``).
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(columns):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        key, bound = tuple_(*columns), tuple_(*values)
+        query = query.where(key < bound if descending else key > bound)
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: Sequence, limit: int, key) -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the next cursor from ``key(last_row)``."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+async def _planner_rows(db: AsyncSession, table_name: str) -> Optional[int]:
+    """PostgreSQL's row estimate for a table (summed over partitions)."""
+    estimate = await db.scalar(
+        text(
+            "SELECT COALESCE(SUM(c.reltuples), 0) FROM pg_class c "
+            "WHERE c.oid = to_regclass(:t) "
+            "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:t))"
+        ),
+        {"t": table_name},
+    )
+    return int(estimate) if estimate and estimate > 0 else None
+
+
+async def estimated_count(
+    db: AsyncSession,
+    query: Select,
+    table_name: Optional[str] = None,
+    filtered: bool = True,
+    cap: int = COUNT_CAP,
+) -> Tuple[int, bool]:
+    """
+    Count rows of ``query`` without scanning more than ``cap`` of them.
+
+    Returns ``(total, is_estimate)``. Below the cap the count is exact.
+    At the cap, an unfiltered PostgreSQL table reports the planner's row
+    estimate; otherwise ``cap`` is returned as a lower bound.
+    """
+    capped = query.order_by(None).limit(cap).subquery()
+    total = await db.scalar(select(func.count()).select_from(capped)) or 0
+    if total < cap:
+        return total, False
+    if table_name and not filtered and db.bind.dialect.name == "postgresql":
+        planner = await _planner_rows(db, table_name)
+        if planner:
+            return max(planner, cap), True
+    return cap, True
+
+
+class Page:
+    """One page of results plus its total."""
+
+    def __init__(self, items: list, total: int, next_cursor: Optional[str] = None, total_is_estimate: bool = False) -> None:
+        self.items = items
+        self.total = total
+        self.next_cursor = next_cursor
+        self.total_is_estimate = total_is_estimate
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    skip: int = 0,
+    limit: int = 100,
+    count: str = "window",
+    keyset: Optional[Sequence] = None,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    table_name: Optional[str] = None,
+    filtered: bool = True,
+) -> Page:
+    """
+    Run ``query`` for one page.
+
+    count:
+        ``"window"``      – exact total via ``COUNT(*) OVER ()`` in the same statement
+        ``"approximate"`` – capped count query (``estimated_count``), for log tables
+        ``"none"``        – skip counting; ``total`` is the number of rows returned
+
+    keyset:
+        Sort columns for cursor paging (e.g. ``[Model.created_at, Model.id]``);
+        ``query`` must not be ordered already. ``skip`` is honoured only
+        without a cursor, for older clients. Keyset paging cannot use the
+        window count (it would count only the rows after the cursor).
+
+    Items are ORM entities for single-entity selects, otherwise rows. Window
+    counts need a non-DISTINCT query; express DISTINCT as ``id IN (...)``.
+    """
+    if count not in ("window", "approximate", "none"):
+        raise ValueError(f"unknown count mode: {count}")
+    if keyset is not None and count == "window":
+        raise ValueError("keyset pagination needs count='approximate' or 'none'")
+
+    total_is_estimate = False
+    total = None
+    if count == "approximate":
+        total, total_is_estimate = await estimated_count(db, query, table_name, filtered)
+
+    if keyset is not None:
+        page = keyset_page(query, keyset, cursor, limit, descending)
+        if not cursor and skip:
+            page = page.offset(skip)
+    else:
+        page = query.offset(skip).limit(limit)
+
+    single = len(query.column_descriptions) == 1
+    if count == "window":
+        page = page.add_columns(func.count().over().label("_total"))
+    result = await db.execute(page)
+
+    if count == "window":
+        rows = result.all()
+        if rows:
+            total = rows[0][-1]
+        elif skip:
+            # Past the last page: no row to carry the window count
+            total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        else:
+            total = 0
+        items = [row[0] if single else row[:-1] for row in rows]
+    else:
+        items = list(result.scalars().all()) if single else list(result.all())
+
+    next_cursor = None
+    if keyset is not None:
+        keys = [c.key for c in keyset]
+        items, next_cursor = split_page(
+            items, limit, lambda item: tuple(getattr(item, k) for k in keys)
+        )
+
+    if total is None:
+        total = len(items)
+    return Page(items, total or 0, next_cursor, total_is_estimate)
@@ -0,0 +1,75 @@
+"""
+Column-only list projections.
+
+``view=full`` list endpoints load ORM graphs (items, products, farmers) and
+serialize the full response schema. A ``Projection`` instead selects only the
+columns of a slim summary schema as labelled SQL expressions. Related values
+(restaurant name, item count) are correlated scalar subqueries, so nothing is
+joined or loaded unless it is asked for.
+
+``fields=id,status,total_amount`` narrows the select further (sparse
+fieldsets); any field of the summary schema may be requested. The schema
+documents and checks the fields; rows are serialized without it
+(``Projection.rows``).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+
+VIEWS = ("summary", "full")
+# Pattern for the ``view`` query parameter
+VIEW_PATTERN = "^(summary|full)$"
+
+
+class Projection:
+    """Maps the fields of ``schema`` to SQL expressions."""
+
+    def __init__(self, schema: Type[BaseModel], columns: Dict[str, Any], default: Sequence[str]) -> None:
+        unknown = (set(columns) | set(default)) - set(schema.model_fields)
+        if unknown:
+            raise ValueError(f"{schema.__name__} has no fields {sorted(unknown)}")
+        self.schema = schema
+        self.columns = columns
+        self.default = list(default)
+
+    def resolve(self, view: str, fields: Optional[str]) -> Optional[List[str]]:
+        """
+        Field names to select, or ``None`` for the full view.
+
+        ``fields`` implies the summary view. ``id`` is always included so
+        clients can key rows.
+        """
+        if not fields:
+            return self.default if view == "summary" else None
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)} (available: {', '.join(self.columns)})",
+            )
+        if "id" in self.columns and "id" not in names:
+            names.insert(0, "id")
+        return list(dict.fromkeys(names))
+
+    def select(self, names: Iterable[str]) -> Select:
+        return select(*[self.columns[name].label(name) for name in names])
+
+    def rows(self, rows: Iterable[Sequence], names: Sequence[str]) -> List[dict]:
+        """
+        ``{name: value}`` dicts for result rows (values in ``names`` order; a
+        bare value stands for a one-column row, as ``paginate`` returns them).
+
+        Values come straight from typed columns and are left as they are:
+        return them through ``SchemaJSONResponse`` (``app.core.fast_json``),
+        which encodes Decimals, enums and datetimes the way the schema's JSON
+        mode would, without building a model per row.
+        """
+        return [
+            dict(zip(names, row if isinstance(row, (Row, tuple)) else (row,)))
+            for row in rows
+        ]
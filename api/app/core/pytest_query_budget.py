@@ -0,0 +1,47 @@
+"""
+Pytest plugin for asserting SQL query budgets.
+
+Enable with ``pytest -p app.core.pytest_query_budget`` or by listing it in
+``pytest_plugins`` of a conftest.
+
+    @pytest.mark.query_budget(max_statements=8, max_repeats=2)
+    async def test_list_orders(client):
+        ...
+
+    async def test_checkout(client, query_budget):
+        with query_budget("POST /api/consumer-orders/", max_statements=25) as prof:
+            await client.post("/api/consumer-orders/", json=payload)
+        assert prof.statement_count <= 25
+"""
+import pytest
+
+from app.core.query_profiler import QueryBudgetExceeded, profile_queries
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_statements=None, max_repeats=None, slow_ms=None): "
+        "fail the test when it executes more SQL statements than allowed",
+    )
+
+
+@pytest.fixture
+def query_budget():
+    """Return ``profile_queries`` for budgeting individual endpoint calls."""
+    return profile_queries
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    # Profile the test body only (not fixture setup), so a violation is
+    # reported as a failure of the test rather than a teardown error
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        yield
+        return
+    with profile_queries(item.nodeid, raise_on_violation=False, **marker.kwargs) as profile:
+        outcome = yield
+    problems = profile.violations()
+    if problems and outcome.excinfo is None:
+        raise QueryBudgetExceeded(f"Query budget exceeded for {item.nodeid}: " + "; ".join(problems))
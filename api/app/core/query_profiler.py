@@ -0,0 +1,232 @@
+"""
+Query profiling utilities for development and tests.
+
+Counts SQL statements per request (or per ``profile_queries`` block),
+fingerprints statements that only differ in their parameters to detect
+N+1 patterns, and captures EXPLAIN output for slow queries.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import re
+import time
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+_installed_engines: set = set()
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+(?:::[A-Z_ ]+)?|%\(\w+\)s|%s|:\w+|\?")
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a profiled block exceeds its statement or repeat budget."""
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so that parameter-only differences collapse."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryProfile:
+    """Statement statistics collected for one request or profiled block."""
+
+    def __init__(
+        self,
+        label: str,
+        max_statements: Optional[int] = None,
+        max_repeats: Optional[int] = None,
+        slow_ms: Optional[float] = None,
+        explain: bool = True,
+    ) -> None:
+        self.label = label
+        self.max_statements = max_statements
+        self.max_repeats = max_repeats
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self.statement_count = 0
+        self.total_ms = 0.0
+        self.fingerprints: Dict[str, int] = {}
+        self.slow_queries: List[dict] = []
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.statement_count += 1
+        self.total_ms += duration_ms
+        key = fingerprint(statement)
+        self.fingerprints[key] = self.fingerprints.get(key, 0) + 1
+
+    def repeated(self) -> Dict[str, int]:
+        """Fingerprints executed more often than ``max_repeats``."""
+        if self.max_repeats is None:
+            return {}
+        return {fp: n for fp, n in self.fingerprints.items() if n > self.max_repeats}
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.max_statements is not None and self.statement_count > self.max_statements:
+            problems.append(
+                f"{self.statement_count} statements executed (budget {self.max_statements})"
+            )
+        for fp, count in sorted(self.repeated().items(), key=lambda kv: -kv[1]):
+            problems.append(f"{count}x repeated (possible N+1): {fp[:200]}")
+        return problems
+
+    def check(self, raise_on_violation: bool = False) -> List[str]:
+        """Log (or raise) when the profile exceeds its thresholds."""
+        problems = self.violations()
+        if problems:
+            message = f"Query budget exceeded for {self.label}: " + "; ".join(problems)
+            if raise_on_violation:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        for slow in self.slow_queries:
+            logger.warning(
+                f"Slow query in {self.label} ({slow['duration_ms']:.1f} ms): {slow['statement'][:200]}"
+                + (f"\n{slow['plan']}" if slow.get("plan") else "")
+            )
+        return problems
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    """
+    Run EXPLAIN for a slow SELECT on the raw DBAPI connection.
+
+    This runs inside the caller's transaction. On PostgreSQL a failed
+    statement aborts the whole transaction, so the EXPLAIN is wrapped in a
+    SAVEPOINT and rolled back to it on error.
+    """
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    sqlite = conn.dialect.name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            if not sqlite:
+                cursor.execute("SAVEPOINT query_profiler_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if not sqlite:
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_profiler_explain")
+                raise
+            if not sqlite:
+                cursor.execute("RELEASE SAVEPOINT query_profiler_explain")
+        finally:
+            cursor.close()
+    except Exception as exc:
+        return f"(EXPLAIN failed: {exc})"
+    return "\n".join(" ".join(str(col) for col in row) for row in rows)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("query_profiler_start")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    profile.record(statement, duration_ms)
+    if profile.slow_ms is not None and duration_ms >= profile.slow_ms:
+        plan = _explain(conn, statement, parameters) if profile.explain and not executemany else None
+        profile.slow_queries.append({
+            "statement": statement,
+            "duration_ms": duration_ms,
+            "plan": plan,
+        })
+
+
+def _handle_error(context) -> None:
+    # after_cursor_execute does not run for a failed statement; drop its start
+    # time so the stack does not grow on pooled connections
+    if context.connection is not None:
+        starts = context.connection.info.get("query_profiler_start")
+        if starts:
+            starts.pop()
+
+
+def install(engine: AsyncEngine) -> None:
+    """Attach the profiling listeners to an engine (idempotent)."""
+    sync_engine = engine.sync_engine
+    if id(sync_engine) in _installed_engines:
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    _installed_engines.add(id(sync_engine))
+
+
+@contextmanager
+def profile_queries(
+    label: str = "block",
+    max_statements: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+    slow_ms: Optional[float] = None,
+    raise_on_violation: bool = True,
+    engine: Optional[AsyncEngine] = None,
+) -> Iterator[QueryProfile]:
+    """
+    Profile every statement executed inside the block.
+
+    Usage:
+        with profile_queries("aggregate", max_statements=10, max_repeats=2) as prof:
+            await aggregate_unified_batch(batch_id, db)
+        print(prof.statement_count)
+    """
+    if engine is None:
+        from app.core.database import engine as default_engine
+        engine = default_engine
+    install(engine)
+
+    profile = QueryProfile(label, max_statements, max_repeats, slow_ms)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+    profile.check(raise_on_violation=raise_on_violation)
+
+
+def is_enabled() -> bool:
+    return settings.DEBUG or settings.QUERY_PROFILER_ENABLED
+
+
+async def query_profiler_middleware(request: Request, call_next):
+    """Per-request statement counting. Adds X-Query-Count / X-Query-Time headers."""
+    profile = QueryProfile(
+        f"{request.method} {request.url.path}",
+        max_statements=settings.QUERY_PROFILER_MAX_STATEMENTS,
+        max_repeats=settings.QUERY_PROFILER_MAX_REPEATS,
+        slow_ms=settings.QUERY_PROFILER_SLOW_MS,
+    )
+    token = _current_profile.set(profile)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_profile.reset(token)
+    profile.check(raise_on_violation=settings.QUERY_PROFILER_RAISE)
+    response.headers["X-Query-Count"] = str(profile.statement_count)
+    response.headers["X-Query-Time"] = f"{profile.total_ms:.1f}"
+    return response
@@ -0,0 +1,140 @@
+"""
+Probabilistic sketches for analytics.
+
+Hashes use blake2b rather than ``hash()`` so serialized sketches from
+different processes (and restarts) can be merged.
+"""
+import hashlib
+import heapq
+import math
+import zlib
+from typing import Any, Dict, List, Tuple
+
+
+def hash64(value: Any) -> int:
+    """Stable 64-bit hash of ``str(value)``."""
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """
+    Distinct-count estimator (HyperLogLog with small-range correction).
+
+    ``p=12`` uses 4096 one-byte registers for a standard error of about 1.6%.
+    Sketches with the same ``p`` merge losslessly (register-wise max), so
+    per-day sketches can be combined into any window.
+    """
+
+    def __init__(self, p: int = 12) -> None:
+        if not 4 <= p <= 16:
+            raise ValueError("p must be between 4 and 16")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value: Any) -> None:
+        x = hash64(value)
+        index = x >> (64 - self.p)
+        rest = (x << self.p) & ((1 << 64) - 1)
+        rank = (64 - self.p) + 1 if rest == 0 else (64 - rest.bit_length()) + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(bytes([self.p]) + bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        raw = zlib.decompress(data)
+        sketch = cls(p=raw[0])
+        sketch.registers = bytearray(raw[1:])
+        return sketch
+
+
+class SpaceSaving:
+    """
+    Heavy-hitters summary (Space-Saving) with at most ``capacity`` counters.
+
+    Any key whose true frequency exceeds ``total / capacity`` is guaranteed to
+    be tracked; ``counts[key] - errors[key]`` is a lower bound of its true
+    count. Summaries merge by adding counters (a full summary's minimum
+    counter stands in for keys it does not track) and trimming back to capacity.
+    """
+
+    def __init__(self, capacity: int = 200) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+
+    def _floor(self) -> int:
+        """Count a missing key may have had (0 until the summary is full)."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def add(self, key: str, n: int = 1) -> None:
+        self.total += n
+        if key in self.counts:
+            self.counts[key] += n
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = n
+            self.errors[key] = 0
+            return
+        victim = min(self.counts, key=self.counts.__getitem__)
+        floor = self.counts.pop(victim)
+        self.errors.pop(victim, None)
+        self.counts[key] = floor + n
+        self.errors[key] = floor
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        floor_self, floor_other = self._floor(), other._floor()
+        counts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        for key in set(self.counts) | set(other.counts):
+            counts[key] = self.counts.get(key, floor_self) + other.counts.get(key, floor_other)
+            errors[key] = self.errors.get(key, floor_self) + other.errors.get(key, floor_other)
+        keep = heapq.nlargest(self.capacity, counts, key=counts.__getitem__)
+        self.counts = {key: counts[key] for key in keep}
+        self.errors = {key: errors[key] for key in keep}
+        self.total += other.total
+        return self
+
+    def top(self, k: int = 20) -> List[Tuple[str, int, int]]:
+        """``(key, estimated_count, max_overcount)`` for the ``k`` heaviest keys."""
+        keys = heapq.nlargest(k, self.counts, key=self.counts.__getitem__)
+        return [(key, self.counts[key], self.errors[key]) for key in keys]
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "items": [[key, count, self.errors[key]] for key, count in self.counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpaceSaving":
+        summary = cls(capacity=data.get("capacity", 200))
+        summary.total = data.get("total", 0)
+        for key, count, error in data.get("items", []):
+            summary.counts[key] = count
+            summary.errors[key] = error
+        return summary
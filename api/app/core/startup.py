@@ -0,0 +1,168 @@
+"""
+Application startup helpers: in-process migration check, seed gating and
+a per-phase startup timing breakdown.
+"""
+import asyncio
+from contextlib import contextmanager
+import logging
+from pathlib import Path
+import time
+from typing import Dict, Iterator, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+API_DIR = Path(__file__).resolve().parents[2]
+MIGRATIONS_DIR = API_DIR / "migrations"
+
+# Arbitrary constant shared by every replica (pg_advisory_lock key)
+MIGRATION_LOCK_KEY = 0x7265_6661_726D
+
+SEED_SENTINEL_KEY = "seed_version"
+
+
+class StartupTimer:
+    """Collects wall-clock durations of startup phases."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.notes: Dict[str, str] = {}
+
+    def record(self, name: str, seconds: float, note: str = "") -> None:
+        self.phases[name] = seconds
+        if note:
+            self.notes[name] = note
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def summary(self) -> str:
+        total = sum(self.phases.values())
+        parts = []
+        for name, seconds in self.phases.items():
+            note = f" ({self.notes[name]})" if name in self.notes else ""
+            parts.append(f"{name}={seconds * 1000:.0f}ms{note}")
+        return f"Startup timing: total={total * 1000:.0f}ms " + " ".join(parts)
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    # No ini file: keeps alembic's fileConfig() from resetting app logging
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.strip().replace("%", "%%"))
+    return config
+
+
+def _script_heads() -> Set[str]:
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+
+
+async def _database_heads(engine: AsyncEngine) -> Set[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    async with engine.connect() as conn:
+        return await conn.run_sync(
+            lambda sync_conn: set(MigrationContext.configure(sync_conn).get_current_heads())
+        )
+
+
+async def migration_status(engine: AsyncEngine) -> Tuple[Set[str], Set[str]]:
+    """Return (revisions stamped in alembic_version, script heads)."""
+    heads = await asyncio.to_thread(_script_heads)
+    return await _database_heads(engine), heads
+
+
+def _upgrade_head() -> None:
+    from alembic import command
+
+    command.upgrade(_alembic_config(), "head")
+
+
+async def ensure_migrated(engine: AsyncEngine) -> str:
+    """
+    Upgrade the schema to head unless it is already current.
+
+    Compares ``alembic_version`` with the script heads in-process, so a
+    warm restart costs one small query. When an upgrade is needed it runs
+    in a worker thread (env.py uses its own event loop) under a PostgreSQL
+    advisory lock, so concurrently booting replicas migrate only once.
+
+    Returns one of: "disabled", "current", "upgraded".
+    """
+    if not settings.RUN_MIGRATIONS_ON_STARTUP:
+        return "disabled"
+
+    current, heads = await migration_status(engine)
+    if current == heads:
+        return "current"
+
+    logger.info(f"Database at {sorted(current) or 'base'}, upgrading to {sorted(heads)}")
+    if engine.dialect.name != "postgresql":
+        await asyncio.to_thread(_upgrade_head)
+        return "upgraded"
+
+    async with engine.connect() as lock_conn:
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            # Another replica may have finished while we waited for the lock
+            if await _database_heads(engine) == heads:
+                return "current"
+            await asyncio.to_thread(_upgrade_head)
+            return "upgraded"
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            await lock_conn.commit()
+
+
+async def seed_if_needed() -> str:
+    """
+    Run ``seed_data()`` once per SEED_VERSION.
+
+    The ``app_meta.seed_version`` row records the last seeded version, so a
+    restart costs a single primary-key lookup instead of seed_data()'s
+    per-table existence checks.
+
+    Returns one of: "disabled", "skipped", "seeded".
+    """
+    if not settings.RUN_SEED_ON_STARTUP:
+        return "disabled"
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.app_meta import AppMeta
+    from app.seed import SEED_VERSION, seed_data
+
+    try:
+        async with AsyncSessionLocal() as db:
+            sentinel = await db.get(AppMeta, SEED_SENTINEL_KEY)
+            if sentinel is not None and sentinel.value == SEED_VERSION:
+                return "skipped"
+    except SQLAlchemyError as e:
+        # app_meta missing (e.g. --no-migrate before the release migration)
+        logger.warning(f"Seed sentinel unavailable ({e.__class__.__name__}); seeding without it")
+        await seed_data()
+        return "seeded"
+
+    await seed_data()
+
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.merge(AppMeta(key=SEED_SENTINEL_KEY, value=SEED_VERSION))
+            await db.commit()
+        except IntegrityError:
+            # Another replica wrote the sentinel first
+            await db.rollback()
+    return "seeded"
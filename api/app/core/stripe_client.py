@@ -0,0 +1,16 @@
+"""
+Lazily imported, pre-configured Stripe SDK.
+
+Use ``from app.core.stripe_client import stripe`` instead of ``import stripe``;
+the SDK (~1s to import) is loaded and given the API key on first use.
+"""
+from app.core.config import settings
+from app.core.lazy import LazyModule
+
+
+def _configure(module) -> None:
+    module.api_key = settings.STRIPE_SECRET_KEY
+    module.max_network_retries = settings.STRIPE_MAX_NETWORK_RETRIES
+
+
+stripe = LazyModule("stripe", configure=_configure)
@@ -1,21 +1,16 @@
 from decimal import Decimal, ROUND_HALF_UP
-import json
-import os
+
+from app.services.settings_store import settings_store
+
+DEFAULT_PRICE_MULTIPLIER = Decimal("0.7")
+
 
 def get_price_multiplier() -> Decimal:
-    """設定ファイルから価格係数を取得 (デフォルト0.7)"""
-    try:
-        # Note: Since this is called from api app, path is relative to root
-        path = "app/data/general_settings.json"
-        if os.path.exists(path):
-            with open(path, "r") as f:
-                data = json.load(f)
-                val = data.get("default_price_multiplier")
-                if val:
-                    return Decimal(str(val))
-    except Exception:
-        pass
-    return Decimal("0.7")
+    """一般設定の価格係数 (デフォルト0.7)。キャッシュ済みの設定を参照し、I/Oなし"""
+    val = (settings_store.get("general") or {}).get("default_price_multiplier")
+    if val:
+        return Decimal(str(val))
+    return DEFAULT_PRICE_MULTIPLIER
 
 def calculate_retail_price(cost_price: float | int | Decimal, multiplier: Decimal | float | None = None) -> Decimal:
     """
@@ -7,12 +7,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import time
 import logging
-import subprocess
+
+_import_started = time.perf_counter()
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import engine, init_db
+from app.core import query_profiler
+from app.core.startup import StartupTimer, ensure_migrated, seed_if_needed
+from app.services.event_buffer import start_buffers, stop_buffers
+from app.services.pdf import warm_up_renderers
+from app.services.delivery_slots import delivery_slot_cache
+from app.services.settings_store import settings_store
+from app.services.retention import ensure_partitions
 
 logging.basicConfig(
     level=logging.DEBUG if settings.DEBUG else logging.INFO,
@@ -34,42 +43,67 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Debug mode: {settings.DEBUG}")
-    
-    # Run Alembic migrations automatically
+    timer = StartupTimer()
+    timer.record("import", _import_seconds)
+
+    # Apply Alembic migrations in-process (no-op when alembic_version is at head)
+    with timer.phase("migrations"):
+        try:
+            timer.notes["migrations"] = await ensure_migrated(engine)
+        except Exception as e:
+            timer.notes["migrations"] = "failed"
+            logger.warning(f"Migration check failed: {e}. Continuing app startup...")
+
+    # Monthly partitions for the log tables (PostgreSQL; no-op elsewhere)
     try:
-        logger.info("Running database migrations...")
-        result = subprocess.run(
-            ["alembic", "upgrade", "head"],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode == 0:
-            logger.info("Database migrations completed successfully")
-        else:
-            logger.warning(f"Database migration returned non-zero: {result.returncode}")
-            logger.warning(f"Stdout: {result.stdout}")
-            logger.warning(f"Stderr: {result.stderr}")
-            logger.warning("Continuing app startup despite migration issue...")
+        await ensure_partitions()
     except Exception as e:
-        logger.warning(f"Migration execution failed: {e}. Continuing app startup...")
+        logger.warning(f"Partition upkeep failed: {e}")
 
     # Initialize database (optional, use Alembic for production)
     if settings.DEBUG:
         logger.warning("Debug mode: Checking tables")
         # await init_db()  # Skipped in favor of Alembic
-    
-    # Auto-seed data (Safe to run always as it checks for existence)
-    try:
-        from app.seed import seed_data
-        logger.info("Running seed_data...")
-        await seed_data()
-    except Exception as e:
-        logger.error(f"Auto-seeding failed: {e}")
-    
+
+    # Seed initial data once per SEED_VERSION (sentinel row in app_meta)
+    with timer.phase("seed"):
+        try:
+            timer.notes["seed"] = await seed_if_needed()
+        except Exception as e:
+            timer.notes["seed"] = "failed"
+            logger.error(f"Auto-seeding failed: {e}")
+
+    # System settings cache (app_settings); kept fresh by the settings_store poller
+    with timer.phase("settings"):
+        try:
+            await settings_store.load()
+        except Exception as e:
+            logger.warning(f"Loading system settings failed: {e}. Using defaults until the next refresh")
+
+    # Upcoming delivery slots (public listing / checkout); kept fresh by its poller
+    with timer.phase("delivery_slots"):
+        try:
+            timer.notes["delivery_slots"] = f"{await delivery_slot_cache.load()} slots"
+        except Exception as e:
+            logger.warning(f"Loading delivery slots failed: {e}. Reading them from the database until the next refresh")
+
+    logger.info(timer.summary())
+
+    # Background flushers for write-behind event buffers
+    start_buffers()
+
+    # PDF fonts / stylesheets / templates, off the event loop (first invoice is otherwise slow)
+    pdf_warmup = None
+    if settings.PDF_WARMUP_ON_STARTUP:
+        pdf_warmup = asyncio.create_task(asyncio.to_thread(warm_up_renderers))
+
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    await stop_buffers()
+    if pdf_warmup is not None and not pdf_warmup.done():
+        await pdf_warmup
 
 
 # Create FastAPI application
@@ -113,6 +147,12 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+# Query profiling middleware (DEBUG / QUERY_PROFILER_ENABLED only)
+if query_profiler.is_enabled():
+    query_profiler.install(engine)
+    app.middleware("http")(query_profiler.query_profiler_middleware)
+
+
 # Exception handlers
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -192,6 +232,7 @@ from app.routers import (
     admin_coupons,
     coupons as coupons_router,
     retail_products,
+    catalog,
     admin_retail_products,
     admin_procurement,
     consumer_events,
@@ -228,6 +269,7 @@ app.include_router(public.router, prefix="/api/public", tags=["Public"])
 app.include_router(admin_coupons.router, prefix="/api/admin", tags=["Admin Coupons"])
 app.include_router(coupons_router.router, prefix="/api/coupons", tags=["Coupons"])
 app.include_router(retail_products.router, prefix="/api/retail-products", tags=["Retail Products"])
+app.include_router(catalog.router, prefix="/api/catalog", tags=["Catalog"])
 app.include_router(admin_retail_products.router, prefix="/api/admin", tags=["Admin Retail Products"])
 app.include_router(admin_procurement.router, prefix="/api/admin", tags=["Admin Procurement"])
 app.include_router(consumer_events.router, prefix="/api/consumer-events", tags=["Consumer Events"])
@@ -255,6 +297,8 @@ ConsumerOrderResponse.model_rebuild()
 logger.info("Pydantic schemas rebuilt successfully.")
 # ----------------------------------------------------
 
+_import_seconds = time.perf_counter() - _import_started
+
 
 @app.get("/api/debug/seed", tags=["Debug"])
 async def debug_seed_data():
@@ -278,7 +322,22 @@ async def debug_seed_data():
 
 
 if __name__ == "__main__":
+    import argparse
+    import os
     import uvicorn
+
+    parser = argparse.ArgumentParser(description=settings.APP_NAME)
+    parser.add_argument(
+        "--no-migrate",
+        action="store_true",
+        help="skip migrations at startup (run `alembic upgrade head` as a release step instead)",
+    )
+    args = parser.parse_args()
+    if args.no_migrate:
+        # Environment too, so the reloader's child process sees it
+        os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+        settings.RUN_MIGRATIONS_ON_STARTUP = False
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
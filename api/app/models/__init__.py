@@ -29,7 +29,9 @@ from app.models.organization import Organization
 from app.models.settlement_status import SettlementStatus
 from app.models.coupon import Coupon, DiscountType
 from app.models.retail_product import RetailProduct, ProcurementBatch, ProcurementItem
-from app.models.consumer_event import ConsumerEvent
+from app.models.consumer_event import ConsumerEvent, ConsumerEventDaily, ConsumerEventSketch
+from app.models.app_meta import AppMeta
+from app.models.app_setting import AppSetting
 
 __all__ = [
     # Enums
@@ -67,4 +69,8 @@ __all__ = [
     "ProcurementBatch",
     "ProcurementItem",
     "ConsumerEvent",
+    "ConsumerEventDaily",
+    "ConsumerEventSketch",
+    "AppMeta",
+    "AppSetting",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, String
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, String, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.base import TimestampMixin
@@ -39,3 +39,7 @@ class AccessLog(Base, TimestampMixin):
     path = Column(String(255), nullable=True)
     ip_address = Column(String(64), nullable=True)
     user_agent = Column(String(512), nullable=True)
+
+    __table_args__ = (
+        Index("ix_access_logs_created_id", "created_at", "id"),
+    )
@@ -0,0 +1,21 @@
+"""
+AppMeta model - アプリケーション内部状態 (key/value)
+"""
+from sqlalchemy import Column, String
+from app.core.database import Base
+from app.models.base import TimestampMixin
+
+
+class AppMeta(Base, TimestampMixin):
+    """
+    アプリ内部メタ情報 (AppMeta)
+
+    起動処理の実行済みフラグなど、1キー1行の小さな状態を保持する。
+    例: seed_version = 初期データ投入済みのバージョン
+    """
+    __tablename__ = "app_meta"
+
+    key = Column(String(100), primary_key=True, comment="キー")
+    value = Column(String(500), nullable=True, comment="値")
+
+    __table_args__ = ({'comment': 'アプリ内部メタ情報テーブル'},)
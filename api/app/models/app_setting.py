@@ -0,0 +1,23 @@
+"""
+AppSetting model - 管理画面から変更するシステム設定 (key/JSON)
+"""
+from sqlalchemy import Column, Integer, JSON, String
+from app.core.database import Base
+from app.models.base import TimestampMixin
+
+
+class AppSetting(Base, TimestampMixin):
+    """
+    システム設定 (AppSetting)
+
+    1設定グループ1行 (例: delivery = 配送設定, general = 価格係数など)。
+    version は更新ごとに +1 され、各プロセスのキャッシュ無効化に使う
+    (app.services.settings_store)。
+    """
+    __tablename__ = "app_settings"
+
+    key = Column(String(100), primary_key=True, comment="設定キー")
+    value = Column(JSON, nullable=False, comment="設定値")
+    version = Column(Integer, nullable=False, default=1, comment="更新バージョン")
+
+    __table_args__ = ({'comment': 'システム設定テーブル'},)
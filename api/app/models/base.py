@@ -2,7 +2,7 @@
 Base model with common fields and utilities.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy import BigInteger, Column, Integer, DateTime, literal_column
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -26,6 +26,25 @@ class TimestampMixin:
     )
 
 
+class RowVersionMixin:
+    """
+    Mixin to add a per-row change counter.
+
+    Every UPDATE issued through SQLAlchemy increments ``row_version`` in the
+    statement itself, so unlike ``updated_at`` (transaction start on
+    PostgreSQL, whole seconds on SQLite) two edits never look the same.
+    """
+
+    row_version = Column(
+        BigInteger,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("row_version + 1"),
+        comment="更新カウンタ"
+    )
+
+
 class SoftDeleteMixin:
     """Mixin to add soft delete functionality."""
     
@@ -1,7 +1,7 @@
 """
 ConsumerEvent model - 消費者行動ログ
 """
-from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, Index, Date, LargeBinary, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.base import TimestampMixin
@@ -31,5 +31,43 @@ class ConsumerEvent(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_consumer_events_type_created", "event_type", "created_at"),
         Index("ix_consumer_events_consumer_type", "consumer_id", "event_type"),
+        Index("ix_consumer_events_created_id", "created_at", "id"),
         {'comment': '消費者行動イベントログテーブル'}
     )
+
+
+class ConsumerEventDaily(Base, TimestampMixin):
+    """消費者行動イベントの日次集計 (分析ダッシュボード用ロールアップ)"""
+    __tablename__ = "consumer_event_daily"
+
+    day = Column(Date, primary_key=True, comment="集計日")
+    total_events = Column(Integer, nullable=False, default=0, comment="イベント総数")
+    event_counts = Column(JSON, nullable=False, default=dict, comment="イベント種別ごとの件数")
+    product_views = Column(JSON, nullable=False, default=list, comment="商品閲覧数 [[商品ID, 商品名, 件数], ...]")
+    search_counts = Column(JSON, nullable=False, default=dict, comment="検索キーワードごとの件数")
+    unique_consumers = Column(Integer, nullable=False, default=0, comment="ユニーク消費者数(推定)")
+    consumer_sketch = Column(LargeBinary, nullable=True, comment="ユニーク消費者のHyperLogLog")
+
+    __table_args__ = (
+        {'comment': '消費者行動イベント日次集計テーブル'},
+    )
+
+
+class ConsumerEventSketch(Base, TimestampMixin):
+    """ワーカーごとの当日リアルタイム集計スケッチ (/live 用、全ワーカー分をマージして使う)"""
+    __tablename__ = "consumer_event_sketches"
+
+    day = Column(Date, nullable=False, comment="集計日")
+    worker_id = Column(String(100), nullable=False, comment="ワーカー識別子 (ホスト名:PID)")
+    total_events = Column(Integer, nullable=False, default=0, comment="イベント総数")
+    event_counts = Column(JSON, nullable=False, default=dict, comment="イベント種別ごとの件数")
+    top_products = Column(JSON, nullable=True, comment="商品閲覧 Space-Saving サマリー")
+    top_searches = Column(JSON, nullable=True, comment="検索キーワード Space-Saving サマリー")
+    product_names = Column(JSON, nullable=True, comment="追跡中の商品名")
+    consumer_sketch = Column(LargeBinary, nullable=True, comment="ユニーク消費者のHyperLogLog")
+    session_sketch = Column(LargeBinary, nullable=True, comment="ユニークセッションのHyperLogLog")
+
+    __table_args__ = (
+        PrimaryKeyConstraint("day", "worker_id"),
+        {'comment': '消費者行動リアルタイム集計スケッチテーブル'},
+    )
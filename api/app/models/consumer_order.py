@@ -97,6 +97,14 @@ class ConsumerOrder(Base, TimestampMixin):
         comment="Stripe PaymentIntent ID"
     )
 
+    failed_refunds = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="失敗した返金の回数（返金の冪等キーに使用）"
+    )
+
     order_notes = Column(
         Text,
         nullable=True,
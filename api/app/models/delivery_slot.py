@@ -79,6 +79,7 @@ class DeliverySlot(Base, TimestampMixin):
 
     __table_args__ = (
         Index("ix_delivery_slots_date_type", "date", "slot_type"),
+        Index("uq_delivery_slots_date_type_text", "date", "slot_type", "time_text", unique=True),
         {'comment': 'B2C受取枠テーブル'}
     )
 
@@ -1,14 +1,14 @@
 """
 Farmer model - 生産者情報
 """
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
-from app.models.base import TimestampMixin, SoftDeleteMixin
+from app.models.base import RowVersionMixin, TimestampMixin, SoftDeleteMixin
 
 
-class Farmer(Base, TimestampMixin, SoftDeleteMixin):
+class Farmer(Base, TimestampMixin, SoftDeleteMixin, RowVersionMixin):
     """
     生産者 (Farmer) モデル
     
@@ -230,6 +230,8 @@ class Farmer(Base, TimestampMixin, SoftDeleteMixin):
     )
     
     __table_args__ = (
+        Index('ix_farmers_updated_at', 'updated_at'),
+        Index('ix_farmers_deleted_at', 'deleted_at'),
         {'comment': '生産者テーブル'}
     )
     
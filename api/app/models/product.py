@@ -6,11 +6,11 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from app.core.database import Base
-from app.models.base import TimestampMixin, SoftDeleteMixin
+from app.models.base import RowVersionMixin, TimestampMixin, SoftDeleteMixin
 from app.models.enums import StockType, TaxRate, ProductCategory, HarvestStatus, FarmingMethod
 
 
-class Product(Base, TimestampMixin, SoftDeleteMixin):
+class Product(Base, TimestampMixin, SoftDeleteMixin, RowVersionMixin):
     """
     商品 (Product) モデル
     
@@ -198,6 +198,8 @@ class Product(Base, TimestampMixin, SoftDeleteMixin):
         Index('ix_products_stock_type_active', 'stock_type', 'is_active'),
         Index('ix_products_category_active', 'category', 'is_active'),
         Index('ix_products_farmer_id_active', 'farmer_id', 'is_active'),
+        Index('ix_products_updated_at', 'updated_at'),
+        Index('ix_products_deleted_at', 'deleted_at'),
         {'comment': '商品テーブル'}
     )
     
@@ -2,16 +2,16 @@
 RetailProduct, ProcurementBatch, ProcurementItem models - 消費者向け小売商品 & 仕入れ管理
 """
 from sqlalchemy import (
-    Column, Integer, Numeric, DateTime, Date, ForeignKey, String, Text, JSON
+    Column, Integer, Numeric, DateTime, Date, ForeignKey, String, Text, JSON, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
-from app.models.base import TimestampMixin, SoftDeleteMixin
+from app.models.base import RowVersionMixin, TimestampMixin, SoftDeleteMixin
 
 
-class RetailProduct(Base, TimestampMixin, SoftDeleteMixin):
+class RetailProduct(Base, TimestampMixin, SoftDeleteMixin, RowVersionMixin):
     """消費者向け小売商品 (RetailProduct) モデル.
     管理者が農家の卸商品をもとに作成する、消費者が閲覧・購入する商品。
     """
@@ -48,7 +48,11 @@ class RetailProduct(Base, TimestampMixin, SoftDeleteMixin):
 
     source_product = relationship("Product", foreign_keys=[source_product_id])
 
-    __table_args__ = ({'comment': '消費者向け小売商品テーブル'},)
+    __table_args__ = (
+        Index('ix_retail_products_updated_at', 'updated_at'),
+        Index('ix_retail_products_deleted_at', 'deleted_at'),
+        {'comment': '消費者向け小売商品テーブル'},
+    )
 
     def __repr__(self):
         return f"<RetailProduct(id={self.id}, name='{self.name}')>"
@@ -1,46 +1,76 @@
 """
 Admin Access Logs Router
 """
-from fastapi import APIRouter, Depends, Query
+from datetime import date, datetime, time, timedelta
+
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select
 
 from app.core.database import get_db
+from app.core.pagination import paginate
+from app.core.streaming import FORMAT_PATTERN, stream_format, stream_query, table_columns
 from app.routers.admin_auth import get_current_admin
 from app.models import AccessLog
 from app.schemas import AccessLogListResponse
 
 router = APIRouter()
 
+ACCESS_LOG_COLUMNS = table_columns(AccessLog)
+
 
 @router.get("/access-logs", response_model=AccessLogListResponse)
 async def list_access_logs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="前ページの next_cursor (指定時は skip を無視)"),
     actor_type: str | None = Query(None, description="restaurant / farmer"),
     actor_id: int | None = Query(None, description="actor id"),
+    date_from: date | None = Query(None, description="この日以降"),
+    date_to: date | None = Query(None, description="この日まで"),
+    format: str | None = Query(None, pattern=FORMAT_PATTERN, description="ndjson / csv: 条件に合う全件をストリーミングで返す"),
+    request: Request = None,
     current_admin=Depends(get_current_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(AccessLog)
-    count_query = select(func.count(AccessLog.id))
+    """
+    アクセス履歴一覧 (新しい順)
 
+    (created_at, id) のキーセットページングで、件数は上限付きの推定値を返す。
+    format=ndjson|csv (または Accept: application/x-ndjson) の場合は全件を1行ずつ返す。
+    """
+    filters = []
     if actor_type:
-        query = query.where(AccessLog.actor_type == actor_type)
-        count_query = count_query.where(AccessLog.actor_type == actor_type)
+        filters.append(AccessLog.actor_type == actor_type)
     if actor_id:
-        query = query.where(AccessLog.actor_id == actor_id)
-        count_query = count_query.where(AccessLog.actor_id == actor_id)
+        filters.append(AccessLog.actor_id == actor_id)
+    if date_from:
+        filters.append(AccessLog.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        filters.append(AccessLog.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
 
-    total = await db.scalar(count_query)
+    fmt = stream_format(request, format)
+    if fmt:
+        query = (
+            select(*ACCESS_LOG_COLUMNS.values())
+            .where(*filters)
+            .order_by(AccessLog.created_at.desc(), AccessLog.id.desc())
+        )
+        return stream_query(query, list(ACCESS_LOG_COLUMNS), fmt, "access_logs")
 
-    query = query.order_by(desc(AccessLog.created_at)).offset(skip).limit(limit)
-    result = await db.execute(query)
-    logs = result.scalars().all()
+    query = select(AccessLog).where(*filters)
+
+    page = await paginate(
+        db, query, skip=skip, limit=limit, count="approximate",
+        keyset=[AccessLog.created_at, AccessLog.id], cursor=cursor,
+        table_name="access_logs", filtered=bool(filters),
+    )
 
     return AccessLogListResponse(
-        items=logs,
-        total=total or 0,
+        items=page.items,
+        total=page.total,
         skip=skip,
         limit=limit,
+        next_cursor=page.next_cursor,
+        total_is_estimate=page.total_is_estimate,
     )
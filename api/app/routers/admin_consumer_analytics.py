@@ -1,19 +1,25 @@
 """
 Admin Consumer Analytics Router - 消費者行動分析
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
-from datetime import datetime, timedelta
+from sqlalchemy import select, func
+from datetime import date, datetime, time, timedelta
 from typing import Optional
 
 from app.core.database import get_db
+from app.core.pagination import paginate
+from app.core.streaming import FORMAT_PATTERN, stream_format, stream_query, table_columns
 from app.routers.admin_auth import get_current_admin
 from app.models.consumer_event import ConsumerEvent
 from app.models import Consumer
+from app.services.analytics_rollup import summarize
+from app.services.live_analytics import live_analytics
 
 router = APIRouter()
 
+CONSUMER_EVENT_COLUMNS = table_columns(ConsumerEvent, exclude=("updated_at",))
+
 
 @router.get("/summary")
 async def get_analytics_summary(
@@ -21,90 +27,68 @@ async def get_analytics_summary(
     db: AsyncSession = Depends(get_db),
     _=Depends(get_current_admin),
 ):
-    """指定期間の消費者行動サマリー"""
-    since = datetime.now() - timedelta(days=days)
-
-    # Total events
-    total = await db.scalar(
-        select(func.count(ConsumerEvent.id)).where(ConsumerEvent.created_at >= since)
-    )
-
-    # Unique consumers
-    unique_consumers = await db.scalar(
-        select(func.count(func.distinct(ConsumerEvent.consumer_id))).where(
-            ConsumerEvent.created_at >= since,
-            ConsumerEvent.consumer_id.isnot(None)
-        )
-    )
+    """
+    指定期間の消費者行動サマリー
+
+    確定済みの日は日次集計 (consumer_event_daily) から読み、当日分のみ生イベントを集計する。
+    期間は日単位 (days 日前の 0:00 から現在まで)。
+    """
+    first_day = (datetime.now() - timedelta(days=days)).date()
+    agg = await summarize(db, first_day)
+
+    cart_adds = agg.event_counts.get("add_to_cart", 0)
+    orders = agg.event_counts.get("order_complete", 0)
+    event_breakdown = [
+        {"event_type": event_type, "count": count}
+        for event_type, count in sorted(agg.event_counts.items(), key=lambda kv: kv[1], reverse=True)
+    ]
 
-    # Event breakdown
-    stmt = (
-        select(ConsumerEvent.event_type, func.count(ConsumerEvent.id).label("count"))
-        .where(ConsumerEvent.created_at >= since)
-        .group_by(ConsumerEvent.event_type)
-        .order_by(desc("count"))
-    )
-    result = await db.execute(stmt)
-    event_breakdown = [{"event_type": r.event_type, "count": r.count} for r in result.all()]
+    return {
+        "period_days": days,
+        "total_events": agg.total,
+        "unique_consumers": agg.consumers.count(),
+        "event_breakdown": event_breakdown,
+        "top_viewed_products": agg.top_products(20),
+        "top_searches": agg.top_searches(20),
+        "cart_adds": cart_adds,
+        "order_completes": orders,
+        "conversion_rate": round(orders / max(cart_adds or 1, 1) * 100, 1),
+    }
 
-    # Top viewed products
-    stmt = (
-        select(
-            ConsumerEvent.product_id,
-            ConsumerEvent.product_name,
-            func.count(ConsumerEvent.id).label("view_count")
-        )
-        .where(
-            ConsumerEvent.created_at >= since,
-            ConsumerEvent.event_type == "product_view",
-            ConsumerEvent.product_id.isnot(None)
-        )
-        .group_by(ConsumerEvent.product_id, ConsumerEvent.product_name)
-        .order_by(desc("view_count"))
-        .limit(20)
-    )
-    result = await db.execute(stmt)
-    top_products = [{"product_id": r.product_id, "product_name": r.product_name, "view_count": r.view_count} for r in result.all()]
 
-    # Top searches
-    stmt = (
-        select(ConsumerEvent.search_query, func.count(ConsumerEvent.id).label("count"))
-        .where(
-            ConsumerEvent.created_at >= since,
-            ConsumerEvent.event_type == "search",
-            ConsumerEvent.search_query.isnot(None)
-        )
-        .group_by(ConsumerEvent.search_query)
-        .order_by(desc("count"))
-        .limit(20)
-    )
-    result = await db.execute(stmt)
-    top_searches = [{"query": r.search_query, "count": r.count} for r in result.all()]
+@router.get("/live")
+async def get_live_analytics(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    _=Depends(get_current_admin),
+):
+    """
+    本日のリアルタイム集計 (全ワーカーのスケッチをマージ)
 
-    # Cart additions vs orders (conversion)
-    cart_adds = await db.scalar(
-        select(func.count(ConsumerEvent.id)).where(
-            ConsumerEvent.created_at >= since,
-            ConsumerEvent.event_type == "add_to_cart"
-        )
-    )
-    orders = await db.scalar(
-        select(func.count(ConsumerEvent.id)).where(
-            ConsumerEvent.created_at >= since,
-            ConsumerEvent.event_type == "order_complete"
-        )
-    )
+    人気商品・検索ワードは Space-Saving による推定値 (error は最大の過大計上幅)、
+    ユニーク数は HyperLogLog による推定値。他ワーカー分は最大 LIVE_ANALYTICS_FLUSH_INTERVAL 秒遅れる。
+    """
+    live = await live_analytics.snapshot(db)
 
     return {
-        "period_days": days,
-        "total_events": total or 0,
-        "unique_consumers": unique_consumers or 0,
-        "event_breakdown": event_breakdown,
-        "top_viewed_products": top_products,
-        "top_searches": top_searches,
-        "cart_adds": cart_adds or 0,
-        "order_completes": orders or 0,
-        "conversion_rate": round((orders or 0) / max(cart_adds or 1, 1) * 100, 1),
+        "day": live.day.isoformat(),
+        "total_events": live.total,
+        "event_counts": live.event_counts,
+        "unique_consumers": live.consumers.count(),
+        "unique_sessions": live.sessions.count(),
+        "top_viewed_products": [
+            {
+                "product_id": int(key),
+                "product_name": live.product_names.get(key),
+                "view_count": count,
+                "error": error,
+            }
+            for key, count, error in live.products.top(limit)
+        ],
+        "top_searches": [
+            {"query": query, "count": count, "error": error}
+            for query, count, error in live.searches.top(limit)
+        ],
     }
 
 
@@ -114,20 +98,44 @@ async def list_consumer_events(
     consumer_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor (指定時は skip を無視)"),
+    date_from: Optional[date] = Query(None, description="この日以降"),
+    date_to: Optional[date] = Query(None, description="この日まで"),
+    format: Optional[str] = Query(None, pattern=FORMAT_PATTERN, description="ndjson / csv: 条件に合う全件をストリーミングで返す"),
+    request: Request = None,
     db: AsyncSession = Depends(get_db),
     _=Depends(get_current_admin),
 ):
-    """消費者イベント一覧"""
-    query = select(ConsumerEvent).order_by(ConsumerEvent.created_at.desc())
+    """
+    消費者イベント一覧 ((created_at, id) のキーセットページング、件数は推定値)
 
+    format=ndjson|csv (または Accept: application/x-ndjson) の場合は全件を1行ずつ返す。
+    """
+    filters = []
     if event_type:
-        query = query.where(ConsumerEvent.event_type == event_type)
+        filters.append(ConsumerEvent.event_type == event_type)
     if consumer_id:
-        query = query.where(ConsumerEvent.consumer_id == consumer_id)
+        filters.append(ConsumerEvent.consumer_id == consumer_id)
+    if date_from:
+        filters.append(ConsumerEvent.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        filters.append(ConsumerEvent.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
+
+    fmt = stream_format(request, format)
+    if fmt:
+        query = (
+            select(*CONSUMER_EVENT_COLUMNS.values())
+            .where(*filters)
+            .order_by(ConsumerEvent.created_at.desc(), ConsumerEvent.id.desc())
+        )
+        return stream_query(query, list(CONSUMER_EVENT_COLUMNS), fmt, "consumer_events")
 
-    total = await db.scalar(select(func.count()).select_from(query.subquery()))
-    result = await db.execute(query.offset(skip).limit(limit))
-    events = result.scalars().all()
+    query = select(ConsumerEvent).where(*filters)
+    page = await paginate(
+        db, query, skip=skip, limit=limit, count="approximate",
+        keyset=[ConsumerEvent.created_at, ConsumerEvent.id], cursor=cursor,
+        table_name="consumer_events", filtered=bool(filters),
+    )
 
     return {
         "items": [
@@ -148,11 +156,13 @@ async def list_consumer_events(
                 "metadata": e.metadata_,
                 "created_at": e.created_at,
             }
-            for e in events
+            for e in page.items
         ],
-        "total": total or 0,
+        "total": page.total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": page.next_cursor,
+        "total_is_estimate": page.total_is_estimate,
     }
 
 
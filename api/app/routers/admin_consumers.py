@@ -1,51 +1,59 @@
 """
 Admin Consumer Management Router
 """
-import stripe
 from datetime import datetime
 
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc
 from sqlalchemy.orm import selectinload
 
-from app.core.config import settings
 from app.core.database import get_db
+from app.core.fast_json import SchemaJSONResponse
+from app.core.pagination import paginate
+from app.core.projection import VIEW_PATTERN
+from app.core.streaming import FORMAT_PATTERN, stream_format, stream_query, table_columns
 from app.routers.admin_auth import require_super_admin
+from app.routers.consumer_orders import CONSUMER_ORDER_SUMMARY
 from app.models import Admin, Consumer, SupportMessage, Farmer, ConsumerOrder, ConsumerOrderItem, Product, DeliverySlot
 from app.models.enums import OrderStatus
 from app.services.line_notify import line_service
-
-stripe.api_key = settings.STRIPE_SECRET_KEY
+from app.services.payment_gateway import PaymentError, payment_gateway
 
 router = APIRouter()
 
+# ストリーミング出力する消費者の列
+CONSUMER_COLUMNS = table_columns(Consumer)
+
 
 @router.get("/consumers/")
 async def list_consumers(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    format: Optional[str] = Query(None, pattern=FORMAT_PATTERN, description="ndjson / csv: 全件をストリーミングで返す"),
     _: Admin = Depends(require_super_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
     消費者一覧を取得（管理者用）
+
+    format=ndjson|csv (または Accept: application/x-ndjson) の場合は全件を1行ずつ返す。
     """
-    query = select(Consumer).order_by(desc(Consumer.created_at)).offset(skip).limit(limit)
-    result = await db.execute(query)
-    consumers = result.scalars().all()
-    
-    # Count total
-    count_query = select(Consumer)
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
-    
+    fmt = stream_format(request, format)
+    if fmt:
+        query = select(*CONSUMER_COLUMNS.values()).order_by(desc(Consumer.created_at), desc(Consumer.id))
+        return stream_query(query, list(CONSUMER_COLUMNS), fmt, "consumers")
+
+    query = select(Consumer).order_by(desc(Consumer.created_at))
+    page = await paginate(db, query, skip=skip, limit=limit)
+
     return {
-        "items": consumers,
-        "total": total,
+        "items": page.items,
+        "total": page.total,
         "skip": skip,
         "limit": limit
     }
@@ -150,12 +158,32 @@ async def get_consumer_messages(
 @router.get("/consumers/{consumer_id}/orders")
 async def get_consumer_orders(
     consumer_id: int,
+    view: str = Query("full", pattern=VIEW_PATTERN, description="summary: 一覧用の列のみ / full: 明細を含む"),
+    fields: Optional[str] = Query(None, description="返す項目 (カンマ区切り、ConsumerOrderSummary の項目。指定時は summary 扱い)"),
+    format: Optional[str] = Query(None, pattern=FORMAT_PATTERN, description="ndjson / csv: summary の列をストリーミングで返す"),
+    request: Request = None,
     _: Admin = Depends(require_super_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
     消費者の注文履歴を取得（管理者用）
+
+    view=summary / fields= の場合は明細を読み込まず、必要な列だけを返す。
+    format=ndjson|csv の場合は summary の列をストリーミングする。
     """
+    fmt = stream_format(request, format)
+    names = CONSUMER_ORDER_SUMMARY.resolve("summary" if fmt else view, fields)
+    if names is not None:
+        query = (
+            CONSUMER_ORDER_SUMMARY.select(names)
+            .where(ConsumerOrder.consumer_id == consumer_id)
+            .order_by(desc(ConsumerOrder.created_at))
+        )
+        if fmt:
+            return stream_query(query, names, fmt, f"consumer_{consumer_id}_orders")
+        result = await db.execute(query)
+        return SchemaJSONResponse(CONSUMER_ORDER_SUMMARY.rows(result.all(), names))
+
     query = (
         select(ConsumerOrder)
         .options(
@@ -237,9 +265,13 @@ async def cancel_consumer_order(
     refund_id = None
     if order.payment_method == "card" and order.stripe_payment_intent_id:
         try:
-            refund = stripe.Refund.create(payment_intent=order.stripe_payment_intent_id)
-            refund_id = refund.id
-        except stripe.error.StripeError as e:
+            refund_id = await payment_gateway.refund(
+                order.stripe_payment_intent_id, order_id=order.id, attempt=order.failed_refunds
+            )
+        except PaymentError as e:
+            # 次回の返金は新しい冪等キーで試行する（同じキーでは失敗が再送される）
+            order.failed_refunds += 1
+            await db.commit()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Stripe返金に失敗しました: {str(e)}",
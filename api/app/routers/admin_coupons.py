@@ -3,9 +3,10 @@ Admin Coupon Management Router
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.routers.admin_auth import require_super_admin
 from app.models import Admin, Coupon
 from app.schemas.coupon import CouponCreate, CouponUpdate, CouponResponse, CouponListResponse
@@ -20,14 +21,10 @@ async def list_coupons(
     _: Admin = Depends(require_super_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Coupon).order_by(desc(Coupon.created_at)).offset(skip).limit(limit)
-    result = await db.execute(query)
-    items = result.scalars().all()
+    query = select(Coupon).order_by(desc(Coupon.created_at))
+    page = await paginate(db, query, skip=skip, limit=limit)
 
-    count_result = await db.execute(select(func.count(Coupon.id)))
-    total = count_result.scalar() or 0
-
-    return CouponListResponse(items=items, total=total)
+    return CouponListResponse(items=page.items, total=page.total)
 
 
 @router.post("/coupons/", response_model=CouponResponse, status_code=status.HTTP_201_CREATED)
@@ -3,15 +3,29 @@ Admin Delivery Slots Router - 受取枠管理
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.models import DeliverySlot
 from app.schemas import DeliverySlotCreate, DeliverySlotUpdate, DeliverySlotResponse, DeliverySlotListResponse
 from app.routers.admin_auth import get_current_admin
+from app.services.delivery_slots import delivery_slot_cache
 
 router = APIRouter()
 
+DUPLICATE_SLOT_DETAIL = "同じ日時・種別の枠が既に存在します"
+
+
+async def _commit_slot(db: AsyncSession) -> None:
+    """コミット（uq_delivery_slots_date_type_text 違反は 409）"""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_SLOT_DETAIL)
+
 
 @router.get("/", response_model=DeliverySlotListResponse)
 async def list_delivery_slots(
@@ -22,12 +36,8 @@ async def list_delivery_slots(
 ):
     """List delivery slots for admin."""
     stmt = select(DeliverySlot).order_by(DeliverySlot.date.desc(), DeliverySlot.start_time.desc().nulls_last())
-    count_stmt = select(func.count(DeliverySlot.id))
-
-    total = await db.scalar(count_stmt)
-    result = await db.execute(stmt.offset(skip).limit(limit))
-    slots = result.scalars().all()
-    return DeliverySlotListResponse(items=slots, total=total or 0, skip=skip, limit=limit)
+    page = await paginate(db, stmt, skip=skip, limit=limit)
+    return DeliverySlotListResponse(items=page.items, total=page.total, skip=skip, limit=limit)
 
 
 @router.post("/", response_model=DeliverySlotResponse, status_code=status.HTTP_201_CREATED)
@@ -39,8 +49,9 @@ async def create_delivery_slot(
     """Create a new delivery slot."""
     slot = DeliverySlot(**payload.model_dump())
     db.add(slot)
-    await db.commit()
+    await _commit_slot(db)
     await db.refresh(slot)
+    await delivery_slot_cache.load()
     return slot
 
 
@@ -63,8 +74,9 @@ async def update_delivery_slot(
     for field, value in update_data.items():
         setattr(slot, field, value)
 
-    await db.commit()
+    await _commit_slot(db)
     await db.refresh(slot)
+    await delivery_slot_cache.load()
     return slot
 
 
@@ -91,3 +103,4 @@ async def delete_delivery_slot(
         # 外部キー制約で削除できない場合は非公開にする
         slot.is_active = False
         await db.commit()
+    await delivery_slot_cache.load()
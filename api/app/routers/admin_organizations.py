@@ -1,9 +1,10 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.models import Admin, Organization
 from app.schemas import (
     OrganizationCreate,
@@ -26,16 +27,10 @@ async def get_organizations(
     db: AsyncSession = Depends(get_db)
 ) -> Any:
     """組織一覧を取得"""
-    query = select(Organization).offset(skip).limit(limit)
-    result = await db.execute(query)
-    items = result.scalars().all()
-    
-    # Total count
-    count_query = select(func.count()).select_from(Organization)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar_one()
-    
-    return {"items": items, "total": total}
+    query = select(Organization).order_by(Organization.id)
+    page = await paginate(db, query, skip=skip, limit=limit)
+
+    return {"items": page.items, "total": page.total}
 
 @router.post("/", response_model=OrganizationResponse)
 async def create_organization(
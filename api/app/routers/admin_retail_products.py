@@ -2,13 +2,14 @@
 Admin Retail Products API Router - 消費者向け小売商品の管理
 """
 from datetime import datetime
-from decimal import Decimal, ROUND_UP
+from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.routers.admin_auth import get_current_admin
 from app.models.retail_product import RetailProduct
 from app.models.product import Product
@@ -21,8 +22,11 @@ from app.schemas.retail_product import (
     RetailProductListResponse,
     SuggestPriceRequest,
     SuggestPriceResponse,
+    RepriceRequest,
+    RepriceResponse,
 )
 from app.schemas.base import ResponseMessage
+from app.services.repricing import reprice_retail_products, retail_price_breakdown
 
 router = APIRouter()
 
@@ -63,20 +67,15 @@ async def list_retail_products(
 
     query = query.order_by(RetailProduct.display_order.asc(), RetailProduct.id.asc())
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    products = result.scalars().all()
+    page = await paginate(db, query, skip=skip, limit=limit)
 
     items = []
-    for rp in products:
+    for rp in page.items:
         data = RetailProductResponse.model_validate(rp).model_dump()
         data["source_product"] = _build_source_product_info(rp)
         items.append(data)
 
-    return RetailProductListResponse(items=items, total=total or 0, skip=skip, limit=limit)
+    return RetailProductListResponse(items=items, total=page.total, skip=skip, limit=limit)
 
 
 @router.post("/retail-products", response_model=RetailProductResponse, status_code=status.HTTP_201_CREATED)
@@ -175,18 +174,43 @@ async def suggest_retail_price(
     if factor <= 0 or multiplier <= 0:
         raise HTTPException(status_code=400, detail="変換係数とマージン係数は0より大きい必要があります")
 
-    cost_per_unit = cost / factor
-    with_margin = cost_per_unit / (Decimal("1") - margin / Decimal("100"))
-    suggested = (with_margin / multiplier).quantize(Decimal("1"), rounding=ROUND_UP)
+    if margin >= 100:
+        raise HTTPException(status_code=400, detail="廃棄マージンは100%未満である必要があります")
+
+    parts = retail_price_breakdown(cost, factor, margin, multiplier, data.set_quantity)
+    cost_per_unit = parts.cost_per_unit
+    bundle = f" × {data.set_quantity}個" if data.set_quantity > 1 else ""
 
     breakdown = (
-        f"仕入値 ¥{cost} ÷ {factor} = ¥{cost_per_unit:.0f}/小売単位 → "
-        f"廃棄{margin}%込み ¥{with_margin:.0f} → "
-        f"マージン{multiplier}で ¥{suggested}"
+        f"仕入値 ¥{cost}{bundle} ÷ {factor} = ¥{cost_per_unit:.0f}/小売単位 → "
+        f"廃棄{margin}%込み ¥{parts.with_margin:.0f} → "
+        f"マージン{multiplier}で ¥{parts.price}"
     )
 
     return SuggestPriceResponse(
-        suggested_price=suggested,
+        suggested_price=parts.price,
         cost_per_retail_unit=cost_per_unit.quantize(Decimal("1")),
         breakdown=breakdown,
     )
+
+
+@router.post("/retail-products/reprice", response_model=RepriceResponse)
+async def reprice_retail_products_endpoint(
+    data: RepriceRequest,
+    db: AsyncSession = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    """
+    管理者用: 小売価格の一括再計算
+
+    価格係数の変更や仕入値の変更後に、対象の小売商品の価格を推奨価格の計算式で
+    まとめて再計算する。dry_run=true（デフォルト）は差分のみ返し、false で一括更新する。
+    """
+    return await reprice_retail_products(
+        db,
+        multiplier=data.price_multiplier,
+        source_product_ids=data.source_product_ids,
+        retail_product_ids=data.retail_product_ids,
+        include_inactive=data.include_inactive,
+        dry_run=data.dry_run,
+    )
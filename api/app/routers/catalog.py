@@ -0,0 +1,161 @@
+"""
+Catalog API Router - カタログ差分同期
+
+LIFF クライアントがローカルにカタログを保持し、前回からの変更分だけを取得するためのAPI。
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models import Farmer, Product
+from app.models.enums import HarvestStatus
+from app.models.retail_product import RetailProduct
+from app.routers.retail_products import _retail_to_dict
+from app.schemas import CatalogChangesResponse
+
+router = APIRouter()
+
+TOKEN_PREFIX = "v1."
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive UTC timestamps for func.now()
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _encode_token(issued_at: datetime) -> str:
+    return f"{TOKEN_PREFIX}{(_as_utc(issued_at) - EPOCH) // timedelta(microseconds=1)}"
+
+
+def _decode_token(token: str) -> datetime:
+    if not token.startswith(TOKEN_PREFIX):
+        raise ValueError(token)
+    return EPOCH + timedelta(microseconds=int(token[len(TOKEN_PREFIX):]))
+
+
+def _is_listed_product(product: Product) -> bool:
+    # harvest_status IS NULL は一覧の SQL (!= 'ended') でも除外される
+    return (
+        product.deleted_at is None
+        and product.farmer is not None
+        and product.farmer.deleted_at is None
+        and product.harvest_status is not None
+        and product.harvest_status != HarvestStatus.ENDED.value
+    )
+
+
+def _is_listed_retail(rp: RetailProduct) -> bool:
+    sp = rp.source_product
+    return (
+        rp.deleted_at is None
+        and rp.is_active == 1
+        and sp is not None
+        and sp.deleted_at is None
+        and sp.farmer is not None
+        and sp.farmer.deleted_at is None
+    )
+
+
+@router.get("/changes", response_model=CatalogChangesResponse)
+async def list_catalog_changes(
+    since: Optional[str] = Query(None, description="前回レスポンスの token"),
+    updated_since: Optional[datetime] = Query(None, description="この日時以降の変更（token の代わりに指定可）"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    商品・小売商品・生産者の差分を取得
+
+    since / updated_since がなければ全件（full=true）を返す。指定時はそれ以降に更新・削除された
+    行のみ返す（updated_at / deleted_at で判定）。削除・掲載終了・非公開になったものは deleted に
+    IDで入る。生産者が変更・削除された場合はその生産者の商品・小売商品も返す（削除された生産者の
+    商品は deleted に入る）。生産者の表示状態（is_active）による絞り込みは farmers を使ってクライアント側で行う。
+    トークン発行時に未コミットだった更新を取りこぼさないよう、CATALOG_SYNC_OVERLAP 秒
+    さかのぼって検索するため、同じ行が続けて返ることがある（クライアントはIDで上書きすること）。
+    """
+    if since:
+        try:
+            threshold = _decode_token(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid change token")
+    elif updated_since:
+        threshold = _as_utc(updated_since)
+    else:
+        threshold = None
+
+    # トークンはDBの時計で発行する（updated_at と同じ時計）
+    issued_at = await db.scalar(select(func.now()))
+    full = threshold is None
+
+    product_query = select(Product).options(selectinload(Product.farmer)).order_by(Product.id)
+    retail_query = (
+        select(RetailProduct)
+        .options(selectinload(RetailProduct.source_product).selectinload(Product.farmer))
+        .order_by(RetailProduct.id)
+    )
+    farmer_query = select(Farmer).order_by(Farmer.id)
+    if full:
+        product_query = product_query.join(Product.farmer).where(
+            Product.deleted_at.is_(None),
+            Farmer.deleted_at.is_(None),
+            Product.harvest_status != HarvestStatus.ENDED.value,
+        )
+        retail_query = retail_query.join(RetailProduct.source_product).join(Product.farmer).where(
+            RetailProduct.deleted_at.is_(None),
+            RetailProduct.is_active == 1,
+            Product.deleted_at.is_(None),
+            Farmer.deleted_at.is_(None),
+        )
+        farmer_query = farmer_query.where(Farmer.deleted_at.is_(None))
+    else:
+        start = threshold - timedelta(seconds=settings.CATALOG_SYNC_OVERLAP)
+        changed_farmer = or_(Farmer.updated_at >= start, Farmer.deleted_at >= start)
+        # 生産者の削除で一覧から消える商品があるため、生産者が変わった商品も返す
+        changed_product = or_(
+            Product.updated_at >= start,
+            Product.deleted_at >= start,
+            Product.farmer_id.in_(select(Farmer.id).where(changed_farmer)),
+        )
+        product_query = product_query.where(changed_product)
+        # 小売商品は元の農家商品の在庫・削除も反映するため、元商品が変わったものも返す
+        retail_query = retail_query.where(or_(
+            RetailProduct.updated_at >= start,
+            RetailProduct.deleted_at >= start,
+            RetailProduct.source_product_id.in_(select(Product.id).where(changed_product)),
+        ))
+        farmer_query = farmer_query.where(changed_farmer)
+
+    products = {"updated": [], "deleted": []}
+    for product in (await db.execute(product_query)).scalars():
+        if _is_listed_product(product):
+            products["updated"].append(product)
+        else:
+            products["deleted"].append(product.id)
+
+    retail_products = {"updated": [], "deleted": []}
+    for rp in (await db.execute(retail_query)).scalars():
+        if _is_listed_retail(rp):
+            retail_products["updated"].append(_retail_to_dict(rp))
+        else:
+            retail_products["deleted"].append(rp.id)
+
+    farmers = {"updated": [], "deleted": []}
+    for farmer in (await db.execute(farmer_query)).scalars():
+        if farmer.deleted_at is None:
+            farmers["updated"].append(farmer)
+        else:
+            farmers["deleted"].append(farmer.id)
+
+    return {
+        "token": _encode_token(issued_at),
+        "full": full,
+        "products": products,
+        "retail_products": retail_products,
+        "farmers": farmers,
+    }
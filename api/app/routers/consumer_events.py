@@ -1,20 +1,42 @@
 """
 Consumer Events API Router - 消費者行動ログ
+
+イベントはリクエストごとにコミットせず、write-behind バッファに積んで
+まとめて INSERT する (app/services/event_buffer.py)。
 """
-from fastapi import APIRouter, Depends, Request, Query
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert
 from typing import Optional
 from pydantic import BaseModel, Field
 from typing import List, Any
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.dependencies import get_line_user_id
 from app.models.consumer_event import ConsumerEvent
 from app.models import Consumer
+from app.services.event_buffer import BufferFull, WriteBehindBuffer, register_buffer
+from app.services.live_analytics import live_analytics
 
 router = APIRouter()
 
+consumer_event_buffer = register_buffer(WriteBehindBuffer(
+    ConsumerEvent.__table__,
+    capacity=settings.CONSUMER_EVENT_BUFFER_CAPACITY,
+    flush_size=settings.CONSUMER_EVENT_FLUSH_SIZE,
+    flush_interval=settings.CONSUMER_EVENT_FLUSH_INTERVAL,
+    overflow_policy=settings.CONSUMER_EVENT_OVERFLOW_POLICY,
+))
+if settings.LIVE_ANALYTICS_ENABLED:
+    register_buffer(live_analytics)
+
+# line_user_id -> consumer_id (未登録の None は短めにキャッシュ)
+_consumer_id_cache = TTLCache(maxsize=10000, ttl=300)
+_UNKNOWN_CONSUMER_TTL = 30
+
 
 class ConsumerEventCreate(BaseModel):
     event_type: str = Field(..., max_length=50)
@@ -31,6 +53,75 @@ class ConsumerEventCreate(BaseModel):
     metadata: Optional[dict] = None
 
 
+class ConsumerEventBatch(BaseModel):
+    events: List[ConsumerEventCreate] = Field(..., min_length=1, max_length=settings.CONSUMER_EVENT_BATCH_MAX)
+
+
+async def _resolve_consumer_id(line_user_id: str, db: AsyncSession) -> Optional[int]:
+    """line_user_id から consumer_id を引く (TTL キャッシュ付き)"""
+    cached = _consumer_id_cache.get(line_user_id, ...)
+    if cached is not ...:
+        return cached
+
+    consumer_id = await db.scalar(select(Consumer.id).where(Consumer.line_user_id == line_user_id))
+    _consumer_id_cache.set(line_user_id, consumer_id, ttl=None if consumer_id else _UNKNOWN_CONSUMER_TTL)
+    return consumer_id
+
+
+def _event_row(event: ConsumerEventCreate, consumer_id: Optional[int], request: Request, now: datetime) -> dict:
+    """バルク INSERT 用の行 (全カラムを揃えて executemany を1文にまとめる)"""
+    return {
+        "consumer_id": consumer_id,
+        "session_id": event.session_id,
+        "event_type": event.event_type,
+        "page": event.page,
+        "product_id": event.product_id,
+        "product_name": event.product_name,
+        "farmer_id": event.farmer_id,
+        "farmer_name": event.farmer_name,
+        "quantity": event.quantity,
+        "search_query": event.search_query,
+        "cart_item_count": event.cart_item_count,
+        "cart_total": event.cart_total,
+        "metadata": event.metadata,
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent", "")[:512],
+        # 受付時刻を記録する (フラッシュ時刻ではなく)
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def _record_events(
+    events: List[ConsumerEventCreate],
+    request: Request,
+    line_user_id: str,
+    db: AsyncSession,
+) -> dict:
+    consumer_id = await _resolve_consumer_id(line_user_id, db)
+    now = datetime.now(timezone.utc)
+    rows = [_event_row(event, consumer_id, request, now) for event in events]
+
+    if not settings.CONSUMER_EVENT_BUFFER_ENABLED:
+        await db.execute(insert(ConsumerEvent.__table__), rows)
+        await db.commit()
+        if settings.LIVE_ANALYTICS_ENABLED:
+            live_analytics.observe(rows)
+        return {"ok": True, "accepted": len(rows), "dropped": 0}
+
+    try:
+        accepted = consumer_event_buffer.offer(rows)
+    except BufferFull:
+        raise HTTPException(
+            status_code=503,
+            detail="イベントの受付が混み合っています。しばらくしてから再送してください",
+            headers={"Retry-After": str(max(int(settings.CONSUMER_EVENT_FLUSH_INTERVAL), 1))},
+        )
+    if settings.LIVE_ANALYTICS_ENABLED:
+        live_analytics.observe(rows[:accepted])
+    return {"ok": True, "accepted": accepted, "dropped": len(rows) - accepted}
+
+
 @router.post("/")
 async def log_consumer_event(
     event: ConsumerEventCreate,
@@ -39,31 +130,15 @@ async def log_consumer_event(
     db: AsyncSession = Depends(get_db)
 ):
     """消費者の行動イベントを記録"""
-    # Get consumer_id from line_user_id
-    consumer_id = None
-    stmt = select(Consumer.id).where(Consumer.line_user_id == line_user_id)
-    result = await db.scalar(stmt)
-    if result:
-        consumer_id = result
-
-    db_event = ConsumerEvent(
-        consumer_id=consumer_id,
-        session_id=event.session_id,
-        event_type=event.event_type,
-        page=event.page,
-        product_id=event.product_id,
-        product_name=event.product_name,
-        farmer_id=event.farmer_id,
-        farmer_name=event.farmer_name,
-        quantity=event.quantity,
-        search_query=event.search_query,
-        cart_item_count=event.cart_item_count,
-        cart_total=event.cart_total,
-        metadata_=event.metadata,
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent", "")[:512],
-    )
-    db.add(db_event)
-    await db.commit()
-
-    return {"ok": True}
+    return await _record_events([event], request, line_user_id, db)
+
+
+@router.post("/batch")
+async def log_consumer_events_batch(
+    batch: ConsumerEventBatch,
+    request: Request,
+    line_user_id: str = Depends(get_line_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """消費者の行動イベントをまとめて記録 (LINE認証・消費者検索は1回のみ)"""
+    return await _record_events(batch.events, request, line_user_id, db)
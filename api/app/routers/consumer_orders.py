@@ -1,36 +1,77 @@
 """
 Consumer Orders Router - B2C注文管理
 """
-import stripe
 from decimal import Decimal
 from datetime import time, datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
-from app.core.config import settings
 from app.core.database import get_db
+from app.core.fast_json import SchemaJSONResponse, model_response
+from app.core.pagination import paginate
+from app.core.projection import VIEW_PATTERN, Projection
+from app.core.streaming import FORMAT_PATTERN, stream_format, stream_query
 from app.core.dependencies import get_current_consumer
 from app.models import ConsumerOrder, ConsumerOrderItem, Product, DeliverySlot, Consumer, Coupon
 from app.models.retail_product import RetailProduct, ProcurementBatch
 from app.models.enums import OrderStatus, DeliverySlotType, ProcurementStatus
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
 # 消費者がキャンセル可能なステータス
 CONSUMER_CANCELLABLE_STATUSES = {OrderStatus.PENDING, OrderStatus.CONFIRMED}
 from app.schemas import (
     ConsumerOrderCreate,
     ConsumerOrderResponse,
     ConsumerOrderListResponse,
+    ConsumerOrderSummary,
 )
+from app.services.delivery_slots import delivery_slot_cache
 from app.services.line_notify import line_service
+from app.services.payment_gateway import PaymentError, payment_gateway
 
 router = APIRouter()
 
+# 注文一覧の軽量表示 (view=summary / fields=) で返す列。管理画面の注文履歴でも使う
+CONSUMER_ORDER_SUMMARY = Projection(
+    ConsumerOrderSummary,
+    {
+        "id": ConsumerOrder.id,
+        "consumer_id": ConsumerOrder.consumer_id,
+        "delivery_type": ConsumerOrder.delivery_type,
+        "delivery_label": ConsumerOrder.delivery_label,
+        "delivery_time_label": ConsumerOrder.delivery_time_label,
+        "delivery_date": select(DeliverySlot.date).where(DeliverySlot.id == ConsumerOrder.delivery_slot_id).scalar_subquery(),
+        "payment_method": ConsumerOrder.payment_method,
+        "status": ConsumerOrder.status,
+        "subtotal": ConsumerOrder.subtotal,
+        "tax_amount": ConsumerOrder.tax_amount,
+        "discount_amount": ConsumerOrder.discount_amount,
+        "shipping_fee": ConsumerOrder.shipping_fee,
+        "total_amount": ConsumerOrder.total_amount,
+        "created_at": ConsumerOrder.created_at,
+        "cancelled_at": ConsumerOrder.cancelled_at,
+        "item_count": select(func.count(ConsumerOrderItem.id)).where(ConsumerOrderItem.order_id == ConsumerOrder.id).scalar_subquery(),
+        "consumer_name": select(Consumer.name).where(Consumer.id == ConsumerOrder.consumer_id).scalar_subquery(),
+        "delivery_slot_id": ConsumerOrder.delivery_slot_id,
+        "delivery_address": ConsumerOrder.delivery_address,
+        "delivery_notes": ConsumerOrder.delivery_notes,
+        "order_notes": ConsumerOrder.order_notes,
+        "coupon_code": ConsumerOrder.coupon_code,
+        "stripe_payment_intent_id": ConsumerOrder.stripe_payment_intent_id,
+        "confirmed_at": ConsumerOrder.confirmed_at,
+        "delivered_at": ConsumerOrder.delivered_at,
+        "updated_at": ConsumerOrder.updated_at,
+    },
+    default=[
+        "id", "consumer_id", "delivery_type", "delivery_label", "delivery_time_label", "delivery_date",
+        "payment_method", "status", "subtotal", "tax_amount", "discount_amount", "shipping_fee",
+        "total_amount", "created_at", "cancelled_at",
+    ],
+)
+
 
 async def _safe_notify(func, order):
     """通知の例外を握りつぶしてログ出力する"""
@@ -89,11 +130,15 @@ def _parse_times_from_label(label: str) -> tuple[time | None, time | None]:
         return None, None
 
 
-async def _resolve_delivery_slot(order_data: ConsumerOrderCreate, db: AsyncSession) -> DeliverySlot:
+async def _resolve_delivery_slot(order_data: ConsumerOrderCreate, db: AsyncSession):
+    """受取枠を解決する（メモリ上の枠インデックスを優先し、DB は作成・再公開時のみ）"""
     if order_data.delivery_slot_id:
-        stmt_slot = select(DeliverySlot).where(DeliverySlot.id == order_data.delivery_slot_id)
-        slot_result = await db.execute(stmt_slot)
-        return await _ensure_slot_available(slot_result.scalar_one_or_none())
+        slot = delivery_slot_cache.get(order_data.delivery_slot_id)
+        if slot is None:
+            stmt_slot = select(DeliverySlot).where(DeliverySlot.id == order_data.delivery_slot_id)
+            slot_result = await db.execute(stmt_slot)
+            slot = slot_result.scalar_one_or_none()
+        return await _ensure_slot_available(slot)
 
     if not (order_data.delivery_date and order_data.delivery_type and order_data.delivery_time_label):
         raise HTTPException(
@@ -101,31 +146,15 @@ async def _resolve_delivery_slot(order_data: ConsumerOrderCreate, db: AsyncSessi
             detail="受取枠IDがない場合は delivery_date / delivery_type / delivery_time_label が必要です",
         )
 
-    stmt_existing = select(DeliverySlot).where(
-        DeliverySlot.date == order_data.delivery_date,
-        DeliverySlot.slot_type == order_data.delivery_type,
-        DeliverySlot.time_text == order_data.delivery_time_label,
-    ).order_by(DeliverySlot.id.asc())
-    existing = (await db.execute(stmt_existing)).scalar_one_or_none()
-    if existing:
-        if not existing.is_active:
-            existing.is_active = True
-            await db.flush()
-        return existing
-
     start_time, end_time = _parse_times_from_label(order_data.delivery_time_label)
-    generated_slot = DeliverySlot(
-        date=order_data.delivery_date,
-        slot_type=order_data.delivery_type,
+    return await delivery_slot_cache.resolve(
+        db,
+        order_data.delivery_date,
+        order_data.delivery_type,
+        order_data.delivery_time_label,
         start_time=start_time,
         end_time=end_time,
-        time_text=order_data.delivery_time_label,
-        is_active=True,
-        note="auto-generated from consumer checkout",
     )
-    db.add(generated_slot)
-    await db.flush()
-    return generated_slot
 
 
 @router.post("/", response_model=ConsumerOrderResponse, status_code=status.HTTP_201_CREATED)
@@ -286,6 +315,7 @@ async def create_consumer_order(
         if order_data.stripe_customer_id:
             consumer.stripe_customer_id = order_data.stripe_customer_id
         consumer.default_stripe_payment_method_id = order_data.stripe_payment_method_id
+        payment_gateway.invalidate_cards(consumer.stripe_customer_id)
 
     await db.commit()
 
@@ -306,9 +336,10 @@ async def create_consumer_order(
         batch_stmt = select(ProcurementBatch).where(
             ProcurementBatch.delivery_slot_id == slot.id,
             ProcurementBatch.status == ProcurementStatus.COLLECTING,
-        )
+        ).order_by(ProcurementBatch.id.asc()).limit(1)
+        # 同時注文で重複バッチができても注文を失敗させない
         batch_result = await db.execute(batch_stmt)
-        batch = batch_result.scalar_one_or_none()
+        batch = batch_result.scalars().first()
         if not batch:
             batch = ProcurementBatch(
                 delivery_slot_id=slot.id,
@@ -328,25 +359,49 @@ async def create_consumer_order(
 async def list_consumer_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
+    view: str = Query("full", pattern=VIEW_PATTERN, description="summary: columns of ConsumerOrderSummary only / full: with items"),
+    fields: str = Query(None, description="Comma-separated ConsumerOrderSummary fields (implies summary)"),
+    format: str = Query(None, pattern=FORMAT_PATTERN, description="ndjson / csv: stream every order"),
+    request: Request = None,
     consumer: Consumer = Depends(get_current_consumer),
     db: AsyncSession = Depends(get_db)
 ):
-    """List orders for current consumer."""
-    base_query = select(ConsumerOrder).options(
-        selectinload(ConsumerOrder.order_items)
-        .selectinload(ConsumerOrderItem.product)
-        .selectinload(Product.farmer),
-        selectinload(ConsumerOrder.consumer),
-        selectinload(ConsumerOrder.delivery_slot)
-    ).where(ConsumerOrder.consumer_id == consumer.id).order_by(ConsumerOrder.created_at.desc())
-
-    count_stmt = select(func.count(ConsumerOrder.id)).where(ConsumerOrder.consumer_id == consumer.id)
-    total = await db.scalar(count_stmt)
-
-    result = await db.execute(base_query.offset(skip).limit(limit))
-    orders = result.scalars().all()
+    """
+    List orders for current consumer.
 
-    return ConsumerOrderListResponse(items=orders, total=total or 0, skip=skip, limit=limit)
+    view=summary / fields= skip the item, product and slot loads and return
+    ConsumerOrderSummaryListResponse rows built from a column-only select.
+    format=ndjson|csv (or Accept: application/x-ndjson) streams all summary
+    rows instead of one page.
+    """
+    fmt = stream_format(request, format)
+    names = CONSUMER_ORDER_SUMMARY.resolve("summary" if fmt else view, fields)
+    if names is not None:
+        base_query = CONSUMER_ORDER_SUMMARY.select(names)
+    else:
+        base_query = select(ConsumerOrder).options(
+            selectinload(ConsumerOrder.order_items)
+            .selectinload(ConsumerOrderItem.product)
+            .selectinload(Product.farmer),
+            selectinload(ConsumerOrder.consumer),
+            selectinload(ConsumerOrder.delivery_slot)
+        )
+    base_query = base_query.where(ConsumerOrder.consumer_id == consumer.id).order_by(ConsumerOrder.created_at.desc())
+    if fmt:
+        return stream_query(base_query, names, fmt, "consumer_orders")
+
+    page = await paginate(db, base_query, skip=skip, limit=limit)
+
+    if names is not None:
+        return SchemaJSONResponse({
+            "items": CONSUMER_ORDER_SUMMARY.rows(page.items, names),
+            "total": page.total,
+            "skip": skip,
+            "limit": limit,
+        })
+    return model_response(
+        ConsumerOrderListResponse, {"items": page.items, "total": page.total, "skip": skip, "limit": limit}
+    )
 
 
 @router.get("/{order_id}", response_model=ConsumerOrderResponse)
@@ -453,10 +508,14 @@ async def cancel_consumer_order(
     refund_failed = False
     if order.payment_method == "card" and order.stripe_payment_intent_id:
         try:
-            refund = stripe.Refund.create(payment_intent=order.stripe_payment_intent_id)
-            refund_id = refund.id
-        except stripe.error.StripeError as e:
+            refund_id = await payment_gateway.refund(
+                order.stripe_payment_intent_id, order_id=order.id, attempt=order.failed_refunds
+            )
+        except PaymentError:
+            # 次回の返金は新しい冪等キーで試行する（同じキーでは失敗が再送される）
+            order.failed_refunds += 1
             if not force:
+                await db.commit()
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
                     detail="REFUND_FAILED",
@@ -2,25 +2,36 @@
 Delivery Slots Router - B2C受取枠API
 """
 from datetime import date
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_db
+from app.core.http_cache import not_modified
 from app.models import DeliverySlot
 from app.models.enums import DeliverySlotType
 from app.schemas import DeliverySlotPublicResponse
+from app.services.delivery_slots import delivery_slot_cache
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[DeliverySlotPublicResponse])
 async def list_active_delivery_slots(
+    request: Request,
+    response: Response,
     slot_type: DeliverySlotType | None = Query(None, description="枠種別で絞り込み"),
     target_date: date | None = Query(None, description="特定日で絞り込み"),
     db: AsyncSession = Depends(get_db)
 ):
     """List active delivery slots for consumers."""
+    # 今日以降の枠はメモリ上のインデックスから返す（ETag 付き）
+    if delivery_slot_cache.covers(target_date):
+        slots, etag = delivery_slot_cache.listing(slot_type, target_date)
+        if (cached := not_modified(request, response, etag, "slots")) is not None:
+            return cached
+        return slots
+
     stmt = select(DeliverySlot).where(DeliverySlot.is_active.is_(True))
 
     if slot_type:
@@ -3,14 +3,16 @@ Farmer API Router - 生産者管理
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 import secrets
 import os
 from datetime import datetime, timedelta
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.core.config import settings
 from app.models import Farmer
+from app.services.availability import check_day, check_range, index_overrides
 from app.services.route_service import route_service
 from app.schemas import (
     FarmerCreate,
@@ -58,15 +60,10 @@ async def list_farmers(
     query = select(Farmer).where(Farmer.deleted_at.is_(None))
     if is_active is not None:
         query = query.where(Farmer.is_active == is_active)
-    
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-    
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    farmers = result.scalars().all()
-    
-    return FarmerListResponse(items=farmers, total=total or 0, skip=skip, limit=limit)
+
+    page = await paginate(db, query.order_by(Farmer.id), skip=skip, limit=limit)
+
+    return FarmerListResponse(items=page.items, total=page.total, skip=skip, limit=limit)
 
 
 @router.get("/{farmer_id}", response_model=FarmerResponse)
@@ -205,60 +202,31 @@ async def check_farmer_availability(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format")
 
-    stmt = select(Farmer).where(Farmer.id == farmer_id, Farmer.deleted_at.is_(None))
+    stmt = select(Farmer.id, Farmer.selectable_days).where(Farmer.id == farmer_id, Farmer.deleted_at.is_(None))
     result = await db.execute(stmt)
-    farmer = result.scalar_one_or_none()
-    
+    farmer = result.one_or_none()
+
     if not farmer:
         raise HTTPException(status_code=404, detail="生産者が見つかりません")
 
-    # 1. Check specific schedule
+    # 1. 個別スケジュール（あれば優先） 2. 曜日設定（未設定時は水曜のみ）
     from app.models.farmer_schedule import FarmerSchedule
-    import json
-    
-    stmt_sched = select(FarmerSchedule).where(
+
+    stmt_sched = select(FarmerSchedule.is_available, FarmerSchedule.notes).where(
         FarmerSchedule.farmer_id == farmer_id,
         FarmerSchedule.date == target_date
     )
-    result_sched = await db.execute(stmt_sched)
-    schedule = result_sched.scalar_one_or_none()
-    
-    if schedule:
-        return {
-            "is_available": schedule.is_available,
-            "reason": schedule.notes or ("出荷可能日設定" if schedule.is_available else "休業日設定")
-        }
-    
-    # 2. Check weekly schedule
-    is_available = False
-    weekly_setting_exists = False
-    
-    if farmer.selectable_days:
-        try:
-            allowed_days = json.loads(farmer.selectable_days)
-            if isinstance(allowed_days, list):
-                weekly_setting_exists = True
-                # 0=Sunday, 1=Monday... matches strftime('%w')
-                day_idx = int(target_date.strftime('%w'))
-                is_available = day_idx in allowed_days
-        except Exception as e:
-            # Log error if possible or just pass
-            pass
-            
-    # Default fallback: If no settings at all, default to "Wednesday (3)"
-    # This matches the frontend default in ProducerSchedule.tsx
-    if not weekly_setting_exists:
-        day_idx = int(target_date.strftime('%w'))
-        is_available = (day_idx == 3)
-        reason = "曜日設定 (初期設定: 水曜のみ)" if not is_available else "曜日設定 (デフォルト)"
-    else:
-        reason = "曜日設定"
-    
+    override = (await db.execute(stmt_sched)).one_or_none()
+
+    is_available, reason = check_day(
+        farmer.selectable_days, target_date, tuple(override) if override else None
+    )
     return {
         "is_available": is_available,
         "reason": reason
     }
-    
+
+
 @router.post("/{farmer_id}/confirm-info", response_model=FarmerResponse)
 async def confirm_farmer_info(
     farmer_id: int,
@@ -299,82 +267,24 @@ async def check_farmer_availability_bulk(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format")
 
-    # Fetch farmers
-    stmt = select(Farmer).where(Farmer.id.in_(farmer_ids), Farmer.deleted_at.is_(None))
-    result = await db.execute(stmt)
-    farmers = result.scalars().all()
-    farmer_map = {f.id: f for f in farmers}
+    # 曜日設定（マスクはキャッシュ済み）と期間内の個別スケジュールのみ取得
+    stmt = select(Farmer.id, Farmer.selectable_days).where(Farmer.id.in_(farmer_ids), Farmer.deleted_at.is_(None))
+    selectable_days = dict((await db.execute(stmt)).all())
 
-    # Fetch all relevant overrides
     from app.models.farmer_schedule import FarmerSchedule
-    stmt_sched = select(FarmerSchedule).where(
+    stmt_sched = select(
+        FarmerSchedule.farmer_id,
+        FarmerSchedule.date,
+        FarmerSchedule.is_available,
+        FarmerSchedule.notes,
+    ).where(
         FarmerSchedule.farmer_id.in_(farmer_ids),
         FarmerSchedule.date >= start_date,
         FarmerSchedule.date <= end_date
     )
-    result_sched = await db.execute(stmt_sched)
-    schedules = result_sched.scalars().all()
-    
-    # Organize schedules: {farmer_id: {date: is_available}}
-    schedule_map = {}
-    for s in schedules:
-        if s.farmer_id not in schedule_map:
-            schedule_map[s.farmer_id] = {}
-        schedule_map[s.farmer_id][s.date] = s
-
-    import json
-    results = {}
-    curr = start_date
-    while curr <= end_date:
-        date_str = curr.strftime("%Y-%m-%d")
-        available_ids = []
-        unavailable = []
-        
-        for fid in farmer_ids:
-            farmer = farmer_map.get(fid)
-            if not farmer:
-                continue
-                
-            # 1. Override
-            over = schedule_map.get(fid, {}).get(curr)
-            if over:
-                if over.is_available:
-                    available_ids.append(fid)
-                else:
-                    unavailable.append({"id": fid, "reason": over.notes or "休業日設定"})
-                continue
-            
-            # 2. Weekly
-            is_avail = False
-            weekly_setting_exists = False
-            if farmer.selectable_days:
-                try:
-                    allowed = json.loads(farmer.selectable_days)
-                    if isinstance(allowed, list):
-                        weekly_setting_exists = True
-                        day_idx = int(curr.strftime('%w'))
-                        is_avail = day_idx in allowed
-                except:
-                    pass
-            
-            if not weekly_setting_exists:
-                day_idx = int(curr.strftime('%w'))
-                is_avail = (day_idx == 3)
-            
-            if is_avail:
-                available_ids.append(fid)
-            else:
-                reason = "曜日設定 (初期設定: 水曜のみ)" if not weekly_setting_exists else "曜日設定"
-                unavailable.append({"id": fid, "reason": reason})
-        
-        results[date_str] = {
-            "available": available_ids,
-            "unavailable": unavailable,
-            "all_available": len(unavailable) == 0
-        }
-        curr += timedelta(days=1)
-
-    return results
+    overrides = index_overrides((await db.execute(stmt_sched)).all(), start_date)
+
+    return check_range(farmer_ids, selectable_days, overrides, start_date, end_date)
 
 
 @router.post("/check-stale-info", response_model=ResponseMessage)
@@ -3,10 +3,11 @@ Favorite API Router - お気に入り管理
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.models import Favorite, Product
 from app.schemas import (
     FavoriteCreate,
@@ -80,15 +81,10 @@ async def get_restaurant_favorites(
         .where(Favorite.restaurant_id == restaurant_id)
         .order_by(Favorite.created_at.desc())
     )
-    
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-    
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    favorites = result.scalars().all()
-    
-    return FavoriteListResponse(items=favorites, total=total or 0, skip=skip, limit=limit)
+
+    page = await paginate(db, query, skip=skip, limit=limit)
+
+    return FavoriteListResponse(items=page.items, total=page.total, skip=skip, limit=limit)
 
 
 @router.get("/check/{restaurant_id}/{product_id}", response_model=dict)
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.http_cache import make_validator, not_modified, table_state
 from app.core.rate_limit import rate_limit
 from app.models.restaurant import Restaurant
 from app.models.farmer import Farmer
 from app.models.guest import GuestVisit, GuestInteraction
+from app.services.event_buffer import BufferFull, register_buffer
+from app.services.guest_telemetry import guest_telemetry
 from pydantic import BaseModel
 import logging
 
@@ -16,6 +21,29 @@ router = APIRouter(
 )
 logger = logging.getLogger(__name__)
 
+# /visit, /interaction, /log はバッファ経由でまとめて書き込む (app/services/guest_telemetry.py)
+register_buffer(guest_telemetry)
+
+# 存在確認済みの店舗ID (バッファ書き込み前に外部キー違反を弾く)
+_known_restaurants = TTLCache(maxsize=5000, ttl=600)
+
+
+def _telemetry_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many pending requests",
+        headers={"Retry-After": str(max(int(settings.GUEST_TELEMETRY_FLUSH_INTERVAL), 1))},
+    )
+
+
+async def _restaurant_exists(restaurant_id: int, db: AsyncSession) -> bool:
+    if restaurant_id in _known_restaurants:
+        return True
+    found = await db.scalar(select(Restaurant.id).where(Restaurant.id == restaurant_id))
+    if found is not None:
+        _known_restaurants.set(restaurant_id, True)
+    return found is not None
+
 # --- Schemas ---
 class GuestRestaurantResponse(BaseModel):
     id: int
@@ -54,10 +82,21 @@ class LogCreate(BaseModel):
 # --- Routes ---
 
 @router.get("/restaurant/{restaurant_id}", response_model=GuestRestaurantResponse)
-async def get_guest_restaurant(restaurant_id: int, db: AsyncSession = Depends(get_db)):
+async def get_guest_restaurant(
+    restaurant_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
     """
     店舗情報とこだわりメッセージを取得
     """
+    updated_at = await db.scalar(select(Restaurant.updated_at).where(Restaurant.id == restaurant_id))
+    if updated_at is not None:
+        validator = make_validator("guest-restaurant", restaurant_id, updated_at)
+        if (cached := not_modified(request, response, validator, "guest")) is not None:
+            return cached
+
     restaurant = await db.get(Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
@@ -70,10 +109,14 @@ async def get_guest_restaurant(restaurant_id: int, db: AsyncSession = Depends(ge
     )
 
 @router.get("/farmers", response_model=List[GuestFarmerResponse])
-async def get_guest_farmers(db: AsyncSession = Depends(get_db)):
+async def get_guest_farmers(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """
     全ての生産者情報を取得 (カルーセル用)
     """
+    validator = make_validator("guest-farmers", await table_state(db, Farmer))
+    if (cached := not_modified(request, response, validator, "guest")) is not None:
+        return cached
+
     # Fetch all active farmers
     result = await db.execute(select(Farmer).where(Farmer.is_active == 1, Farmer.deleted_at.is_(None)))
     farmers = result.scalars().all()
@@ -102,15 +145,26 @@ async def create_visit(
 ):
     """
     訪問セッションの開始（ログ記録）
+
+    visit_id は事前確保した ID から払い出し、INSERT は後でまとめて行う
     """
-    new_visit = GuestVisit(
-        restaurant_id=visit.restaurant_id,
-        visitor_id=visit.visitor_id
-    )
-    db.add(new_visit)
-    await db.commit()
-    await db.refresh(new_visit)
-    return VisitResponse(visit_id=new_visit.id)
+    if not settings.GUEST_TELEMETRY_BUFFER_ENABLED:
+        new_visit = GuestVisit(
+            restaurant_id=visit.restaurant_id,
+            visitor_id=visit.visitor_id
+        )
+        db.add(new_visit)
+        await db.commit()
+        await db.refresh(new_visit)
+        return VisitResponse(visit_id=new_visit.id)
+
+    if not await _restaurant_exists(visit.restaurant_id, db):
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    try:
+        visit_id = await guest_telemetry.add_visit(visit.restaurant_id, visit.visitor_id)
+    except BufferFull:
+        raise _telemetry_busy()
+    return VisitResponse(visit_id=visit_id)
 
 @router.post("/interaction")
 async def create_interaction(
@@ -121,6 +175,13 @@ async def create_interaction(
     """
     スタンプ、メッセージ、興味ありログの記録
     """
+    if settings.GUEST_TELEMETRY_BUFFER_ENABLED:
+        try:
+            guest_telemetry.add_interaction(interaction.model_dump())
+        except BufferFull:
+            raise _telemetry_busy()
+        return {"status": "ok"}
+
     try:
         new_interaction = GuestInteraction(
             visit_id=interaction.visit_id,
@@ -142,7 +203,13 @@ async def create_interaction(
 async def log_visit_metrics(log: LogCreate, db: AsyncSession = Depends(get_db)):
     """
     滞在時間、スクロール率の更新
+
+    同じ訪問への連続した更新はメモリ上で最新値にまとめ、定期的に一括 UPDATE する
     """
+    if settings.GUEST_TELEMETRY_BUFFER_ENABLED:
+        guest_telemetry.log_metrics(log.visit_id, log.stay_time, log.scroll_depth)
+        return {"status": "ok"}
+
     visit = await db.get(GuestVisit, log.visit_id)
     if visit:
         visit.stay_time_seconds = log.stay_time
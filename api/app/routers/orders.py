@@ -7,10 +7,14 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload, joinedload
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 from app.core.database import get_db
+from app.core.fast_json import SchemaJSONResponse, model_response
+from app.core.pagination import paginate
+from app.core.projection import VIEW_PATTERN, Projection
+from app.core.streaming import FORMAT_PATTERN, stream_format, stream_query
 from app.core.cloudinary import upload_file
 from app.services.invoice import generate_invoice_pdf
 from app.services.line_notify import line_service
@@ -21,6 +25,7 @@ from app.schemas import (
     OrderUpdate,
     OrderResponse,
     OrderListResponse,
+    OrderSummary,
     OrderStatusUpdate,
     ResponseMessage,
     FarmerAggregation,
@@ -29,6 +34,39 @@ from app.schemas import (
 
 router = APIRouter()
 
+# 一覧の軽量表示 (view=summary / fields=) で返す列
+ORDER_SUMMARY = Projection(
+    OrderSummary,
+    {
+        "id": Order.id,
+        "restaurant_id": Order.restaurant_id,
+        "restaurant_name": select(Restaurant.name).where(Restaurant.id == Order.restaurant_id).scalar_subquery(),
+        "delivery_date": Order.delivery_date,
+        "delivery_time_slot": Order.delivery_time_slot,
+        "status": Order.status,
+        "subtotal": Order.subtotal,
+        "tax_amount": Order.tax_amount,
+        "shipping_fee": Order.shipping_fee,
+        "total_amount": Order.total_amount,
+        "created_at": Order.created_at,
+        "item_count": select(func.count(OrderItem.id)).where(OrderItem.order_id == Order.id).scalar_subquery(),
+        "delivery_address": Order.delivery_address,
+        "delivery_phone": Order.delivery_phone,
+        "delivery_notes": Order.delivery_notes,
+        "notes": Order.notes,
+        "invoice_url": Order.invoice_url,
+        "confirmed_at": Order.confirmed_at,
+        "shipped_at": Order.shipped_at,
+        "delivered_at": Order.delivered_at,
+        "cancelled_at": Order.cancelled_at,
+        "updated_at": Order.updated_at,
+    },
+    default=[
+        "id", "restaurant_id", "restaurant_name", "delivery_date", "delivery_time_slot",
+        "status", "subtotal", "tax_amount", "shipping_fee", "total_amount", "created_at",
+    ],
+)
+
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
@@ -113,7 +151,7 @@ async def create_order(
     else:
         shipping_fee = Decimal(800)
         
-    db_order.shipping_fee = shipping_fee
+    db_order.shipping_fee = int(shipping_fee)
     
     # Update order totals
     db_order.subtotal = subtotal
@@ -144,33 +182,55 @@ async def list_orders(
     limit: int = Query(100, ge=1, le=1000),
     restaurant_id: int = Query(None),
     status_filter: OrderStatus = Query(None, alias="status"),
+    delivery_date_from: date = Query(None, description="配送日の開始日"),
+    delivery_date_to: date = Query(None, description="配送日の終了日"),
+    view: str = Query("full", pattern=VIEW_PATTERN, description="summary: 一覧用の列のみ (OrderSummary) / full: 明細を含む"),
+    fields: str = Query(None, description="返す項目 (カンマ区切り、OrderSummary の項目。指定時は summary 扱い)"),
+    format: str = Query(None, pattern=FORMAT_PATTERN, description="ndjson / csv: 条件に合う全件をストリーミングで返す"),
+    request: Request = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """注文一覧を取得"""
-    query = select(Order).options(
-        selectinload(Order.order_items).selectinload(OrderItem.product).selectinload(Product.farmer),
-        selectinload(Order.restaurant)
-    )
-    
+    """
+    注文一覧を取得
+
+    view=summary / fields= の場合は明細・商品・生産者を読み込まず、
+    必要な列だけを SELECT して OrderSummaryListResponse 形式で返す。
+    format=ndjson|csv (または Accept: application/x-ndjson) の場合は
+    skip/limit を無視し、summary の列を1行ずつストリーミングする。
+    """
+    fmt = stream_format(request, format)
+    names = ORDER_SUMMARY.resolve("summary" if fmt else view, fields)
+    if names is not None:
+        query = ORDER_SUMMARY.select(names)
+    else:
+        query = select(Order).options(
+            selectinload(Order.order_items).selectinload(OrderItem.product).selectinload(Product.farmer),
+            selectinload(Order.restaurant)
+        )
+
     if restaurant_id:
         query = query.where(Order.restaurant_id == restaurant_id)
     if status_filter:
         query = query.where(Order.status == status_filter)
-    
-    # Count query - simpler and safer
-    count_stmt = select(func.count(Order.id))
-    if restaurant_id:
-        count_stmt = count_stmt.where(Order.restaurant_id == restaurant_id)
-    if status_filter:
-        count_stmt = count_stmt.where(Order.status == status_filter)
-    
-    total = await db.scalar(count_stmt)
-
-    query = query.order_by(Order.created_at.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    orders = result.scalars().all()
-
-    return OrderListResponse(items=orders, total=total or 0, skip=skip, limit=limit)
+    if delivery_date_from:
+        query = query.where(func.date(Order.delivery_date) >= delivery_date_from)
+    if delivery_date_to:
+        query = query.where(func.date(Order.delivery_date) <= delivery_date_to)
+
+    query = query.order_by(Order.created_at.desc(), Order.id.desc())
+    if fmt:
+        return stream_query(query, names, fmt, "orders")
+
+    page = await paginate(db, query, skip=skip, limit=limit)
+
+    if names is not None:
+        return SchemaJSONResponse({
+            "items": ORDER_SUMMARY.rows(page.items, names),
+            "total": page.total,
+            "skip": skip,
+            "limit": limit,
+        })
+    return model_response(OrderListResponse, {"items": page.items, "total": page.total, "skip": skip, "limit": limit})
 
 
 @router.get("/invoice/monthly")
@@ -14,6 +14,9 @@ from decimal import Decimal
 
 from fastapi.responses import StreamingResponse
 from app.core.database import get_db
+from app.core.pagination import paginate
+from app.core.catalog_shape import CatalogShape, normalized_products
+from app.core.fast_json import model_response
 from app.core.cloudinary import upload_file
 from app.services.line_notify import line_service
 from app.models import Farmer, Product, Order, OrderItem
@@ -537,6 +540,7 @@ async def list_producer_products(
     farmer_id: int = Query(None, description="生産者ID (省略可)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    shape: CatalogShape = Query("nested", description="normalized: 生産者を farmers にまとめ、商品は farmer_id で参照"),
     line_user_id: str = Depends(get_line_user_id),
     db: AsyncSession = Depends(get_db)
 ):
@@ -557,16 +561,13 @@ async def list_producer_products(
     query = select(Product).options(selectinload(Product.farmer)).where(
         Product.farmer_id == farmer_id,
         Product.deleted_at.is_(None)
-    )
-    
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-    
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    products = result.scalars().all()
-    
-    return ProductListResponse(items=products, total=total or 0, skip=skip, limit=limit)
+    ).order_by(Product.id)
+
+    page = await paginate(db, query, skip=skip, limit=limit)
+
+    if shape == "normalized":
+        return normalized_products(page.items, page.total, skip, limit)
+    return model_response(ProductListResponse, {"items": page.items, "total": page.total, "skip": skip, "limit": limit})
 
 
 @router.post("/products", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
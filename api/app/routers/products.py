@@ -1,13 +1,17 @@
 """
 Product API Router - 商品管理
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, or_
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.core.dependencies import get_line_user_id
+from app.core.http_cache import make_validator, not_modified, table_state
+from app.core.catalog_shape import CatalogShape, normalized_products
+from app.core.fast_json import model_response
 from app.models import Product, Order, OrderItem, Restaurant, Farmer
 from app.models.enums import StockType, ProductCategory
 from app.schemas import (
@@ -37,6 +41,8 @@ async def create_product(product_data: ProductCreate, db: AsyncSession = Depends
 
 @router.get("/", response_model=ProductListResponse)
 async def list_products(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     stock_type: StockType = Query(None, description="種別で絞り込み"),
@@ -47,9 +53,15 @@ async def list_products(
     is_wakeari: int = Query(None, description="訳あり商品のみ"),
     farmer_active_only: int = Query(None, description="表示中の農家の商品のみ"),
     search: str = Query(None, description="商品名で検索"),
+    shape: CatalogShape = Query("nested", description="normalized: 生産者を farmers にまとめ、商品は farmer_id で参照"),
     db: AsyncSession = Depends(get_db)
 ):
     """商品一覧を取得（カタログ用）"""
+    # 商品・農家テーブルが変わっていなければ 304（一覧の取得・シリアライズを省略）
+    validator = make_validator("products", request.url.query, await table_state(db, Product, Farmer))
+    if (cached := not_modified(request, response, validator, "catalog")) is not None:
+        return cached
+
     # Join with Farmer for filtering
     query = select(Product).join(Product.farmer).options(selectinload(Product.farmer)).where(
         Product.deleted_at.is_(None),
@@ -77,15 +89,16 @@ async def list_products(
     
     # Order by display_order and id
     query = query.order_by(Product.display_order.asc(), Product.id.asc())
-    
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-    
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    products = result.scalars().all()
-    
-    return ProductListResponse(items=products, total=total or 0, skip=skip, limit=limit)
+
+    page = await paginate(db, query, skip=skip, limit=limit)
+
+    if shape == "normalized":
+        return normalized_products(page.items, page.total, skip, limit, headers=dict(response.headers))
+    return model_response(
+        ProductListResponse,
+        {"items": page.items, "total": page.total, "skip": skip, "limit": limit},
+        headers=dict(response.headers),
+    )
 
 
 @router.get("/purchased", response_model=ProductListResponse)
@@ -93,6 +106,7 @@ async def list_purchased_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: str = Query(None, description="商品名で検索"),
+    shape: CatalogShape = Query("nested", description="normalized: 生産者を farmers にまとめ、商品は farmer_id で参照"),
     line_user_id: str = Depends(get_line_user_id),
     db: AsyncSession = Depends(get_db)
 ):
@@ -102,37 +116,29 @@ async def list_purchased_products(
     restaurant_id = await db.scalar(stmt)
     
     if not restaurant_id:
+        if shape == "normalized":
+            return normalized_products([], 0, skip, limit)
         return ProductListResponse(items=[], total=0, skip=skip, limit=limit)
 
-    # 購入履歴から商品情報を取得
-    query = select(Product).options(selectinload(Product.farmer))\
-        .join(OrderItem, OrderItem.product_id == Product.id)\
+    # 購入履歴から商品情報を取得（重複排除は IN サブクエリで行い、件数はページと同時に取得）
+    purchased_ids = select(OrderItem.product_id)\
         .join(Order, Order.id == OrderItem.order_id)\
+        .where(Order.restaurant_id == restaurant_id)
+    query = select(Product).options(selectinload(Product.farmer))\
         .where(
-            Order.restaurant_id == restaurant_id,
+            Product.id.in_(purchased_ids),
             Product.harvest_status != "ended", # Hide 'Ended' items
             Product.deleted_at.is_(None)
-        )\
-        .distinct()
-        
+        )
+
     if search:
         query = query.where(Product.name.ilike(f"%{search}%"))
-        
-    # Total count
-    count_query = select(func.count(func.distinct(Product.id))).join(OrderItem, OrderItem.product_id == Product.id)\
-        .join(Order, Order.id == OrderItem.order_id)\
-        .where(Order.restaurant_id == restaurant_id)
-        
-    if search:
-        count_query = count_query.where(Product.name.ilike(f"%{search}%"))
-        
-    total = await db.scalar(count_query)
-    
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    products = result.scalars().all()
-    
-    return ProductListResponse(items=products, total=total or 0, skip=skip, limit=limit)
+
+    page = await paginate(db, query.order_by(Product.id), skip=skip, limit=limit)
+
+    if shape == "normalized":
+        return normalized_products(page.items, page.total, skip, limit)
+    return model_response(ProductListResponse, {"items": page.items, "total": page.total, "skip": skip, "limit": limit})
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
@@ -4,13 +4,14 @@ Restaurant API Router - 飲食店管理
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 import secrets
 import os
 from datetime import datetime, timedelta
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.models import Restaurant
 from app.services.route_service import route_service
 from app.schemas import (
@@ -100,18 +101,12 @@ async def list_restaurants(
     if is_active is not None:
         query = query.where(Restaurant.is_active == is_active)
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
-    
-    # Get paginated results
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    restaurants = result.scalars().all()
-    
+    # Page and total in one query
+    page = await paginate(db, query.order_by(Restaurant.id), skip=skip, limit=limit)
+
     return RestaurantListResponse(
-        items=restaurants,
-        total=total or 0,
+        items=page.items,
+        total=page.total,
         skip=skip,
         limit=limit
     )
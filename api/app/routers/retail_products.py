@@ -3,12 +3,15 @@ Retail Products API Router - 消費者向け小売商品（公開API）
 農家の商品（products）をもとに管理者が作成した小売商品を返す。
 小売商品が未作成の農家商品はそのまま小売形式に変換して返す。
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, case
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.http_cache import make_validator, not_modified, table_state
+from app.core.catalog_shape import CatalogShape, normalized_retail_items
+from app.core.fast_json import FastJSONResponse
 from app.models.retail_product import RetailProduct
 from app.models.product import Product
 from app.models.farmer import Farmer
@@ -59,8 +62,52 @@ def _product_to_retail_dict(product: Product) -> dict:
     }
 
 
+def _retail_to_dict(rp: RetailProduct) -> dict:
+    """小売商品を RetailProductResponse 互換の辞書に変換する（source_product.farmer をロード済みであること）"""
+    sp = rp.source_product
+    farmer = sp.farmer if sp else None
+    return {
+        "id": rp.id,
+        "source_type": "retail",
+        "source_product_id": rp.source_product_id,
+        "name": rp.name,
+        "description": rp.description,
+        "retail_price": str(rp.retail_price),
+        "tax_rate": rp.tax_rate,
+        "retail_unit": rp.retail_unit,
+        "retail_quantity_label": rp.retail_quantity_label,
+        "conversion_factor": str(rp.conversion_factor),
+        "set_quantity": rp.set_quantity or 1,
+        "waste_margin_pct": rp.waste_margin_pct,
+        "image_url": rp.image_url,
+        "image_urls": rp.image_urls or ([rp.image_url] if rp.image_url else []),
+        "category": rp.category,
+        "is_active": rp.is_active,
+        "is_featured": rp.is_featured,
+        "is_wakeari": rp.is_wakeari,
+        "is_medama": rp.is_medama or 0,
+        "display_order": rp.display_order,
+        "created_at": rp.created_at,
+        "updated_at": rp.updated_at,
+        "farming_method": sp.farming_method if sp else None,
+        "weight": sp.weight if sp else None,
+        "stock_quantity": sp.stock_quantity if sp else None,
+        "info_confirmed_at": farmer.info_confirmed_at.isoformat() if farmer and farmer.info_confirmed_at else None,
+        "source_product": {
+            "id": sp.id,
+            "name": sp.name,
+            "unit": sp.unit,
+            "cost_price": sp.cost_price,
+            "farmer_id": sp.farmer_id,
+            "farmer_name": farmer.name if farmer else None,
+        } if sp else None,
+    }
+
+
 @router.get("/")
 async def list_consumer_products(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     category: str = Query(None, description="カテゴリで絞り込み"),
@@ -68,9 +115,17 @@ async def list_consumer_products(
     is_wakeari: int = Query(None, description="訳あり商品のみ"),
     is_medama: int = Query(None, description="目玉商品のみ"),
     search: str = Query(None, description="商品名で検索"),
+    shape: CatalogShape = Query(
+        "nested", description="normalized: 元商品・生産者を source_products / farmers にまとめて参照"
+    ),
     db: AsyncSession = Depends(get_db)
 ):
     """消費者向け商品一覧（小売商品 + 農家商品のフォールバック）"""
+    validator = make_validator(
+        "retail-products", request.url.query, await table_state(db, RetailProduct, Product, Farmer)
+    )
+    if (cached := not_modified(request, response, validator, "catalog")) is not None:
+        return cached
 
     # --- 1. 小売商品 (RetailProduct) を取得 ---
     rp_query = (
@@ -145,45 +200,7 @@ async def list_consumer_products(
     # --- 3. 統合 ---
     items = []
     for rp in retail_products:
-        sp = rp.source_product
-        farmer = sp.farmer if sp else None
-        data = {
-            "id": rp.id,
-            "source_type": "retail",
-            "source_product_id": rp.source_product_id,
-            "name": rp.name,
-            "description": rp.description,
-            "retail_price": str(rp.retail_price),
-            "tax_rate": rp.tax_rate,
-            "retail_unit": rp.retail_unit,
-            "retail_quantity_label": rp.retail_quantity_label,
-            "conversion_factor": str(rp.conversion_factor),
-            "set_quantity": rp.set_quantity or 1,
-            "waste_margin_pct": rp.waste_margin_pct,
-            "image_url": rp.image_url,
-            "image_urls": rp.image_urls or ([rp.image_url] if rp.image_url else []),
-            "category": rp.category,
-            "is_active": rp.is_active,
-            "is_featured": rp.is_featured,
-            "is_wakeari": rp.is_wakeari,
-            "is_medama": rp.is_medama or 0,
-            "display_order": rp.display_order,
-            "created_at": rp.created_at,
-            "updated_at": rp.updated_at,
-            "farming_method": sp.farming_method if sp else None,
-            "weight": sp.weight if sp else None,
-            "stock_quantity": sp.stock_quantity if sp else None,
-            "info_confirmed_at": farmer.info_confirmed_at.isoformat() if farmer and farmer.info_confirmed_at else None,
-            "source_product": {
-                "id": sp.id,
-                "name": sp.name,
-                "unit": sp.unit,
-                "cost_price": sp.cost_price,
-                "farmer_id": sp.farmer_id,
-                "farmer_name": farmer.name if farmer else None,
-            } if sp else None,
-        }
-        items.append(data)
+        items.append(_retail_to_dict(rp))
 
     for prod in farmer_products:
         items.append(_product_to_retail_dict(prod))
@@ -191,7 +208,11 @@ async def list_consumer_products(
     total = len(items)
     paginated = items[skip:skip + limit]
 
-    return {"items": paginated, "total": total, "skip": skip, "limit": limit}
+    if shape == "normalized":
+        return normalized_retail_items(paginated, total, skip, limit, headers=dict(response.headers))
+    return FastJSONResponse(
+        {"items": paginated, "total": total, "skip": skip, "limit": limit}, headers=dict(response.headers)
+    )
 
 
 @router.get("/retail/{retail_id}")
@@ -1,18 +1,19 @@
 """
 Settings API Router - システム設定
+
+設定は app_settings テーブルに保存し、読み取りはプロセス内キャッシュから行う
+(app.services.settings_store)。
 """
-import json
-import os
 from typing import List
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
-router = APIRouter()
+from app.services.settings_store import settings_store
 
-SETTINGS_FILE = "app/data/settings.json"
+router = APIRouter()
 
-# Ensure data directory exists
-os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
+DELIVERY_SETTINGS_KEY = "delivery"
+GENERAL_SETTINGS_KEY = "general"
 
 class TimeSlot(BaseModel):
     id: str
@@ -34,35 +35,23 @@ class DeliverySettings(BaseModel):
 class GeneralSettings(BaseModel):
     default_price_multiplier: float = Field(default=0.7, ge=0.1, le=1.0, description="価格係数 (卸値 / 係数 = 販売価格)")
 
-GENERAL_SETTINGS_FILE = "app/data/general_settings.json"
-
 def load_settings() -> DeliverySettings:
-    if not os.path.exists(SETTINGS_FILE):
-        return DeliverySettings()
     try:
-        with open(SETTINGS_FILE, "r") as f:
-            data = json.load(f)
-            return DeliverySettings(**data)
-    except Exception:
+        return DeliverySettings(**settings_store.get(DELIVERY_SETTINGS_KEY, {}))
+    except ValidationError:
         return DeliverySettings()
 
-def save_settings(settings: DeliverySettings):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings.model_dump(), f)
+async def save_settings(settings: DeliverySettings):
+    await settings_store.set(DELIVERY_SETTINGS_KEY, settings.model_dump())
 
 def load_general_settings() -> GeneralSettings:
-    if not os.path.exists(GENERAL_SETTINGS_FILE):
-        return GeneralSettings()
     try:
-        with open(GENERAL_SETTINGS_FILE, "r") as f:
-            data = json.load(f)
-            return GeneralSettings(**data)
-    except Exception:
+        return GeneralSettings(**settings_store.get(GENERAL_SETTINGS_KEY, {}))
+    except ValidationError:
         return GeneralSettings()
 
-def save_general_settings(settings: GeneralSettings):
-    with open(GENERAL_SETTINGS_FILE, "w") as f:
-        json.dump(settings.model_dump(), f)
+async def save_general_settings(settings: GeneralSettings):
+    await settings_store.set(GENERAL_SETTINGS_KEY, settings.model_dump())
 
 @router.get("/delivery", response_model=DeliverySettings)
 async def get_delivery_settings():
@@ -72,7 +61,7 @@ async def get_delivery_settings():
 @router.post("/delivery", response_model=DeliverySettings)
 async def update_delivery_settings(settings: DeliverySettings):
     """配送設定を更新"""
-    save_settings(settings)
+    await save_settings(settings)
     return settings
 
 @router.get("/general", response_model=GeneralSettings)
@@ -83,5 +72,5 @@ async def get_general_settings():
 @router.post("/general", response_model=GeneralSettings)
 async def update_general_settings(settings: GeneralSettings):
     """一般設定を更新"""
-    save_general_settings(settings)
+    await save_general_settings(settings)
     return settings
@@ -1,8 +1,7 @@
 """
 Stripe Payment Router - PaymentIntent管理 & 保存済みカード
 """
-import stripe
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Request
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,12 +10,15 @@ from app.core.config import settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_consumer
 from app.models import Consumer
+from app.services.payment_gateway import (
+    CardOwnershipError,
+    InvalidRequestError,
+    PaymentError,
+    payment_gateway,
+)
 
 router = APIRouter()
 
-# Stripe APIキー設定
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
 
 class CreatePaymentIntentRequest(BaseModel):
     amount: int = Field(..., gt=0, description="決済金額（円）")
@@ -62,23 +64,10 @@ async def get_saved_cards(
         return SavedCardsResponse(cards=[])
 
     try:
-        payment_methods = stripe.PaymentMethod.list(
-            customer=customer_id,
-            type="card",
-        )
-        cards = [
-            SavedCard(
-                id=pm.id,
-                brand=pm.card.brand,
-                last4=pm.card.last4,
-                exp_month=pm.card.exp_month,
-                exp_year=pm.card.exp_year,
-            )
-            for pm in payment_methods.data
-        ]
-        return SavedCardsResponse(cards=cards)
-    except stripe.error.StripeError:
+        cards = await payment_gateway.list_cards(customer_id)
+    except PaymentError:
         return SavedCardsResponse(cards=[])
+    return SavedCardsResponse(cards=[SavedCard(**card) for card in cards])
 
 
 @router.delete("/saved-cards/{payment_method_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -92,11 +81,10 @@ async def delete_saved_card(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="カードが見つかりません")
 
     try:
-        pm = stripe.PaymentMethod.retrieve(payment_method_id)
-        if pm.customer != customer_id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="このカードを削除する権限がありません")
-        stripe.PaymentMethod.detach(payment_method_id)
-    except stripe.error.InvalidRequestError:
+        await payment_gateway.detach_card(customer_id, payment_method_id)
+    except CardOwnershipError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="このカードを削除する権限がありません")
+    except InvalidRequestError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="カードが見つかりません")
 
 
@@ -105,30 +93,29 @@ async def create_payment_intent(
     request: CreatePaymentIntentRequest,
     consumer: Consumer = Depends(get_current_consumer),
     db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
-    """PaymentIntentを作成し、client_secretを返す"""
-    if not settings.STRIPE_SECRET_KEY:
+    """
+    PaymentIntentを作成し、client_secretを返す
+
+    Idempotency-Key ヘッダーを付けて再送すると同じ PaymentIntent が返る
+    """
+    if not settings.STRIPE_SECRET_KEY and settings.STRIPE_GATEWAY != "stub":
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Stripe is not configured",
         )
 
     try:
-        # Stripe Customerが未作成 or 無効なら作成
-        customer_id = consumer.stripe_customer_id
-        if customer_id:
-            try:
-                stripe.Customer.retrieve(customer_id)
-            except stripe.error.InvalidRequestError:
-                customer_id = None
-
-        if not customer_id:
-            customer = stripe.Customer.create(
-                metadata={"consumer_id": str(consumer.id), "line_user_id": consumer.line_user_id},
-                name=consumer.name,
-                phone=consumer.phone_number,
-            )
-            customer_id = customer.id
+        # Stripe Customerが未作成 or 無効なら作成（有効性はキャッシュ）
+        customer_id, created = await payment_gateway.ensure_customer(
+            consumer.stripe_customer_id,
+            consumer_id=consumer.id,
+            name=consumer.name,
+            phone=consumer.phone_number,
+            line_user_id=consumer.line_user_id,
+        )
+        if created:
             consumer.stripe_customer_id = customer_id
             await db.commit()
 
@@ -150,15 +137,18 @@ async def create_payment_intent(
             intent_params["confirm"] = True
             intent_params["return_url"] = "https://app.refarmkobe.com/local/order-complete"
 
-        payment_intent = stripe.PaymentIntent.create(**intent_params)
+        payment_intent = await payment_gateway.create_payment_intent(
+            intent_params,
+            idempotency_key=f"pi-{consumer.id}-{idempotency_key}" if idempotency_key else None,
+        )
 
         return CreatePaymentIntentResponse(
-            client_secret=payment_intent.client_secret,
-            payment_intent_id=payment_intent.id,
+            client_secret=payment_intent["client_secret"],
+            payment_intent_id=payment_intent["id"],
             customer_id=customer_id,
         )
 
-    except stripe.error.StripeError as e:
+    except PaymentError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Stripe error: {str(e)}",
@@ -22,8 +22,10 @@ from app.schemas.farmer import (
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
+    ProductSummaryResponse,
     ProductResponse,
     ProductListResponse,
+    NormalizedProductListResponse,
     ProductFilterParams,
 )
 from app.schemas.order import (
@@ -31,6 +33,8 @@ from app.schemas.order import (
     OrderUpdate,
     OrderResponse,
     OrderListResponse,
+    OrderSummary,
+    OrderSummaryListResponse,
     OrderFilterParams,
     OrderStatusUpdate,
     OrderItemResponse,
@@ -67,6 +71,8 @@ from app.schemas.consumer_order import (
     ConsumerOrderResponse,
     ConsumerOrderListResponse,
     ConsumerOrderItemResponse,
+    ConsumerOrderSummary,
+    ConsumerOrderSummaryListResponse,
 )
 from app.schemas.support_message import (
     SupportMessageCreate,
@@ -90,6 +96,12 @@ from app.schemas.retail_product import (
     RetailProductListResponse,
     SuggestPriceRequest,
     SuggestPriceResponse,
+    RepriceRequest,
+    RepriceChange,
+    RepriceResponse,
+)
+from app.schemas.catalog import (
+    CatalogChangesResponse,
 )
 from app.schemas.procurement import (
     ProcurementBatchResponse,
@@ -134,14 +146,18 @@ __all__ = [
     # Product
     "ProductCreate",
     "ProductUpdate",
+    "ProductSummaryResponse",
     "ProductResponse",
     "ProductListResponse",
+    "NormalizedProductListResponse",
     "ProductFilterParams",
     # Order
     "OrderCreate",
     "OrderUpdate",
     "OrderResponse",
     "OrderListResponse",
+    "OrderSummary",
+    "OrderSummaryListResponse",
     "OrderFilterParams",
     "OrderStatusUpdate",
     "OrderItemResponse",
@@ -173,6 +189,8 @@ __all__ = [
     "ConsumerOrderResponse",
     "ConsumerOrderListResponse",
     "ConsumerOrderItemResponse",
+    "ConsumerOrderSummary",
+    "ConsumerOrderSummaryListResponse",
     # Support Messages
     "SupportMessageCreate",
     "SupportMessage",
@@ -23,3 +23,5 @@ class AccessLogListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
@@ -0,0 +1,32 @@
+"""
+Catalog delta sync schemas - カタログ差分同期
+"""
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field
+
+from app.schemas.farmer import FarmerResponse
+from app.schemas.product import ProductResponse
+
+
+class ProductChanges(BaseModel):
+    updated: List[ProductResponse] = Field(default_factory=list, description="追加・更新された商品")
+    deleted: List[int] = Field(default_factory=list, description="削除・掲載終了した商品ID")
+
+
+class RetailProductChanges(BaseModel):
+    updated: List[Dict[str, Any]] = Field(default_factory=list, description="追加・更新された小売商品（一覧と同じ形式）")
+    deleted: List[int] = Field(default_factory=list, description="削除・非公開になった小売商品ID")
+
+
+class FarmerChanges(BaseModel):
+    updated: List[FarmerResponse] = Field(default_factory=list, description="追加・更新された生産者")
+    deleted: List[int] = Field(default_factory=list, description="削除された生産者ID")
+
+
+class CatalogChangesResponse(BaseModel):
+    token: str = Field(..., description="次回の since に渡す変更トークン")
+    full: bool = Field(..., description="True の場合は全件（ローカルのカタログを置き換える）")
+    products: ProductChanges
+    retail_products: RetailProductChanges
+    farmers: FarmerChanges
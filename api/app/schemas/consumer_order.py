@@ -158,3 +158,42 @@ class ConsumerOrderListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+
+
+class ConsumerOrderSummary(BaseModel):
+    """Slim consumer order row for list views (view=summary / fields=)."""
+    id: int
+    consumer_id: int
+    delivery_type: DeliverySlotType
+    delivery_label: str
+    delivery_time_label: str
+    delivery_date: Optional[date] = None
+    payment_method: str
+    status: OrderStatus
+    subtotal: Decimal
+    tax_amount: Decimal
+    discount_amount: Decimal = Decimal(0)
+    shipping_fee: int
+    total_amount: Decimal
+    created_at: datetime
+    cancelled_at: Optional[datetime] = None
+    # Available through fields= only
+    item_count: Optional[int] = None
+    consumer_name: Optional[str] = None
+    delivery_slot_id: Optional[int] = None
+    delivery_address: Optional[str] = None
+    delivery_notes: Optional[str] = None
+    order_notes: Optional[str] = None
+    coupon_code: Optional[str] = None
+    stripe_payment_intent_id: Optional[str] = None
+    confirmed_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ConsumerOrderSummaryListResponse(BaseModel):
+    """Paginated response for consumer order summaries."""
+    items: List[ConsumerOrderSummary]
+    total: int
+    skip: int
+    limit: int
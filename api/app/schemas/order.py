@@ -148,6 +148,41 @@ class OrderListResponse(BaseModel):
     limit: int
 
 
+class OrderSummary(BaseModel):
+    """Slim order row for list views (view=summary / fields=)."""
+    id: int
+    restaurant_id: int
+    restaurant_name: Optional[str] = None
+    delivery_date: datetime
+    delivery_time_slot: DeliveryTimeSlot
+    status: OrderStatus
+    subtotal: Decimal
+    tax_amount: Decimal
+    shipping_fee: int = 0
+    total_amount: Decimal
+    created_at: datetime
+    # Available through fields= only
+    item_count: Optional[int] = None
+    delivery_address: Optional[str] = None
+    delivery_phone: Optional[str] = None
+    delivery_notes: Optional[str] = None
+    notes: Optional[str] = None
+    invoice_url: Optional[str] = None
+    confirmed_at: Optional[datetime] = None
+    shipped_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+    cancelled_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class OrderSummaryListResponse(BaseModel):
+    """Schema for paginated order summaries."""
+    items: List[OrderSummary]
+    total: int
+    skip: int
+    limit: int
+
+
 class OrderFilterParams(BaseModel):
     """Filter parameters for order list."""
     restaurant_id: Optional[int] = Field(None, description="飲食店IDで絞り込み")
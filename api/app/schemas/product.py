@@ -90,12 +90,11 @@ class ProductUpdate(BaseModel):
         return v
 
 
-class ProductResponse(ProductBase, TimestampSchema, BaseSchema):
-    """Schema for product response."""
+class ProductSummaryResponse(ProductBase, TimestampSchema, BaseSchema):
+    """Schema for product response without the embedded farmer."""
     id: int
     farmer_id: Optional[int]
-    farmer: Optional[FarmerResponse] = None
-    
+
     @computed_field
     @property
     def price_with_tax(self) -> Decimal:
@@ -110,7 +109,12 @@ class ProductResponse(ProductBase, TimestampSchema, BaseSchema):
     def is_kobe_veggie(self) -> bool:
         """神戸野菜かどうか"""
         return self.stock_type == StockType.KOBE
-    
+
+
+class ProductResponse(ProductSummaryResponse):
+    """Schema for product response."""
+    farmer: Optional[FarmerResponse] = None
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -148,6 +152,15 @@ class ProductListResponse(BaseModel):
     limit: int
 
 
+class NormalizedProductListResponse(BaseModel):
+    """Schema for paginated product list with each farmer listed once (shape=normalized)."""
+    items: list[ProductSummaryResponse]
+    farmers: dict[int, FarmerResponse] = Field(default_factory=dict, description="farmer_id をキーにした生産者")
+    total: int
+    skip: int
+    limit: int
+
+
 class ProductFilterParams(BaseModel):
     """Filter parameters for product list."""
     stock_type: Optional[StockType] = Field(None, description="種別で絞り込み")
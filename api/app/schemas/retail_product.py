@@ -98,9 +98,38 @@ class SuggestPriceRequest(BaseModel):
     conversion_factor: Decimal = Field(..., description="変換係数")
     waste_margin_pct: int = Field(20, description="廃棄マージン%")
     price_multiplier: Decimal = Field(Decimal("0.8"), description="りふぁーむマージン係数")
+    set_quantity: int = Field(1, ge=1, description="セット数量（1=バラ売り, 2以上=セット売り）")
 
 
 class SuggestPriceResponse(BaseModel):
     suggested_price: Decimal
     cost_per_retail_unit: Decimal
     breakdown: str
+
+
+class RepriceRequest(BaseModel):
+    price_multiplier: Optional[Decimal] = Field(None, gt=0, le=1, description="マージン係数（未指定時は一般設定の価格係数）")
+    source_product_ids: Optional[List[int]] = Field(None, description="対象の農家商品（未指定時は全件）")
+    retail_product_ids: Optional[List[int]] = Field(None, description="対象の小売商品（未指定時は全件）")
+    include_inactive: bool = Field(True, description="販売停止中の商品も対象にする")
+    dry_run: bool = Field(True, description="True の場合は差分のみ返し、更新しない")
+
+
+class RepriceChange(BaseModel):
+    id: int
+    name: str
+    source_product_id: int
+    cost_price: int
+    old_price: Decimal
+    new_price: Decimal
+    diff: Decimal
+
+
+class RepriceResponse(BaseModel):
+    dry_run: bool
+    price_multiplier: Decimal
+    scanned: int = Field(..., description="対象の小売商品数")
+    changed: int = Field(..., description="価格が変わる（変わった）商品数")
+    skipped: int = Field(..., description="仕入値未設定などで計算できない商品数")
+    changes: List[RepriceChange]
+    elapsed_ms: float
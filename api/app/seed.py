@@ -8,6 +8,9 @@ from app.models.enums import StockType, TaxRate, ProductCategory
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when seed_data() changes so existing databases are re-seeded once
+SEED_VERSION = "1"
+
 async def seed_data():
     async with AsyncSessionLocal() as db:
         # 0. Create Organizations (NEW)
@@ -0,0 +1,228 @@
+"""
+Daily rollups of consumer_events for the analytics dashboard.
+
+Each settled day is summarized once into a ``consumer_event_daily`` row
+(event counts by type, product views, search terms and a HyperLogLog of
+consumers). A summary over N days then reads at most N small rows plus a
+raw scan of the still-open tail (today, and yesterday until
+``ROLLUP_GRACE`` has passed so late buffered events are included).
+
+Missing days are rolled up lazily when a summary is requested; run
+``python -m app.services.analytics_rollup`` from cron to keep them warm or
+``--rebuild`` to recompute a range.
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.sketches import HyperLogLog
+from app.models.consumer_event import ConsumerEvent, ConsumerEventDaily
+
+logger = logging.getLogger(__name__)
+
+# Days stay "open" (served from raw events) until this long after midnight
+ROLLUP_GRACE = timedelta(minutes=10)
+
+# Per-day cap on stored product / search entries (keeps rows small)
+MAX_ENTRIES_PER_DAY = 500
+
+
+class EventAggregate:
+    """Counts for a time range; aggregates for adjacent ranges merge by addition."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.event_counts: Dict[str, int] = {}
+        self.product_views: Dict[int, List] = {}  # product_id -> [name, count]
+        self.search_counts: Dict[str, int] = {}
+        self.consumers = HyperLogLog()
+
+    def merge(self, other: "EventAggregate") -> "EventAggregate":
+        self.total += other.total
+        for event_type, count in other.event_counts.items():
+            self.event_counts[event_type] = self.event_counts.get(event_type, 0) + count
+        for product_id, (name, count) in other.product_views.items():
+            entry = self.product_views.setdefault(product_id, [name, 0])
+            entry[0] = entry[0] or name
+            entry[1] += count
+        for query, count in other.search_counts.items():
+            self.search_counts[query] = self.search_counts.get(query, 0) + count
+        self.consumers.merge(other.consumers)
+        return self
+
+    def top_products(self, limit: int = 20) -> List[dict]:
+        ranked = sorted(self.product_views.items(), key=lambda kv: kv[1][1], reverse=True)[:limit]
+        return [
+            {"product_id": product_id, "product_name": name, "view_count": count}
+            for product_id, (name, count) in ranked
+        ]
+
+    def top_searches(self, limit: int = 20) -> List[dict]:
+        ranked = sorted(self.search_counts.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        return [{"query": query, "count": count} for query, count in ranked]
+
+    def to_row(self, day: date) -> ConsumerEventDaily:
+        products = sorted(self.product_views.items(), key=lambda kv: kv[1][1], reverse=True)
+        searches = sorted(self.search_counts.items(), key=lambda kv: kv[1], reverse=True)
+        return ConsumerEventDaily(
+            day=day,
+            total_events=self.total,
+            event_counts=self.event_counts,
+            product_views=[[pid, name, count] for pid, (name, count) in products[:MAX_ENTRIES_PER_DAY]],
+            search_counts=dict(searches[:MAX_ENTRIES_PER_DAY]),
+            unique_consumers=self.consumers.count(),
+            consumer_sketch=self.consumers.to_bytes(),
+        )
+
+    @classmethod
+    def from_row(cls, row: ConsumerEventDaily) -> "EventAggregate":
+        agg = cls()
+        agg.total = row.total_events
+        agg.event_counts = dict(row.event_counts or {})
+        agg.product_views = {int(pid): [name, count] for pid, name, count in (row.product_views or [])}
+        agg.search_counts = dict(row.search_counts or {})
+        if row.consumer_sketch:
+            agg.consumers = HyperLogLog.from_bytes(row.consumer_sketch)
+        return agg
+
+
+async def aggregate_raw(db: AsyncSession, start: datetime, end: Optional[datetime] = None) -> EventAggregate:
+    """Aggregate raw consumer_events in [start, end) with four grouped scans."""
+    window = [ConsumerEvent.created_at >= start]
+    if end is not None:
+        window.append(ConsumerEvent.created_at < end)
+    agg = EventAggregate()
+
+    result = await db.execute(
+        select(ConsumerEvent.event_type, func.count(ConsumerEvent.id))
+        .where(*window)
+        .group_by(ConsumerEvent.event_type)
+    )
+    for event_type, count in result.all():
+        agg.event_counts[event_type] = count
+        agg.total += count
+
+    result = await db.execute(
+        select(ConsumerEvent.product_id, func.max(ConsumerEvent.product_name), func.count(ConsumerEvent.id))
+        .where(*window, ConsumerEvent.event_type == "product_view", ConsumerEvent.product_id.isnot(None))
+        .group_by(ConsumerEvent.product_id)
+    )
+    for product_id, name, count in result.all():
+        agg.product_views[product_id] = [name, count]
+
+    result = await db.execute(
+        select(ConsumerEvent.search_query, func.count(ConsumerEvent.id))
+        .where(*window, ConsumerEvent.event_type == "search", ConsumerEvent.search_query.isnot(None))
+        .group_by(ConsumerEvent.search_query)
+    )
+    agg.search_counts = {query: count for query, count in result.all()}
+
+    result = await db.execute(
+        select(ConsumerEvent.consumer_id)
+        .where(*window, ConsumerEvent.consumer_id.isnot(None))
+        .distinct()
+    )
+    for consumer_id in result.scalars():
+        agg.consumers.add(consumer_id)
+    return agg
+
+
+def last_settled_day(now: Optional[datetime] = None) -> date:
+    """Most recent day whose events are final and can be rolled up."""
+    now = now or datetime.now()
+    return (now - ROLLUP_GRACE).date() - timedelta(days=1)
+
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+async def rollup_day(db: AsyncSession, day: date) -> ConsumerEventDaily:
+    """(Re)compute the rollup row for ``day``. The caller commits."""
+    start, end = _day_bounds(day)
+    agg = await aggregate_raw(db, start, end)
+    await db.execute(delete(ConsumerEventDaily).where(ConsumerEventDaily.day == day))
+    row = agg.to_row(day)
+    db.add(row)
+    return row
+
+
+async def ensure_rollups(db: AsyncSession, first_day: date, last_day: date) -> int:
+    """Roll up any day in [first_day, last_day] that has no row yet. Returns the count."""
+    if first_day > last_day:
+        return 0
+    result = await db.execute(
+        select(ConsumerEventDaily.day).where(ConsumerEventDaily.day.between(first_day, last_day))
+    )
+    existing = set(result.scalars())
+    missing = [
+        first_day + timedelta(days=i)
+        for i in range((last_day - first_day).days + 1)
+        if first_day + timedelta(days=i) not in existing
+    ]
+    for day in missing:
+        await rollup_day(db, day)
+    if missing:
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent request rolled up the same days first
+            await db.rollback()
+            return 0
+        logger.info(f"Rolled up consumer events for {len(missing)} day(s)")
+    return len(missing)
+
+
+async def summarize(db: AsyncSession, first_day: date, now: Optional[datetime] = None) -> EventAggregate:
+    """Aggregate from ``first_day`` 00:00 until now: rollup rows + raw open tail."""
+    now = now or datetime.now()
+    settled = last_settled_day(now)
+    agg = EventAggregate()
+
+    if first_day <= settled:
+        await ensure_rollups(db, first_day, settled)
+        result = await db.execute(
+            select(ConsumerEventDaily).where(ConsumerEventDaily.day.between(first_day, settled))
+        )
+        for row in result.scalars():
+            agg.merge(EventAggregate.from_row(row))
+
+    tail_start = datetime.combine(max(first_day, settled + timedelta(days=1)), time.min)
+    agg.merge(await aggregate_raw(db, tail_start))
+    return agg
+
+
+async def _main(days: int, rebuild: bool) -> None:
+    from app.core.database import AsyncSessionLocal
+
+    last_day = last_settled_day()
+    first_day = last_day - timedelta(days=days - 1)
+    async with AsyncSessionLocal() as db:
+        if rebuild:
+            for i in range(days):
+                await rollup_day(db, first_day + timedelta(days=i))
+            await db.commit()
+            print(f"Rebuilt {days} day(s): {first_day} .. {last_day}")
+        else:
+            count = await ensure_rollups(db, first_day, last_day)
+            print(f"Rolled up {count} missing day(s) in {first_day} .. {last_day}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.services.analytics_rollup",
+                                     description="Maintain consumer_event_daily rollups")
+    parser.add_argument("--days", type=int, default=90, help="settled days to cover (default 90)")
+    parser.add_argument("--rebuild", action="store_true", help="recompute existing rows too")
+    args = parser.parse_args()
+    asyncio.run(_main(args.days, args.rebuild))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Farmer shipping availability.
+
+A farmer's weekly availability (``Farmer.selectable_days``, a JSON list of
+``%w`` weekdays, 0=Sunday) is compiled once per distinct value into a 7-bit
+mask (bit ``d`` set = ships on weekday ``d``) and cached, so lookups never
+re-parse JSON. Farmers without a usable weekly setting get the frontend
+default (Wednesday only).
+
+For a date range the mask is rotated to the range's first weekday and
+repeated with integer arithmetic, which gives one bit per day of the range;
+``FarmerSchedule`` overrides are indexed by day offset into the range and
+take precedence over the weekly mask.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+import json
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+WEEK_BITS = 0b1111111
+DEFAULT_MASK = 1 << 3  # Wednesday, matches ProducerSchedule.tsx
+
+REASON_WEEKLY = "曜日設定"
+REASON_DEFAULT = "曜日設定 (デフォルト)"
+REASON_DEFAULT_CLOSED = "曜日設定 (初期設定: 水曜のみ)"
+REASON_OVERRIDE_OPEN = "出荷可能日設定"
+REASON_OVERRIDE_CLOSED = "休業日設定"
+
+# (is_available, notes) of a FarmerSchedule row
+Override = Tuple[bool, Optional[str]]
+
+
+@lru_cache(maxsize=1024)
+def weekday_mask(selectable_days: Optional[str]) -> Optional[int]:
+    """Compile ``selectable_days`` into a weekday mask; ``None`` when there is no weekly setting."""
+    if not selectable_days:
+        return None
+    try:
+        allowed = json.loads(selectable_days)
+    except ValueError:
+        return None
+    if not isinstance(allowed, list):
+        return None
+    mask = 0
+    for day in allowed:
+        # Same membership test as ``weekday in allowed`` (1.0 and True count as 1)
+        if day in range(7):
+            mask |= 1 << int(day)
+    return mask
+
+
+def weekday(day: date) -> int:
+    """``%w`` weekday (0=Sunday)."""
+    return (day.weekday() + 1) % 7
+
+
+@lru_cache(maxsize=4096)
+def range_bits(mask: int, first_weekday: int, days: int) -> int:
+    """Bit ``i`` set when day ``i`` of a ``days``-long range starting on ``first_weekday`` is in ``mask``."""
+    rotated = ((mask >> first_weekday) | (mask << (7 - first_weekday))) & WEEK_BITS
+    weeks = -(-days // 7)
+    # rotated * 0b...0000001_0000001 repeats the 7-bit pattern once per week
+    repeated = rotated * (((1 << (7 * weeks)) - 1) // WEEK_BITS)
+    return repeated & ((1 << days) - 1)
+
+
+def check_day(selectable_days: Optional[str], day: date, override: Optional[Override] = None) -> Tuple[bool, str]:
+    """(is_available, reason) for one farmer on one day."""
+    if override is not None:
+        is_available, notes = override
+        return is_available, notes or (REASON_OVERRIDE_OPEN if is_available else REASON_OVERRIDE_CLOSED)
+    mask = weekday_mask(selectable_days)
+    if mask is None:
+        is_available = bool(DEFAULT_MASK >> weekday(day) & 1)
+        return is_available, REASON_DEFAULT if is_available else REASON_DEFAULT_CLOSED
+    return bool(mask >> weekday(day) & 1), REASON_WEEKLY
+
+
+def index_overrides(rows: Iterable[Tuple[int, date, bool, Optional[str]]], start: date) -> Dict[int, Dict[int, Override]]:
+    """``(farmer_id, date, is_available, notes)`` rows -> ``{day offset: {farmer_id: override}}``."""
+    indexed: Dict[int, Dict[int, Override]] = {}
+    for farmer_id, day, is_available, notes in rows:
+        indexed.setdefault((day - start).days, {})[farmer_id] = (is_available, notes)
+    return indexed
+
+
+def check_range(
+    farmer_ids: List[int],
+    selectable_days: Mapping[int, Optional[str]],
+    overrides: Mapping[int, Mapping[int, Override]],
+    start: date,
+    end: date,
+) -> dict:
+    """
+    Availability of ``farmer_ids`` for every day from ``start`` to ``end``.
+
+    ``selectable_days`` maps the farmers that exist to their weekly setting;
+    other ids are left out of the result. Returns
+    ``{"YYYY-MM-DD": {"available": [...], "unavailable": [{"id", "reason"}], "all_available"}}``.
+    """
+    days = (end - start).days + 1
+    if days <= 0:
+        return {}
+    first_weekday = weekday(start)
+
+    farmers = []
+    for fid in farmer_ids:
+        if fid not in selectable_days:
+            continue
+        mask = weekday_mask(selectable_days[fid])
+        if mask is None:
+            farmers.append((fid, range_bits(DEFAULT_MASK, first_weekday, days), REASON_DEFAULT_CLOSED))
+        else:
+            farmers.append((fid, range_bits(mask, first_weekday, days), REASON_WEEKLY))
+
+    results = {}
+    no_overrides: Mapping[int, Override] = {}
+    for i in range(days):
+        day_overrides = overrides.get(i, no_overrides)
+        available = []
+        unavailable = []
+        for fid, bits, reason in farmers:
+            override = day_overrides.get(fid)
+            if override is not None:
+                if override[0]:
+                    available.append(fid)
+                else:
+                    unavailable.append({"id": fid, "reason": override[1] or REASON_OVERRIDE_CLOSED})
+            elif bits >> i & 1:
+                available.append(fid)
+            else:
+                unavailable.append({"id": fid, "reason": reason})
+        results[(start + timedelta(days=i)).isoformat()] = {
+            "available": available,
+            "unavailable": unavailable,
+            "all_available": not unavailable,
+        }
+    return results
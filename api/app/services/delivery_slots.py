@@ -0,0 +1,246 @@
+"""
+In-memory index of upcoming delivery slots.
+
+Slots are edited a few times a week and read on every shop page and every
+checkout. ``delivery_slot_cache`` keeps all slots dated today or later
+(active or not) indexed by id and by ``(date, slot_type, time_text)``:
+
+- ``GET /api/delivery-slots`` is served from memory; each filter
+  combination's result and ETag are computed once per cache generation.
+- Checkout resolves a slot id or label from memory and only touches the
+  database when it has to create (or re-open) a slot, with an INSERT that
+  is safe against concurrent checkouts (unique key + SAVEPOINT).
+
+Admin edits reload the cache of the worker that made them
+(``await delivery_slot_cache.load()``); other workers re-read the upcoming
+slots every ``DELIVERY_SLOT_POLL_INTERVAL`` seconds (one small SELECT) and
+rebuild only when a row differs. Until the first load, and for dates before
+the cached range, callers fall back to the database.
+"""
+import asyncio
+from datetime import date, time
+import hashlib
+import logging
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.enums import DeliverySlotType
+from app.services.event_buffer import register_buffer
+
+logger = logging.getLogger(__name__)
+
+SlotKey = Tuple[date, DeliverySlotType, str]
+
+
+class SlotEntry(NamedTuple):
+    """Read-only copy of a ``DeliverySlot`` row (attribute-compatible for the fields below)."""
+
+    id: int
+    date: date
+    slot_type: DeliverySlotType
+    start_time: Optional[time]
+    end_time: Optional[time]
+    time_text: str
+    is_active: bool
+
+    @property
+    def key(self) -> SlotKey:
+        return (self.date, self.slot_type, self.time_text)
+
+
+def _sort_key(slot: SlotEntry):
+    # Same order as ORDER BY date, start_time NULLS LAST (id breaks ties)
+    return (slot.date, slot.start_time is None, slot.start_time or time.min, slot.id)
+
+
+def _etag(slots: List[SlotEntry]) -> str:
+    digest = hashlib.sha1()
+    for slot in slots:
+        digest.update(f"{slot.id}|{slot.date}|{slot.slot_type.value}|{slot.time_text}\n".encode())
+    return f'W/"slots-{digest.hexdigest()[:20]}"'
+
+
+class DeliverySlotCache:
+    """Upcoming delivery slots, indexed for listing and checkout."""
+
+    def __init__(self, poll_interval: Optional[float] = None) -> None:
+        self.poll_interval = settings.DELIVERY_SLOT_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.since: Optional[date] = None
+        self._by_id: Dict[int, SlotEntry] = {}
+        self._by_key: Dict[SlotKey, SlotEntry] = {}
+        self._active: List[SlotEntry] = []
+        self._active_dates: Set[date] = set()
+        self._listings: Dict[tuple, Tuple[List[SlotEntry], str]] = {}
+        self._rows: List[SlotEntry] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.since is not None
+
+    def covers(self, day: Optional[date]) -> bool:
+        """True when slots on ``day`` (``None``: upcoming) can be answered from memory."""
+        return self.loaded and (day is None or day >= self.since)
+
+    def get(self, slot_id: int) -> Optional[SlotEntry]:
+        return self._by_id.get(slot_id)
+
+    def find(self, day: date, slot_type: DeliverySlotType, time_text: str) -> Optional[SlotEntry]:
+        return self._by_key.get((day, slot_type, time_text))
+
+    def listing(
+        self,
+        slot_type: Optional[DeliverySlotType] = None,
+        target_date: Optional[date] = None,
+    ) -> Tuple[List[SlotEntry], str]:
+        """
+        Active slots for the public listing and their ETag (requires ``covers(target_date)``).
+
+        Only the upcoming listing and dates that have active slots are
+        memoized; any other date is answered with an empty list without
+        adding an entry, so arbitrary ``?date=`` values cannot grow the cache.
+        """
+        today = date.today()
+        if target_date is not None and target_date not in self._active_dates:
+            return [], _etag([])
+        cache_key = (slot_type, target_date, today)
+        cached = self._listings.get(cache_key)
+        if cached is not None:
+            return cached
+        slots = [
+            slot for slot in self._active
+            if (slot.date == target_date if target_date else slot.date >= today)
+            and (slot_type is None or slot.slot_type == slot_type)
+        ]
+        result = (slots, _etag(slots))
+        self._listings[cache_key] = result
+        return result
+
+    async def _read(self, since: date) -> List[SlotEntry]:
+        from app.core.database import engine
+        from app.models import DeliverySlot
+
+        query = select(
+            DeliverySlot.id,
+            DeliverySlot.date,
+            DeliverySlot.slot_type,
+            DeliverySlot.start_time,
+            DeliverySlot.end_time,
+            DeliverySlot.time_text,
+            DeliverySlot.is_active,
+        ).where(DeliverySlot.date >= since).order_by(DeliverySlot.id)
+        async with engine.connect() as conn:
+            return [SlotEntry(*row) for row in (await conn.execute(query)).all()]
+
+    def _build(self, rows: List[SlotEntry], since: date) -> None:
+        by_id: Dict[int, SlotEntry] = {}
+        by_key: Dict[SlotKey, SlotEntry] = {}
+        for row in rows:
+            by_id[row.id] = row
+            # Lowest id wins, like the checkout lookup always did
+            by_key.setdefault(row.key, row)
+        self._by_id, self._by_key = by_id, by_key
+        self._active = sorted((slot for slot in rows if slot.is_active), key=_sort_key)
+        self._active_dates = {slot.date for slot in self._active}
+        self._listings = {}
+        self._rows = rows
+        self.since = since
+
+    async def load(self) -> int:
+        """(Re)load every slot dated today or later. Returns how many."""
+        since = date.today()
+        self._build(await self._read(since), since)
+        return len(self._rows)
+
+    async def refresh(self) -> bool:
+        """Rebuild when slots changed elsewhere (or the day rolled over). Returns whether it did."""
+        since = date.today()
+        rows = await self._read(since)
+        if since == self.since and rows == self._rows:
+            return False
+        self._build(rows, since)
+        return True
+
+    async def resolve(
+        self,
+        db: AsyncSession,
+        day: date,
+        slot_type: DeliverySlotType,
+        time_text: str,
+        start_time: Optional[time] = None,
+        end_time: Optional[time] = None,
+    ):
+        """
+        Active slot for ``(day, slot_type, time_text)``, created (or re-activated) if needed.
+
+        Returns a ``SlotEntry`` on a cache hit, otherwise the ``DeliverySlot``
+        flushed in ``db``'s transaction; the caller commits.
+        """
+        from app.models import DeliverySlot
+
+        if self.covers(day):
+            cached = self.find(day, slot_type, time_text)
+            if cached is not None and cached.is_active:
+                return cached
+
+        stmt_existing = select(DeliverySlot).where(
+            DeliverySlot.date == day,
+            DeliverySlot.slot_type == slot_type,
+            DeliverySlot.time_text == time_text,
+        ).order_by(DeliverySlot.id.asc()).limit(1)
+        existing = (await db.execute(stmt_existing)).scalars().first()
+        if existing is None:
+            generated_slot = DeliverySlot(
+                date=day,
+                slot_type=slot_type,
+                start_time=start_time,
+                end_time=end_time,
+                time_text=time_text,
+                is_active=True,
+                note="auto-generated from consumer checkout",
+            )
+            try:
+                async with db.begin_nested():
+                    db.add(generated_slot)
+                return generated_slot
+            except IntegrityError:
+                # A concurrent checkout created the same slot first (uq_delivery_slots_date_type_text)
+                existing = (await db.execute(stmt_existing)).scalars().first()
+                if existing is None:
+                    raise
+        if not existing.is_active:
+            existing.is_active = True
+            await db.flush()
+        return existing
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except SQLAlchemyError as e:
+                logger.warning(f"Delivery slot refresh failed: {e.__class__.__name__}: {e}")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running and self.poll_interval > 0:
+            self._task = asyncio.create_task(self._run(), name="delivery-slot-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+delivery_slot_cache = register_buffer(DeliverySlotCache())
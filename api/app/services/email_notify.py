@@ -1,5 +1,4 @@
-﻿import smtplib
-from datetime import datetime
+﻿from datetime import datetime
 from decimal import Decimal
 from email.message import EmailMessage
 from typing import Iterable
@@ -8,6 +7,7 @@ import pytz
 
 from app.core.config import settings
 from app.models import Order, ConsumerOrder
+from app.services.mail_delivery import mail_queue
 
 
 class EmailNotificationService:
@@ -49,15 +49,8 @@ class EmailNotificationService:
             msg.set_content("This email requires an HTML-capable email client.")
         msg.add_alternative(html_body, subtype="html")
 
-        try:
-            with smtplib.SMTP(settings.EMAIL_SMTP_HOST, settings.EMAIL_SMTP_PORT) as smtp:
-                if settings.EMAIL_USE_TLS:
-                    smtp.starttls()
-                if settings.EMAIL_SMTP_USER and settings.EMAIL_SMTP_PASSWORD:
-                    smtp.login(settings.EMAIL_SMTP_USER, settings.EMAIL_SMTP_PASSWORD)
-                smtp.send_message(msg)
-        except Exception as exc:
-            print(f"Failed to send email notification: {exc}")
+        # Queued and sent in batches over a pooled SMTP session (app.services.mail_delivery)
+        mail_queue.send(msg)
 
     def _build_items_rows(self, items: Iterable, include_unit_price: bool = True) -> str:
         rows = []
@@ -0,0 +1,207 @@
+"""
+Write-behind buffer for high-volume append-only tables.
+
+Rows are queued in a bounded in-memory ring and written with one multi-row
+INSERT per batch, either when ``flush_size`` rows are waiting or every
+``flush_interval`` seconds. Memory is capped at ``capacity`` rows; what
+happens beyond that is the overflow policy:
+
+* ``drop_oldest`` – ring buffer semantics, the oldest queued rows are lost
+* ``drop_newest`` – incoming rows that do not fit are discarded
+* ``reject``      – the whole offer is refused (callers answer 503 so
+                    clients back off and retry)
+
+Buffered rows live in process memory only: a hard crash loses at most one
+flush interval of data. ``stop()`` flushes on graceful shutdown.
+"""
+import asyncio
+from collections import deque
+import logging
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "reject")
+
+
+class BufferFull(Exception):
+    """Raised by ``offer()`` under the ``reject`` policy when rows do not fit."""
+
+
+async def insert_rows(table: Table, rows: List[dict]) -> List[dict]:
+    """
+    Insert ``rows`` with one executemany; returns the rows that were rejected.
+
+    When the batch violates a constraint (a bad foreign key, an oversized
+    value) the rows are retried one by one so a single bad row cannot poison
+    the whole batch. Connection-level errors propagate to the caller.
+    """
+    from app.core.database import engine
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), rows)
+        return []
+    except (IntegrityError, DataError) as e:
+        if len(rows) == 1:
+            logger.warning(f"Rejected row for {table.name}: {e.orig}")
+            return rows
+
+    rejected = []
+    for row in rows:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(insert(table), [row])
+        except (IntegrityError, DataError) as e:
+            logger.warning(f"Rejected row for {table.name}: {e.orig}")
+            rejected.append(row)
+    return rejected
+
+
+class WriteBehindBuffer:
+    """Bounded in-memory queue of rows for ``table``, flushed in batches."""
+
+    def __init__(
+        self,
+        table: Table,
+        capacity: int = 10000,
+        flush_size: int = 500,
+        flush_interval: float = 2.0,
+        overflow_policy: str = "drop_oldest",
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
+        self.table = table
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self._rows: Deque[dict] = deque()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.accepted = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def offer(self, rows: List[dict]) -> int:
+        """
+        Queue rows without awaiting. Returns how many rows were accepted.
+
+        Raises BufferFull under the ``reject`` policy when they do not fit.
+        """
+        free = self.capacity - len(self._rows)
+        if len(rows) > free:
+            if self.overflow_policy == "reject":
+                raise BufferFull(f"{self.table.name} buffer full ({len(self._rows)}/{self.capacity})")
+            if self.overflow_policy == "drop_newest":
+                self.dropped += len(rows) - max(free, 0)
+                rows = rows[:max(free, 0)]
+            else:
+                overflow = len(rows) - free
+                if overflow >= len(self._rows):
+                    # Even the incoming batch alone exceeds capacity
+                    self.dropped += len(self._rows) + max(len(rows) - self.capacity, 0)
+                    self._rows.clear()
+                    rows = rows[-self.capacity:]
+                else:
+                    for _ in range(overflow):
+                        self._rows.popleft()
+                    self.dropped += overflow
+
+        self._rows.extend(rows)
+        self.accepted += len(rows)
+        if len(self._rows) >= self.flush_size:
+            self._wake.set()
+        return len(rows)
+
+    async def flush(self) -> int:
+        """Write everything queued so far. Returns the number of rows written."""
+        written = 0
+        async with self._flush_lock:
+            while self._rows:
+                batch = [self._rows.popleft() for _ in range(min(self.flush_size, len(self._rows)))]
+                try:
+                    rejected = await insert_rows(self.table, batch)
+                except Exception as e:
+                    self.failed_flushes += 1
+                    requeue = batch[:max(self.capacity - len(self._rows), 0)]
+                    self._rows.extendleft(reversed(requeue))
+                    self.dropped += len(batch) - len(requeue)
+                    logger.error(f"Flushing {len(batch)} rows into {self.table.name} failed: {e}")
+                    break
+                self.dropped += len(rejected)
+                written += len(batch) - len(rejected)
+                self.flushed += len(batch) - len(rejected)
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._rows:
+                await self.flush()
+
+    def start(self) -> None:
+        if not self.running:
+            # Bind the primitives to the running loop (tests may start several)
+            self._wake = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run(), name=f"flush:{self.table.name}")
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write out anything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._rows:
+            written = await self.flush()
+            logger.info(f"Flushed {written} buffered rows into {self.table.name} on shutdown")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._rows),
+            "capacity": self.capacity,
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+# Buffers created by routers at import time; started/stopped by the app lifespan.
+# Anything with start() / async stop() can be registered.
+_registry: list = []
+
+
+def register_buffer(buffer):
+    _registry.append(buffer)
+    return buffer
+
+
+def start_buffers() -> None:
+    for buffer in _registry:
+        buffer.start()
+
+
+async def stop_buffers() -> None:
+    for buffer in _registry:
+        await buffer.stop()
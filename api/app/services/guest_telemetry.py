@@ -0,0 +1,311 @@
+"""
+Buffered telemetry for the QR guest flow (guest_visits / guest_interactions).
+
+``/visit``, ``/interaction`` and ``/log`` no longer commit per request:
+
+* visit ids come from ``VisitIdAllocator`` – a block of sequence values per
+  round trip on PostgreSQL, so ``/visit`` answers without an INSERT
+* new visits and interactions are queued and bulk inserted
+* repeated ``/log`` calls for the same visit are coalesced to the latest
+  value; a visit that is still queued just gets its row patched in place
+
+Everything is flushed every ``flush_interval`` seconds (visits first, so
+interactions can reference them) and on graceful shutdown. As with the
+consumer event buffer, a hard crash loses at most one flush interval.
+
+With several workers, ``/visit`` and the following ``/interaction`` or
+``/log`` can land in different processes, and the visit may still be queued
+in the other worker when this one flushes. Interactions and metric updates
+whose visit is not in ``guest_visits`` yet are kept for up to
+``visit_wait_flushes`` more flushes instead of failing the foreign key.
+"""
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+import logging
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, func, select, text, update
+
+from app.models.guest import GuestInteraction, GuestVisit
+from app.services.event_buffer import BufferFull, insert_rows
+
+logger = logging.getLogger(__name__)
+
+
+class VisitIdAllocator:
+    """
+    Hands out guest_visits ids without inserting a row first.
+
+    PostgreSQL: ``block_size`` values are prefetched from the table's serial
+    sequence in one statement, so ids stay unique across workers.
+    Other databases (SQLite for local runs) have no sequence; ids continue
+    from ``max(id)`` in this process, which is only safe with one worker.
+    """
+
+    def __init__(self, table, block_size: int = 50) -> None:
+        self.table = table
+        self.block_size = block_size
+        self._ids: Deque[int] = deque()
+        self._next_local: Optional[int] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def next_id(self) -> int:
+        if self._ids:
+            return self._ids.popleft()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._ids:
+                self._ids.extend(await self._fetch_block())
+            return self._ids.popleft()
+
+    async def _fetch_block(self) -> List[int]:
+        from app.core.database import engine
+
+        async with engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                result = await conn.execute(
+                    text(
+                        "SELECT nextval(pg_get_serial_sequence(:table, 'id')) "
+                        "FROM generate_series(1, :n)"
+                    ),
+                    {"table": self.table.name, "n": self.block_size},
+                )
+                return [row[0] for row in result]
+
+            if self._next_local is None:
+                current = await conn.scalar(select(func.max(self.table.c.id)))
+                self._next_local = (current or 0) + 1
+        start = self._next_local
+        self._next_local += self.block_size
+        return list(range(start, start + self.block_size))
+
+
+class GuestTelemetryBuffer:
+    """Pending guest visits, metric updates and interactions for one process."""
+
+    def __init__(
+        self,
+        capacity: int = 20000,
+        flush_interval: float = 2.0,
+        id_block_size: int = 50,
+        visit_wait_flushes: int = 3,
+    ) -> None:
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.visit_wait_flushes = visit_wait_flushes
+        self.visit_ids = VisitIdAllocator(GuestVisit.__table__, block_size=id_block_size)
+        self._visits: Dict[int, dict] = {}
+        self._metrics: Dict[int, Tuple[int, Optional[int], datetime]] = {}
+        self._interactions: Deque[dict] = deque()
+        # visit id -> flushes its rows have already waited for the visit to appear
+        self._waiting: Dict[int, int] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.coalesced = 0
+        self.deferred = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._visits) + len(self._metrics) + len(self._interactions)
+
+    def _check_capacity(self) -> None:
+        if self.pending >= self.capacity:
+            raise BufferFull(f"guest telemetry buffer full ({self.pending}/{self.capacity})")
+
+    async def add_visit(self, restaurant_id: int, visitor_id: Optional[str]) -> int:
+        """Allocate a visit id and queue the row. Raises BufferFull when saturated."""
+        self._check_capacity()
+        visit_id = await self.visit_ids.next_id()
+        now = datetime.now(timezone.utc)
+        self._visits[visit_id] = {
+            "id": visit_id,
+            "restaurant_id": restaurant_id,
+            "visitor_id": visitor_id,
+            "stay_time_seconds": None,
+            "scroll_depth": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        return visit_id
+
+    def add_interaction(self, row: dict) -> None:
+        self._check_capacity()
+        now = datetime.now(timezone.utc)
+        self._interactions.append({**row, "created_at": now, "updated_at": now})
+
+    def log_metrics(self, visit_id: int, stay_time: int, scroll_depth: Optional[int]) -> None:
+        """Record the latest metrics for a visit; earlier pending values are replaced."""
+        now = datetime.now(timezone.utc)
+        visit = self._visits.get(visit_id)
+        if visit is not None:
+            visit["stay_time_seconds"] = stay_time
+            visit["scroll_depth"] = scroll_depth
+            visit["updated_at"] = now
+            self.coalesced += 1
+            return
+        if visit_id in self._metrics:
+            self.coalesced += 1
+        elif len(self._metrics) >= self.capacity:
+            # /log is resent periodically, so a dropped update is superseded by the next one
+            self.dropped += 1
+            return
+        self._metrics[visit_id] = (stay_time, scroll_depth, now)
+
+    async def _missing_visits(self, visit_ids: Set[int]) -> Set[int]:
+        """The ids in ``visit_ids`` that have no guest_visits row yet."""
+        from app.core.database import engine
+
+        if not visit_ids:
+            return set()
+        table = GuestVisit.__table__
+        async with engine.connect() as conn:
+            result = await conn.execute(select(table.c.id).where(table.c.id.in_(visit_ids)))
+            return visit_ids - {row[0] for row in result}
+
+    def _defer(self, missing: Set[int]) -> Set[int]:
+        """
+        Count one more wait for each visit in ``missing``; returns the ones that
+        may wait again. Visits that waited ``visit_wait_flushes`` times are given up.
+        """
+        keep = set()
+        for visit_id in missing:
+            waited = self._waiting.get(visit_id, 0) + 1
+            if waited > self.visit_wait_flushes:
+                self._waiting.pop(visit_id, None)
+                logger.warning(f"Guest visit {visit_id} never appeared; dropping its telemetry")
+            else:
+                self._waiting[visit_id] = waited
+                keep.add(visit_id)
+        return keep
+
+    async def flush(self) -> int:
+        """Write all pending rows: visits, then metric updates, then interactions."""
+        from app.core.database import engine
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            visits, self._visits = self._visits, {}
+            metrics, self._metrics = self._metrics, {}
+            interactions = list(self._interactions)
+            self._interactions.clear()
+            written = 0
+            try:
+                if visits:
+                    rejected = await insert_rows(GuestVisit.__table__, list(visits.values()))
+                    self.dropped += len(rejected)
+                    written += len(visits) - len(rejected)
+                    visits = {}
+
+                # Visits buffered by another worker may not be written yet
+                missing = await self._missing_visits(set(metrics) | {row["visit_id"] for row in interactions})
+                if missing:
+                    keep = self._defer(missing)
+                    waiting_metrics = {k: v for k, v in metrics.items() if k in missing}
+                    waiting_interactions = [row for row in interactions if row["visit_id"] in missing]
+                    metrics = {k: v for k, v in metrics.items() if k not in missing}
+                    interactions = [row for row in interactions if row["visit_id"] not in missing]
+                    requeued_metrics = {k: v for k, v in waiting_metrics.items() if k in keep}
+                    requeued = [row for row in waiting_interactions if row["visit_id"] in keep]
+                    self._metrics = {**requeued_metrics, **self._metrics}
+                    self._interactions.extendleft(reversed(requeued))
+                    self.deferred += len(requeued_metrics) + len(requeued)
+                    self.dropped += (
+                        len(waiting_metrics) + len(waiting_interactions) - len(requeued_metrics) - len(requeued)
+                    )
+                for visit_id in set(metrics) | {row["visit_id"] for row in interactions}:
+                    self._waiting.pop(visit_id, None)
+
+                if metrics:
+                    table = GuestVisit.__table__
+                    stmt = (
+                        update(table)
+                        .where(table.c.id == bindparam("visit_id"))
+                        .values(
+                            stay_time_seconds=bindparam("stay_time"),
+                            scroll_depth=bindparam("scroll"),
+                            updated_at=bindparam("ts"),
+                        )
+                    )
+                    params = [
+                        {"visit_id": visit_id, "stay_time": stay, "scroll": scroll, "ts": ts}
+                        for visit_id, (stay, scroll, ts) in metrics.items()
+                    ]
+                    async with engine.begin() as conn:
+                        await conn.execute(stmt, params)
+                    written += len(metrics)
+                    metrics = {}
+
+                if interactions:
+                    rejected = await insert_rows(GuestInteraction.__table__, interactions)
+                    self.dropped += len(rejected)
+                    written += len(interactions) - len(rejected)
+                    interactions = []
+            except Exception as e:
+                # Put back whatever was not written; newer metric values win
+                self.failed_flushes += 1
+                self._visits = {**visits, **self._visits}
+                self._metrics = {**metrics, **self._metrics}
+                self._interactions.extendleft(reversed(interactions))
+                logger.error(f"Flushing guest telemetry failed: {e}")
+
+            self.flushed += written
+            return written
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self.pending:
+                await self.flush()
+
+    def start(self) -> None:
+        if not self.running:
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run(), name="flush:guest_telemetry")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.pending:
+            written = await self.flush()
+            logger.info(f"Flushed {written} buffered guest telemetry rows on shutdown")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending_visits": len(self._visits),
+            "pending_metrics": len(self._metrics),
+            "pending_interactions": len(self._interactions),
+            "coalesced": self.coalesced,
+            "deferred": self.deferred,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+def _build_buffer() -> GuestTelemetryBuffer:
+    from app.core.config import settings
+
+    return GuestTelemetryBuffer(
+        capacity=settings.GUEST_TELEMETRY_CAPACITY,
+        flush_interval=settings.GUEST_TELEMETRY_FLUSH_INTERVAL,
+        id_block_size=settings.GUEST_VISIT_ID_BLOCK_SIZE,
+        visit_wait_flushes=settings.GUEST_TELEMETRY_VISIT_WAIT_FLUSHES,
+    )
+
+
+guest_telemetry = _build_buffer()
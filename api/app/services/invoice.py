@@ -1,17 +1,31 @@
-import os
-import math
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
 
-# Setup Jinja2 Environment
-template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
-env = Environment(loader=FileSystemLoader(template_dir))
+from app.core.config import settings
+# Jinja2 / WeasyPrint are loaded on first render (see app.services.pdf)
+from app.services.pdf import render_pdf
+
+
+def _split_shipping_fee(shipping_fee):
+    """税込配送料 (標準税率 10%) を (税抜金額, 消費税) に分ける。整数演算で 1,100 → (1,000, 100)"""
+    tax = shipping_fee * 10 // 110
+    return shipping_fee - tax, tax
+
 
 def _generate_pdf(order, title):
-    template = env.get_template('invoice.html')
-    
+    context = _invoice_context(order, title)
+
+    if settings.PDF_RENDERER == "reportlab":
+        from app.services.pdf_reportlab import render_invoice
+
+        return render_invoice(context)
+
+    # PDF生成
+    return render_pdf('invoice', context)
+
+
+def _invoice_context(order, title):
+    """請求書・納品書のテンプレート変数 (WeasyPrint / ReportLab 共通)"""
     # 日付
     invoice_date = order.created_at or datetime.now()
     if order.confirmed_at:
@@ -62,10 +76,10 @@ def _generate_pdf(order, title):
     # 配送料があれば追加 (標準税率 10%)
     shipping_fee = getattr(order, 'shipping_fee', 0) or 0
     if shipping_fee > 0:
-        # 配送料の税抜金額を計算（簡易的に1.1で割る）
-        shipping_base = math.ceil(shipping_fee / 1.1)
-        shipping_tax = shipping_fee - shipping_base
-        
+        # 配送料の税抜金額を計算
+        shipping_base, shipping_tax = _split_shipping_fee(shipping_fee)
+
+
         items.append({
             "name": "配送料",
             "quantity": 1,
@@ -143,13 +157,8 @@ def _generate_pdf(order, title):
         
         "remarks": "※振込手数料は貴社負担にてお願い致します。" if title == "請求書" else ""
     }
-    
-    html_content = template.render(context)
-    
-    # PDF生成
-    pdf_bytes = HTML(string=html_content).write_pdf()
-    
-    return pdf_bytes
+
+    return context
 
 def generate_invoice_pdf(order):
     return _generate_pdf(order, "請求書")
@@ -158,8 +167,6 @@ def generate_delivery_slip_pdf(order):
     return _generate_pdf(order, "納品書")
 
 def generate_monthly_invoice_pdf(restaurant, orders, target_month_label, period_str):
-    template = env.get_template('invoice_monthly.html')
-    
     # Common Data
     invoice_date = datetime.now()
     # Calculate totals
@@ -197,8 +204,7 @@ def generate_monthly_invoice_pdf(restaurant, orders, target_month_label, period_
         shipping_fee = int(getattr(order, 'shipping_fee', 0) or 0)
         if shipping_fee > 0:
             # Re-calculate shipping base and tax for consistency (usually 10% included)
-            s10 = math.ceil(shipping_fee / 1.1)
-            t10 = shipping_fee - s10
+            s10, t10 = _split_shipping_fee(shipping_fee)
             subtotal_10 += s10
             tax_10 += t10
 
@@ -258,17 +264,12 @@ def generate_monthly_invoice_pdf(restaurant, orders, target_month_label, period_
         "daily_items": daily_items
     }
     
-    html_content = template.render(context)
-    pdf_bytes = HTML(string=html_content).write_pdf()
-    
-    return pdf_bytes
+    return render_pdf('invoice_monthly', context)
 
 def generate_farmer_payment_notice_pdf(farmer, total_amount, period_str, details):
     """
     生産者向けの支払通知書PDFを生成
     """
-    template = env.get_template('payment_notice.html')
-    
     invoice_date = datetime.now()
     
     # 振込先情報（farmerモデルから取得。なければ空文字）
@@ -316,7 +317,4 @@ def generate_farmer_payment_notice_pdf(farmer, total_amount, period_str, details
         "items": details # [{date, product, amount}]
     }
     
-    html_content = template.render(context)
-    pdf_bytes = HTML(string=html_content).write_pdf()
-    
-    return pdf_bytes
+    return render_pdf('payment_notice', context)
@@ -0,0 +1,220 @@
+"""
+Real-time consumer analytics from streaming sketches.
+
+Each worker keeps today's sketches in memory, fed by the event ingestion
+path: Space-Saving summaries for viewed products and search terms, and
+HyperLogLogs for unique consumers and sessions. Every ``flush_interval``
+seconds (and on shutdown) the worker upserts its sketches as one
+``consumer_event_sketches`` row keyed by (day, worker_id).
+
+``snapshot()`` merges this worker's live state with the persisted rows of
+every other worker (including ones that have since restarted), so the
+answer costs O(workers x capacity) regardless of event volume.
+"""
+import asyncio
+from datetime import date, timedelta
+import logging
+import os
+import socket
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, select
+
+from app.core.sketches import HyperLogLog, SpaceSaving
+from app.models.consumer_event import ConsumerEventSketch
+
+logger = logging.getLogger(__name__)
+
+# Persisted sketches older than this are deleted at day rollover
+RETENTION_DAYS = 7
+
+
+class DaySketches:
+    """Mergeable sketches for one day of consumer events."""
+
+    def __init__(self, day: date, capacity: int = 200) -> None:
+        self.day = day
+        self.capacity = capacity
+        self.total = 0
+        self.event_counts: Dict[str, int] = {}
+        self.products = SpaceSaving(capacity)
+        self.searches = SpaceSaving(capacity)
+        self.product_names: Dict[str, str] = {}
+        self.consumers = HyperLogLog()
+        self.sessions = HyperLogLog()
+
+    def observe(self, row: dict) -> None:
+        event_type = row["event_type"]
+        self.total += 1
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+        if event_type == "product_view" and row.get("product_id") is not None:
+            key = str(row["product_id"])
+            self.products.add(key)
+            if row.get("product_name"):
+                self.product_names[key] = row["product_name"]
+        elif event_type == "search" and row.get("search_query"):
+            self.searches.add(row["search_query"])
+        if row.get("consumer_id") is not None:
+            self.consumers.add(row["consumer_id"])
+        if row.get("session_id"):
+            self.sessions.add(row["session_id"])
+
+    def merge(self, other: "DaySketches") -> "DaySketches":
+        self.total += other.total
+        for event_type, count in other.event_counts.items():
+            self.event_counts[event_type] = self.event_counts.get(event_type, 0) + count
+        self.products.merge(other.products)
+        self.searches.merge(other.searches)
+        self.product_names.update(other.product_names)
+        self.consumers.merge(other.consumers)
+        self.sessions.merge(other.sessions)
+        return self
+
+    def to_row(self, worker_id: str) -> dict:
+        tracked = self.products.counts
+        return {
+            "day": self.day,
+            "worker_id": worker_id,
+            "total_events": self.total,
+            "event_counts": self.event_counts,
+            "top_products": self.products.to_dict(),
+            "top_searches": self.searches.to_dict(),
+            "product_names": {key: name for key, name in self.product_names.items() if key in tracked},
+            "consumer_sketch": self.consumers.to_bytes(),
+            "session_sketch": self.sessions.to_bytes(),
+        }
+
+    @classmethod
+    def from_row(cls, row: ConsumerEventSketch, capacity: int = 200) -> "DaySketches":
+        sketches = cls(row.day, capacity)
+        sketches.total = row.total_events
+        sketches.event_counts = dict(row.event_counts or {})
+        if row.top_products:
+            sketches.products = SpaceSaving.from_dict(row.top_products)
+        if row.top_searches:
+            sketches.searches = SpaceSaving.from_dict(row.top_searches)
+        sketches.product_names = dict(row.product_names or {})
+        if row.consumer_sketch:
+            sketches.consumers = HyperLogLog.from_bytes(row.consumer_sketch)
+        if row.session_sketch:
+            sketches.sessions = HyperLogLog.from_bytes(row.session_sketch)
+        return sketches
+
+
+class LiveAnalytics:
+    """This worker's sketches for today plus periodic persistence."""
+
+    def __init__(self, capacity: int = 200, flush_interval: float = 30.0) -> None:
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"[:100]
+        self.current = DaySketches(date.today(), capacity)
+        self._previous: Optional[DaySketches] = None
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def observe(self, rows: Iterable[dict]) -> None:
+        """Feed accepted event rows (same dicts as the write-behind buffer)."""
+        today = date.today()
+        if today != self.current.day:
+            # Day rollover: the previous day's sketches are persisted by the flusher
+            self._previous = self.current
+            self.current = DaySketches(today, self.capacity)
+        for row in rows:
+            self.current.observe(row)
+        self._dirty = True
+
+    async def _write(self, sketches: DaySketches) -> None:
+        from app.core.database import engine
+
+        table = ConsumerEventSketch.__table__
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(table).where(table.c.day == sketches.day, table.c.worker_id == self.worker_id)
+            )
+            await conn.execute(table.insert(), [sketches.to_row(self.worker_id)])
+
+    async def flush(self) -> None:
+        previous = self._previous
+        try:
+            if previous is not None:
+                await self._write(previous)
+                self._previous = None
+                await self._expire(previous.day)
+            if self._dirty:
+                self._dirty = False
+                await self._write(self.current)
+        except Exception as e:
+            self._dirty = True
+            logger.error(f"Persisting live analytics sketches failed: {e}")
+
+    async def _expire(self, today: date) -> None:
+        from app.core.database import engine
+
+        table = ConsumerEventSketch.__table__
+        async with engine.begin() as conn:
+            await conn.execute(delete(table).where(table.c.day < today - timedelta(days=RETENTION_DAYS)))
+
+    async def snapshot(self, db) -> DaySketches:
+        """Today's sketches merged across all workers (this one from memory)."""
+        day = date.today()
+        merged = DaySketches(day, self.capacity)
+        result = await db.execute(
+            select(ConsumerEventSketch).where(
+                ConsumerEventSketch.day == day,
+                ConsumerEventSketch.worker_id != self.worker_id,
+            )
+        )
+        for row in result.scalars():
+            merged.merge(DaySketches.from_row(row, self.capacity))
+        if self.current.day == day:
+            merged.merge(self.current)
+        return merged
+
+    async def _restore(self) -> None:
+        """Merge back this worker's persisted row (same host:pid after a container restart)."""
+        from app.core.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            row = await db.get(ConsumerEventSketch, (self.current.day, self.worker_id))
+            if row is not None:
+                self.current.merge(DaySketches.from_row(row, self.capacity))
+
+    async def _run(self) -> None:
+        try:
+            await self._restore()
+        except Exception as e:
+            logger.warning(f"Restoring live analytics sketches failed: {e}")
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="flush:live_analytics")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+def _build() -> LiveAnalytics:
+    from app.core.config import settings
+
+    return LiveAnalytics(
+        capacity=settings.LIVE_ANALYTICS_CAPACITY,
+        flush_interval=settings.LIVE_ANALYTICS_FLUSH_INTERVAL,
+    )
+
+
+live_analytics = _build()
@@ -0,0 +1,258 @@
+"""
+Pooled, batched SMTP delivery.
+
+``EmailNotificationService`` used to open a connection, STARTTLS and log in
+for every message, synchronously. ``mail_queue.send(message)`` instead only
+queues the message and returns; a background task collects whatever arrives
+within ``EMAIL_BATCH_WINDOW`` seconds (up to ``EMAIL_BATCH_SIZE``) and sends
+the batch over one pooled session on a worker thread, off the event loop.
+
+``SMTPPool`` keeps up to ``EMAIL_SMTP_POOL_SIZE`` authenticated connections.
+Connections idle for longer than ``EMAIL_SMTP_MAX_IDLE`` seconds are closed
+rather than reused (servers drop idle sessions), and a send that fails
+because the server hung up reconnects once and retries the message.
+
+``send`` may be called from the event loop or from a worker thread (sync
+background tasks). Before the queue is started (scripts, the REPL) it
+delivers synchronously through the pool.
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+import logging
+import smtplib
+import threading
+import time
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.event_buffer import register_buffer
+
+logger = logging.getLogger(__name__)
+
+# The connection is gone; reconnecting may help
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class SMTPPool:
+    """Thread-safe pool of authenticated SMTP connections."""
+
+    def __init__(self, size: Optional[int] = None, max_idle: Optional[float] = None) -> None:
+        self.size = size or settings.EMAIL_SMTP_POOL_SIZE
+        self.max_idle = settings.EMAIL_SMTP_MAX_IDLE if max_idle is None else max_idle
+        self._idle: Deque[Tuple[smtplib.SMTP, float]] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self.connects = 0
+        self.reconnects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(settings.EMAIL_SMTP_HOST, settings.EMAIL_SMTP_PORT, timeout=settings.EMAIL_SMTP_TIMEOUT)
+        try:
+            if settings.EMAIL_USE_TLS:
+                smtp.starttls()
+            if settings.EMAIL_SMTP_USER and settings.EMAIL_SMTP_PASSWORD:
+                smtp.login(settings.EMAIL_SMTP_USER, settings.EMAIL_SMTP_PASSWORD)
+        except Exception:
+            self._close(smtp)
+            raise
+        self.connects += 1
+        return smtp
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def _checkout(self) -> smtplib.SMTP:
+        stale = []
+        smtp = None
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if time.monotonic() - last_used < self.max_idle:
+                    smtp = candidate
+                    break
+                stale.append(candidate)
+        for candidate in stale:
+            self._close(candidate)
+        return smtp or self._connect()
+
+    def _checkin(self, smtp: smtplib.SMTP) -> None:
+        with self._lock:
+            self._idle.append((smtp, time.monotonic()))
+
+    def send_batch(self, messages: List[EmailMessage]) -> int:
+        """
+        Send ``messages`` over one session. Returns how many were accepted;
+        failures are logged, not raised.
+        """
+        sent = 0
+        with self._slots:
+            smtp = None
+            try:
+                smtp = self._checkout()
+                for message in messages:
+                    try:
+                        smtp.send_message(message)
+                    except _CONNECTION_ERRORS:
+                        # Server closed the session (idle timeout, restart): reconnect once
+                        self._close(smtp)
+                        smtp = None
+                        smtp = self._connect()
+                        self.reconnects += 1
+                        smtp.send_message(message)
+                    except smtplib.SMTPException as exc:
+                        # Rejected by the server (recipient, size, ...): skip this message only
+                        logger.error(f"Email {message['Subject']!r} rejected: {exc}")
+                        smtp.rset()
+                        continue
+                    sent += 1
+            except Exception as exc:
+                logger.error(f"Email delivery failed after {sent}/{len(messages)} messages: {exc}")
+                if smtp is not None:
+                    self._close(smtp)
+                return sent
+            self._checkin(smtp)
+        return sent
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for smtp, _ in idle:
+            self._close(smtp)
+
+
+class MailQueue:
+    """Collects messages and hands them to the pool in batches."""
+
+    def __init__(
+        self,
+        pool: Optional[SMTPPool] = None,
+        window: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        capacity: Optional[int] = None,
+    ) -> None:
+        self.pool = pool or SMTPPool()
+        self.window = settings.EMAIL_BATCH_WINDOW if window is None else window
+        self.batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+        self.capacity = capacity or settings.EMAIL_QUEUE_CAPACITY
+        self._messages: Deque[EmailMessage] = deque()
+        self._wake = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._deliveries: Set[asyncio.Task] = set()
+        self.queued = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def send(self, message: EmailMessage) -> None:
+        """Queue ``message`` for delivery; never blocks on the network while running."""
+        loop = self._loop
+        if loop is None or not self.running:
+            delivered = self.pool.send_batch([message])
+            self.sent += delivered
+            self.failed += 1 - delivered
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            self._offer(message)
+        else:
+            loop.call_soon_threadsafe(self._offer, message)
+
+    def _offer(self, message: EmailMessage) -> None:
+        if len(self._messages) >= self.capacity:
+            self._messages.popleft()
+            self.dropped += 1
+        self._messages.append(message)
+        self.queued += 1
+        self._wake.set()
+
+    async def _deliver(self, batch: List[EmailMessage]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+            delivered = await loop.run_in_executor(self._executor, self.pool.send_batch, batch)
+            self.sent += delivered
+            self.failed += len(batch) - delivered
+            self.batches += 1
+        finally:
+            self._slots.release()
+
+    async def _dispatch(self) -> None:
+        while self._messages:
+            batch = [self._messages.popleft() for _ in range(min(self.batch_size, len(self._messages)))]
+            await self._slots.acquire()
+            task = asyncio.create_task(self._deliver(batch))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            # Let messages queued within the window share the session
+            if len(self._messages) < self.batch_size and self.window > 0:
+                await asyncio.sleep(self.window)
+            self._wake.clear()
+            await self._dispatch()
+
+    def start(self) -> None:
+        if not self.running:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.pool.size)
+            self._executor = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="smtp")
+            self._task = asyncio.create_task(self._run(), name="mail-queue")
+
+    async def drain(self) -> None:
+        """Send everything queued so far and wait for it."""
+        if self._slots is not None:
+            await self._dispatch()
+        if self._deliveries:
+            await asyncio.gather(*list(self._deliveries))
+
+    async def stop(self) -> None:
+        """Stop the background sender after delivering what is queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.drain()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._loop = None
+        self.pool.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queued,
+            "pending": len(self._messages),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "connects": self.pool.connects,
+            "reconnects": self.pool.reconnects,
+        }
+
+
+mail_queue = register_buffer(MailQueue())
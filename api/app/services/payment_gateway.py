@@ -0,0 +1,347 @@
+"""
+Async Stripe payment gateway.
+
+The Stripe SDK is synchronous; calling it from ``async def`` handlers blocks
+the event loop for a full HTTPS round trip. ``StripeGateway`` runs every SDK
+call on a dedicated, bounded thread pool (``STRIPE_MAX_WORKERS``). The SDK's
+requests client keeps one ``requests.Session`` per thread, so each worker
+reuses its keep-alive connection to api.stripe.com.
+
+Process-local caches (``TTLCache``):
+
+- customer validity: a customer id already confirmed to exist is not
+  re-retrieved on every checkout (``STRIPE_CUSTOMER_CACHE_TTL``),
+- saved cards per customer (``STRIPE_CARD_CACHE_TTL``), dropped when a card
+  is detached and when a checkout saves a card (``invalidate_cards``).
+
+Mutating calls carry idempotency keys, so a retried request does not create
+a second customer, payment intent or refund. Stripe also replays failures
+for a key, so refund keys are scoped to one refund attempt of an order
+(``ConsumerOrder.failed_refunds``) rather than to the payment intent.
+
+``STRIPE_GATEWAY=stub`` selects ``StubGateway``, an in-memory fake with the
+same interface for tests and local development without Stripe credentials.
+
+Failures surface as ``PaymentError`` (or a subclass), never as SDK
+exceptions, so routers do not need the SDK to handle them.
+"""
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.stripe_client import stripe
+from app.services.event_buffer import register_buffer
+
+
+class PaymentError(Exception):
+    """A payment provider call failed."""
+
+
+class InvalidRequestError(PaymentError):
+    """Unknown object or invalid parameters."""
+
+
+class CardOwnershipError(PaymentError):
+    """The payment method belongs to another customer."""
+
+
+class PaymentGateway(ABC):
+    """
+    Caching and idempotency on top of provider primitives.
+
+    Subclasses implement the blocking ``_``-prefixed primitives and
+    ``_call``, which runs one of them without blocking the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._customers = TTLCache(maxsize=10_000, ttl=settings.STRIPE_CUSTOMER_CACHE_TTL)
+        self._cards = TTLCache(maxsize=10_000, ttl=settings.STRIPE_CARD_CACHE_TTL)
+
+    @abstractmethod
+    async def _call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run the blocking primitive ``fn`` without blocking the event loop."""
+
+    # Lifespan hooks (registered with the buffer registry)
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def ensure_customer(
+        self,
+        customer_id: Optional[str],
+        *,
+        consumer_id: int,
+        name: Optional[str] = None,
+        phone: Optional[str] = None,
+        line_user_id: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """
+        A valid customer id for the consumer: ``customer_id`` if it still
+        exists, else a newly created customer. Returns ``(id, created)``.
+        """
+        if customer_id:
+            if customer_id in self._customers:
+                return customer_id, False
+            if await self._call(self._customer_exists, customer_id):
+                self._customers.set(customer_id, True)
+                return customer_id, False
+
+        created = await self._call(
+            self._create_customer,
+            metadata={"consumer_id": str(consumer_id), "line_user_id": line_user_id},
+            name=name,
+            phone=phone,
+            # Scoped to the id being replaced so a later re-creation is not deduplicated
+            idempotency_key=f"customer-{consumer_id}-{customer_id or 'new'}",
+        )
+        self._customers.set(created, True)
+        return created, True
+
+    async def list_cards(self, customer_id: str) -> List[Dict[str, Any]]:
+        """Saved cards as ``{id, brand, last4, exp_month, exp_year}`` dicts."""
+        cards = self._cards.get(customer_id)
+        if cards is None:
+            cards = await self._call(self._list_cards, customer_id)
+            self._cards.set(customer_id, cards)
+        return list(cards)
+
+    async def detach_card(self, customer_id: str, payment_method_id: str) -> None:
+        owner = await self._call(self._payment_method_customer, payment_method_id)
+        if owner != customer_id:
+            raise CardOwnershipError(payment_method_id)
+        try:
+            await self._call(self._detach_payment_method, payment_method_id)
+        finally:
+            self.invalidate_cards(customer_id)
+
+    async def create_payment_intent(self, params: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, str]:
+        """Create a PaymentIntent; returns ``{id, client_secret}``."""
+        intent = await self._call(self._create_payment_intent, params, idempotency_key)
+        if params.get("setup_future_usage") and params.get("customer"):
+            # The card is attached to the customer once the payment succeeds
+            self.invalidate_cards(params["customer"])
+        return intent
+
+    async def refund(self, payment_intent_id: str, *, order_id: int, attempt: int) -> str:
+        """
+        Refund a PaymentIntent in full; returns the refund id.
+
+        ``attempt`` counts the order's failed refunds: a retry of the same
+        attempt returns the same refund, while a new attempt after a failure
+        gets a new key instead of the replayed error.
+        """
+        return await self._call(self._refund, payment_intent_id, f"refund-{order_id}-{attempt}")
+
+    def invalidate_cards(self, customer_id: Optional[str]) -> None:
+        if customer_id:
+            self._cards.pop(customer_id)
+
+    def invalidate_customer(self, customer_id: Optional[str]) -> None:
+        if customer_id:
+            self._customers.pop(customer_id)
+            self._cards.pop(customer_id)
+
+    # Blocking primitives
+    @abstractmethod
+    def _customer_exists(self, customer_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def _create_customer(self, *, metadata: dict, name, phone, idempotency_key: str) -> str:
+        ...
+
+    @abstractmethod
+    def _list_cards(self, customer_id: str) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _payment_method_customer(self, payment_method_id: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def _detach_payment_method(self, payment_method_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def _create_payment_intent(self, params: Dict[str, Any], idempotency_key: Optional[str]) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    def _refund(self, payment_intent_id: str, idempotency_key: str) -> str:
+        ...
+
+
+class StripeGateway(PaymentGateway):
+    """Stripe SDK calls on a bounded thread pool."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.STRIPE_MAX_WORKERS, thread_name_prefix="stripe"
+            )
+        return self._executor
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _call(self, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), lambda: self._translate(fn, *args, **kwargs))
+
+    @staticmethod
+    def _translate(fn: Callable, *args, **kwargs) -> Any:
+        try:
+            return fn(*args, **kwargs)
+        except stripe.error.InvalidRequestError as e:
+            raise InvalidRequestError(str(e)) from e
+        except stripe.error.StripeError as e:
+            raise PaymentError(str(e)) from e
+
+    def _customer_exists(self, customer_id: str) -> bool:
+        try:
+            customer = stripe.Customer.retrieve(customer_id)
+        except stripe.error.InvalidRequestError:
+            return False
+        return not getattr(customer, "deleted", False)
+
+    def _create_customer(self, *, metadata: dict, name, phone, idempotency_key: str) -> str:
+        return stripe.Customer.create(
+            metadata=metadata, name=name, phone=phone, idempotency_key=idempotency_key
+        ).id
+
+    def _list_cards(self, customer_id: str) -> List[Dict[str, Any]]:
+        payment_methods = stripe.PaymentMethod.list(customer=customer_id, type="card")
+        return [
+            {
+                "id": pm.id,
+                "brand": pm.card.brand,
+                "last4": pm.card.last4,
+                "exp_month": pm.card.exp_month,
+                "exp_year": pm.card.exp_year,
+            }
+            for pm in payment_methods.data
+        ]
+
+    def _payment_method_customer(self, payment_method_id: str) -> Optional[str]:
+        return stripe.PaymentMethod.retrieve(payment_method_id).customer
+
+    def _detach_payment_method(self, payment_method_id: str) -> None:
+        stripe.PaymentMethod.detach(payment_method_id)
+
+    def _create_payment_intent(self, params: Dict[str, Any], idempotency_key: Optional[str]) -> Dict[str, str]:
+        if idempotency_key:
+            params = {**params, "idempotency_key": idempotency_key}
+        intent = stripe.PaymentIntent.create(**params)
+        return {"id": intent.id, "client_secret": intent.client_secret}
+
+    def _refund(self, payment_intent_id: str, idempotency_key: str) -> str:
+        return stripe.Refund.create(payment_intent=payment_intent_id, idempotency_key=idempotency_key).id
+
+
+class StubGateway(PaymentGateway):
+    """
+    In-memory stand-in for Stripe.
+
+    Customers, cards, intents and refunds live in dicts; idempotency keys
+    return the first result, like Stripe. ``add_card`` seeds saved cards and
+    ``calls`` counts primitive calls (to check caching).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._ids = itertools.count(1)
+        self.customers: Dict[str, Dict[str, Any]] = {}
+        self.cards: Dict[str, Dict[str, Any]] = {}  # payment_method_id -> card + "customer"
+        self.intents: Dict[str, Dict[str, Any]] = {}
+        self.refunds: Dict[str, str] = {}  # refund_id -> payment_intent_id
+        self._idempotent: Dict[str, Any] = {}
+        self.calls: Dict[str, int] = {}
+
+    async def _call(self, fn: Callable, *args, **kwargs) -> Any:
+        self.calls[fn.__name__] = self.calls.get(fn.__name__, 0) + 1
+        return fn(*args, **kwargs)
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}_stub_{next(self._ids)}"
+
+    def _once(self, key: Optional[str], create: Callable[[], Any]) -> Any:
+        if key is None:
+            return create()
+        if key not in self._idempotent:
+            self._idempotent[key] = create()
+        return self._idempotent[key]
+
+    def add_card(self, customer_id: str, brand: str = "visa", last4: str = "4242") -> str:
+        payment_method_id = self._new_id("pm")
+        self.cards[payment_method_id] = {
+            "id": payment_method_id,
+            "brand": brand,
+            "last4": last4,
+            "exp_month": 12,
+            "exp_year": 2030,
+            "customer": customer_id,
+        }
+        return payment_method_id
+
+    def _customer_exists(self, customer_id: str) -> bool:
+        return customer_id in self.customers
+
+    def _create_customer(self, *, metadata: dict, name, phone, idempotency_key: str) -> str:
+        def create() -> str:
+            customer_id = self._new_id("cus")
+            self.customers[customer_id] = {"metadata": metadata, "name": name, "phone": phone}
+            return customer_id
+
+        return self._once(idempotency_key, create)
+
+    def _list_cards(self, customer_id: str) -> List[Dict[str, Any]]:
+        return [
+            {k: v for k, v in card.items() if k != "customer"}
+            for card in self.cards.values()
+            if card["customer"] == customer_id
+        ]
+
+    def _payment_method_customer(self, payment_method_id: str) -> Optional[str]:
+        if payment_method_id not in self.cards:
+            raise InvalidRequestError(f"No such PaymentMethod: '{payment_method_id}'")
+        return self.cards[payment_method_id]["customer"]
+
+    def _detach_payment_method(self, payment_method_id: str) -> None:
+        self.cards[payment_method_id]["customer"] = None
+
+    def _create_payment_intent(self, params: Dict[str, Any], idempotency_key: Optional[str]) -> Dict[str, str]:
+        def create() -> Dict[str, str]:
+            intent_id = self._new_id("pi")
+            self.intents[intent_id] = dict(params)
+            return {"id": intent_id, "client_secret": f"{intent_id}_secret"}
+
+        return self._once(idempotency_key, create)
+
+    def _refund(self, payment_intent_id: str, idempotency_key: str) -> str:
+        def create() -> str:
+            refund_id = self._new_id("re")
+            self.refunds[refund_id] = payment_intent_id
+            return refund_id
+
+        return self._once(idempotency_key, create)
+
+
+def _create_gateway() -> PaymentGateway:
+    if settings.STRIPE_GATEWAY == "stub":
+        return StubGateway()
+    return StripeGateway()
+
+
+payment_gateway = register_buffer(_create_gateway())
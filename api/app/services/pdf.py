@@ -0,0 +1,125 @@
+"""
+HTML → PDF rendering facade.
+
+Jinja2 and WeasyPrint are imported on first render rather than when a
+router imports ``app.services.invoice``, keeping them off the app's import
+path.
+
+Per-process state is reused across renders:
+
+- one ``FontConfiguration`` (fontconfig lookup of the Japanese fonts and
+  their ``@font-face`` rules),
+- each template's stylesheet (``templates/<name>.css``) parsed once into a
+  ``CSS`` object,
+- compiled Jinja templates (``get_template_env`` caches them).
+
+``warm_up()`` loads all of it and renders one throwaway page so the first
+real request does not pay for it. ``warm_up_renderers()`` runs it (and the
+ReportLab font registration when ``PDF_RENDERER=reportlab``) in a
+background thread after startup when ``PDF_WARMUP_ON_STARTUP`` is set.
+"""
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
+# Templates rendered through WeasyPrint (``<name>.html`` + ``<name>.css``)
+PDF_TEMPLATES = ("invoice", "invoice_monthly", "payment_notice")
+
+# FontConfiguration / CSS objects are shared; serialize the layout pass that uses them
+_render_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_template_env():
+    """Shared Jinja2 environment for the PDF templates."""
+    from jinja2 import Environment, FileSystemLoader
+
+    return Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=False)
+
+
+@lru_cache(maxsize=1)
+def get_font_config():
+    """Process-wide WeasyPrint font configuration."""
+    from weasyprint.text.fonts import FontConfiguration
+
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=None)
+def get_stylesheet(name: str):
+    """Pre-parsed ``templates/<name>.css``."""
+    from weasyprint import CSS
+
+    return CSS(filename=os.path.join(TEMPLATE_DIR, f"{name}.css"), font_config=get_font_config())
+
+
+def html_to_pdf(html_content: str, stylesheet: Optional[str] = None) -> bytes:
+    from weasyprint import HTML
+
+    stylesheets = [get_stylesheet(stylesheet)] if stylesheet else None
+    with _render_lock:
+        return HTML(string=html_content).write_pdf(stylesheets=stylesheets, font_config=get_font_config())
+
+
+def render_pdf(name: str, context: dict) -> bytes:
+    """Render ``templates/<name>.html`` with its stylesheet."""
+    html_content = get_template_env().get_template(f"{name}.html").render(context)
+    return html_to_pdf(html_content, stylesheet=name)
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Load fonts, stylesheets and templates and render one page.
+
+    Returns seconds spent per step.
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    get_font_config()
+    timings["fonts"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for name in PDF_TEMPLATES:
+        get_stylesheet(name)
+    timings["stylesheets"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    env = get_template_env()
+    for name in PDF_TEMPLATES:
+        env.get_template(f"{name}.html")
+    timings["templates"] = time.perf_counter() - started
+
+    # Glyph lookup / shaping for Japanese text happens on first layout
+    started = time.perf_counter()
+    html_to_pdf("<p>請求書 納品書 ¥0</p>", stylesheet=PDF_TEMPLATES[0])
+    timings["render"] = time.perf_counter() - started
+    return timings
+
+
+def warm_up_renderers() -> None:
+    """Warm up the configured PDF renderers, logging (not raising) failures."""
+    try:
+        timings = warm_up()
+        logger.info(
+            "PDF warm-up: "
+            + " ".join(f"{step}={seconds * 1000:.0f}ms" for step, seconds in timings.items())
+        )
+    except (ImportError, OSError) as e:
+        # WeasyPrint needs Pango/Cairo system libraries
+        logger.warning(f"PDF warm-up skipped for WeasyPrint: {e}")
+
+    if settings.PDF_RENDERER == "reportlab":
+        try:
+            from app.services.pdf_reportlab import warm_up as warm_up_reportlab
+
+            warm_up_reportlab()
+        except ImportError as e:
+            logger.warning(f"PDF warm-up skipped for ReportLab: {e}")
@@ -0,0 +1,238 @@
+"""
+Direct-drawing invoice / delivery slip renderer (ReportLab).
+
+Renders the same context as ``templates/invoice.html`` without an HTML/CSS
+layout pass, which is where WeasyPrint spends most of its time for these
+simple tabular documents. Selected with ``PDF_RENDERER=reportlab``; see
+``app.services.invoice``.
+
+Fonts: ``PDF_FONT_PATH`` if set, else the first installed Japanese Gothic
+font (the Docker image ships IPA Gothic), else ReportLab's built-in
+HeiseiKakuGo CID font (not embedded; viewers substitute a system font).
+
+ReportLab is imported on first render, like WeasyPrint in ``app.services.pdf``.
+"""
+import io
+import os
+from functools import lru_cache
+
+FONT_NAME = "InvoiceGothic"
+CID_FONT = "HeiseiKakuGo-W5"
+FONT_CANDIDATES = (
+    "/usr/share/fonts/opentype/ipaexfont-gothic/ipaexg.ttf",
+    "/usr/share/fonts/opentype/ipafont-gothic/ipag.ttf",
+    "/usr/share/fonts/truetype/fonts-japanese-gothic.ttf",
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+)
+
+# Colours from invoice.html
+TEXT = "#333333"
+GRID = "#888888"
+HEADER_BG = "#f0f0f0"
+BANK_BORDER = "#cccccc"
+
+
+@lru_cache(maxsize=1)
+def _font() -> str:
+    """Register the document font once per process and return its name."""
+    from reportlab.pdfbase import pdfmetrics
+    from app.core.config import settings
+
+    candidates = [settings.PDF_FONT_PATH] if settings.PDF_FONT_PATH else []
+    for path in candidates + list(FONT_CANDIDATES):
+        if path and os.path.exists(path):
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            pdfmetrics.registerFont(TTFont(FONT_NAME, path))
+            return FONT_NAME
+
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+
+    pdfmetrics.registerFont(UnicodeCIDFont(CID_FONT))
+    return CID_FONT
+
+
+@lru_cache(maxsize=1)
+def _styles() -> dict:
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+    from reportlab.lib.styles import ParagraphStyle
+
+    font = _font()
+    base = ParagraphStyle("base", fontName=font, fontSize=10, leading=14, textColor=colors.HexColor(TEXT))
+    return {
+        "base": base,
+        "title": ParagraphStyle("title", base, fontSize=20, leading=26, alignment=TA_CENTER),
+        "right": ParagraphStyle("right", base, alignment=TA_RIGHT),
+        "client": ParagraphStyle("client", base, fontSize=16, leading=20, alignment=TA_LEFT),
+        "sender": ParagraphStyle("sender", base, fontSize=9, leading=12.6, alignment=TA_RIGHT),
+        "sender_name": ParagraphStyle("sender_name", base, fontSize=12, leading=17, alignment=TA_RIGHT),
+        "summary": ParagraphStyle("summary", base, alignment=TA_CENTER, leading=24),
+        "cell": ParagraphStyle("cell", base, fontSize=9, leading=12),
+        "remarks": ParagraphStyle("remarks", base, fontSize=8, leading=11),
+    }
+
+
+def warm_up() -> None:
+    """Import platypus, register the font and build the styles ahead of the first render."""
+    import reportlab.platypus  # noqa: F401
+
+    _styles()
+
+
+def _yen(value) -> str:
+    return f"¥ {int(value):,}"
+
+
+def render_invoice(context: dict) -> bytes:
+    """Render an invoice / delivery slip from the ``invoice.html`` context."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    from xml.sax.saxutils import escape
+
+    font = _font()
+    styles = _styles()
+    grid = colors.HexColor(GRID)
+    header_bg = colors.HexColor(HEADER_BG)
+    width = A4[0] - 40 * mm
+
+    story = [
+        Paragraph(escape(context["title"]), styles["title"]),
+        HRFlowable(width="100%", thickness=2, color=colors.HexColor(TEXT), spaceBefore=2, spaceAfter=14),
+        Paragraph(f"日付: {escape(context['invoice_date'])}<br/>No. {escape(context['invoice_number'])}", styles["right"]),
+        Spacer(1, 16),
+    ]
+
+    client = [
+        Paragraph(escape(context["client_name"]), styles["client"]),
+        HRFlowable(width="80%", thickness=1, color=colors.HexColor(TEXT), hAlign="LEFT", spaceAfter=8),
+        Paragraph(f"件名: {escape(context['subject'])}", styles["base"]),
+    ]
+    sender_lines = [
+        f"〒{context['sender_zip']}",
+        context["sender_address"],
+        context["sender_building"],
+        f"TEL: {context['sender_tel']}",
+        f"担当: {context['sender_pic']}",
+    ]
+    if context.get("sender_reg_num"):
+        sender_lines.append(f"登録番号: {context['sender_reg_num']}")
+    sender = [
+        Paragraph(escape(context["sender_name"]), styles["sender_name"]),
+        Paragraph("<br/>".join(escape(line) for line in sender_lines), styles["sender"]),
+    ]
+    header = Table([[client, sender]], colWidths=[width * 0.5, width * 0.5])
+    header.setStyle(TableStyle([
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+    ]))
+    story += [header, Spacer(1, 40)]
+
+    summary = Table(
+        [[Paragraph(
+            f"ご請求金額 &nbsp;&nbsp;&nbsp; <font size=18>{_yen(context['total_amount_incl_tax'])} -</font> (税込)",
+            styles["summary"],
+        )]],
+        colWidths=[width],
+    )
+    summary.setStyle(TableStyle([
+        ("BOX", (0, 0), (-1, -1), 2, colors.HexColor(TEXT)),
+        ("TOPPADDING", (0, 0), (-1, -1), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+    ]))
+    story += [summary, Spacer(1, 14)]
+
+    if context.get("bank_name"):
+        bank_text = " ".join(
+            escape(context[key]) for key in ("bank_name", "bank_branch", "bank_type", "bank_number")
+        )
+        bank = Table(
+            [[Paragraph(f"お振込先:<br/>{bank_text}<br/>お支払期限: {escape(context['due_date'])}", styles["base"])]],
+            colWidths=[width * 0.6],
+            hAlign="LEFT",
+        )
+        bank.setStyle(TableStyle([
+            ("BOX", (0, 0), (-1, -1), 1, colors.HexColor(BANK_BORDER)),
+            ("TOPPADDING", (0, 0), (-1, -1), 8),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+        ]))
+        story += [bank, Spacer(1, 14)]
+
+    cell = styles["cell"]
+    rows = [["品名", "数量", "単位", "単価", "金額", "税率"]]
+    for item in context["items"]:
+        rows.append([
+            Paragraph(escape(str(item["name"])), cell),
+            str(item["quantity"]),
+            item["unit"],
+            _yen(item["unit_price"]),
+            _yen(item["amount"]),
+            f"{item['tax_rate']}%",
+        ])
+    body_end = len(rows) - 1
+    rows += [
+        ["小計 (税抜)", "", "", "", _yen(context["subtotal"]), ""],
+        ["消費税等", "", "", "", _yen(context["tax_amount"]), ""],
+        ["合計", "", "", "", _yen(context["total_amount_incl_tax"]), ""],
+    ]
+    col_widths = [width - 100 * mm, 18 * mm, 16 * mm, 24 * mm, 26 * mm, 16 * mm]
+    items = Table(rows, colWidths=col_widths, repeatRows=1)
+    items.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), font),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor(TEXT)),
+        ("GRID", (0, 0), (-1, -1), 1, grid),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("BACKGROUND", (0, 0), (-1, 0), header_bg),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("ALIGN", (1, 1), (1, -1), "RIGHT"),
+        ("ALIGN", (2, 1), (2, -1), "CENTER"),
+        ("ALIGN", (3, 1), (4, -1), "RIGHT"),
+        ("ALIGN", (5, 1), (5, -1), "CENTER"),
+        ("SPAN", (0, body_end + 1), (3, body_end + 1)),
+        ("SPAN", (0, body_end + 2), (3, body_end + 2)),
+        ("SPAN", (0, body_end + 3), (3, body_end + 3)),
+        ("BACKGROUND", (0, body_end + 1), (3, -1), header_bg),
+        ("ALIGN", (0, body_end + 1), (3, -1), "RIGHT"),
+    ]))
+    story += [Spacer(1, 6), items, Spacer(1, 20)]
+
+    breakdown = Table(
+        [
+            ["消費税内訳", ""],
+            ["10%対象", f"{_yen(context['total_10_percent_subtotal'])} (税 {_yen(context['total_10_percent_tax'])})"],
+            ["8%対象", f"{_yen(context['total_8_percent_subtotal'])} (税 {_yen(context['total_8_percent_tax'])})"],
+        ],
+        colWidths=[width * 0.2, width * 0.3],
+        hAlign="RIGHT",
+    )
+    breakdown.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), font),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor(TEXT)),
+        ("GRID", (0, 0), (-1, -1), 1, grid),
+        ("SPAN", (0, 0), (1, 0)),
+        ("BACKGROUND", (0, 0), (0, -1), header_bg),
+        ("ALIGN", (0, 0), (0, -1), "CENTER"),
+        ("ALIGN", (1, 1), (1, -1), "RIGHT"),
+    ]))
+    story.append(breakdown)
+
+    if context.get("remarks"):
+        story += [Spacer(1, 20), Paragraph(escape(context["remarks"]), styles["remarks"])]
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=20 * mm,
+        rightMargin=20 * mm,
+        topMargin=20 * mm,
+        bottomMargin=20 * mm,
+        title=context["title"],
+    )
+    doc.build(story)
+    return buffer.getvalue()
@@ -0,0 +1,154 @@
+"""
+Bulk repricing of retail products.
+
+Retail prices are derived from the source product's ``cost_price`` with
+the same formula as ``/retail-products/suggest-price``:
+
+    cost_price × set_quantity ÷ conversion_factor
+        ÷ (1 − waste_margin_pct / 100) ÷ multiplier, rounded up to ¥1
+
+``reprice_retail_products`` reads the five inputs of every retail product in
+scope with one query, computes new prices in one pass (Decimal arithmetic,
+so results match the single-product suggestion exactly) and, unless it is a
+dry run, writes the changed rows with one executemany UPDATE. The UPDATE
+also bumps ``updated_at`` on every repriced row, so anything validated
+against it (catalog listings) sees the change.
+"""
+from decimal import Decimal, ROUND_UP
+import time
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.utils import get_price_multiplier
+from app.models.product import Product
+from app.models.retail_product import RetailProduct
+
+ONE = Decimal("1")
+HUNDRED = Decimal("100")
+
+
+class PriceBreakdown(NamedTuple):
+    """Intermediate values of the retail price formula."""
+
+    cost_per_unit: Decimal
+    with_margin: Decimal
+    price: Decimal
+
+
+def retail_price_breakdown(
+    cost_price,
+    conversion_factor,
+    waste_margin_pct,
+    multiplier,
+    set_quantity=1,
+) -> Optional[PriceBreakdown]:
+    """Each step of the formula, or ``None`` when the factor, margin or multiplier is out of range."""
+    factor = Decimal(str(conversion_factor))
+    margin = Decimal(str(waste_margin_pct or 0))
+    multiplier = Decimal(str(multiplier))
+    if factor <= 0 or multiplier <= 0 or margin >= HUNDRED:
+        return None
+    cost_per_unit = Decimal(str(cost_price or 0)) * (set_quantity or 1) / factor
+    with_margin = cost_per_unit / (ONE - margin / HUNDRED)
+    return PriceBreakdown(cost_per_unit, with_margin, (with_margin / multiplier).quantize(ONE, rounding=ROUND_UP))
+
+
+def compute_retail_price(
+    cost_price,
+    conversion_factor,
+    waste_margin_pct,
+    multiplier,
+    set_quantity=1,
+) -> Optional[Decimal]:
+    """Suggested retail price (税抜, ¥1 rounded up), or ``None`` when it cannot be computed."""
+    if not cost_price:
+        return None
+    breakdown = retail_price_breakdown(cost_price, conversion_factor, waste_margin_pct, multiplier, set_quantity)
+    return breakdown.price if breakdown else None
+
+
+def _price_changes(rows: Iterable[Tuple], multiplier: Decimal) -> Tuple[List[dict], int]:
+    changes = []
+    skipped = 0
+    for rp_id, name, source_id, old_price, cost, factor, margin, set_quantity in rows:
+        new_price = compute_retail_price(cost, factor, margin, multiplier, set_quantity)
+        if new_price is None:
+            skipped += 1
+            continue
+        old_price = Decimal(old_price)
+        if new_price != old_price:
+            changes.append({
+                "id": rp_id,
+                "name": name,
+                "source_product_id": source_id,
+                "cost_price": cost,
+                "old_price": old_price,
+                "new_price": new_price,
+                "diff": new_price - old_price,
+            })
+    return changes, skipped
+
+
+async def reprice_retail_products(
+    db: AsyncSession,
+    multiplier: Optional[Decimal] = None,
+    source_product_ids: Optional[List[int]] = None,
+    retail_product_ids: Optional[List[int]] = None,
+    include_inactive: bool = True,
+    dry_run: bool = True,
+) -> dict:
+    """
+    Recompute ``retail_price`` for every non-deleted retail product in scope.
+
+    Returns the diff (``changes``) and counts; commits only when ``dry_run``
+    is false and something changed.
+    """
+    started = time.perf_counter()
+    multiplier = Decimal(str(multiplier)) if multiplier else get_price_multiplier()
+
+    query = (
+        select(
+            RetailProduct.id,
+            RetailProduct.name,
+            RetailProduct.source_product_id,
+            RetailProduct.retail_price,
+            Product.cost_price,
+            RetailProduct.conversion_factor,
+            RetailProduct.waste_margin_pct,
+            RetailProduct.set_quantity,
+        )
+        .join(Product, Product.id == RetailProduct.source_product_id)
+        .where(RetailProduct.deleted_at.is_(None))
+        .order_by(RetailProduct.id)
+    )
+    if source_product_ids is not None:
+        query = query.where(RetailProduct.source_product_id.in_(source_product_ids))
+    if retail_product_ids is not None:
+        query = query.where(RetailProduct.id.in_(retail_product_ids))
+    if not include_inactive:
+        query = query.where(RetailProduct.is_active == 1)
+
+    rows = (await db.execute(query)).all()
+    changes, skipped = _price_changes(rows, multiplier)
+
+    if changes and not dry_run:
+        table = RetailProduct.__table__
+        stmt = (
+            update(table)
+            .where(and_(table.c.id == bindparam("_id"), table.c.deleted_at.is_(None)))
+            .values(retail_price=bindparam("_price"))
+        )
+        await db.execute(stmt, [{"_id": c["id"], "_price": c["new_price"]} for c in changes])
+        await db.commit()
+
+    return {
+        "dry_run": dry_run,
+        "price_multiplier": multiplier,
+        "scanned": len(rows),
+        "changed": len(changes),
+        "skipped": skipped,
+        "changes": changes,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
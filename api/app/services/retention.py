@@ -0,0 +1,250 @@
+"""
+Retention and archival for the append-only log tables.
+
+Closed months older than ``LOG_RETENTION_MONTHS`` are exported to
+``ARCHIVE_DIR/<table>/<table>-YYYY-MM.csv.gz`` and then removed from the
+database:
+
+* consumer_events / access_logs are partitioned by month on PostgreSQL
+  (migration 20261019_1400); an archived month is dropped by dropping its
+  partition, which is instant and leaves no bloat.
+* guest_visits / guest_interactions are referenced by a foreign key, so they
+  stay plain tables and are purged by month bucket with range DELETEs.
+  Interactions are bucketed by their visit's month so a visit and its
+  interactions are always archived and purged together.
+
+On SQLite (local development) every table is purged by range DELETE.
+
+Run ``python -m app.services.retention status|partitions|archive`` from cron;
+``ensure_partitions()`` also runs at startup so upcoming months always have a
+partition ready.
+"""
+import argparse
+import asyncio
+import csv
+from datetime import date, datetime
+import gzip
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from sqlalchemy import Table, delete, func, select, text
+
+from app.models.analytics import AccessLog
+from app.models.consumer_event import ConsumerEvent
+from app.models.guest import GuestInteraction, GuestVisit
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("consumer_events", "access_logs")
+MONTHS_AHEAD = 3
+EXPORT_CHUNK = 5000
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+class MonthBucket:
+    """How one table is archived: which rows belong to a month and how to remove them."""
+
+    def __init__(self, table: Table, partitioned: bool = False, via_visit: bool = False) -> None:
+        self.table = table
+        self.name = table.name
+        self.partitioned = partitioned
+        self.via_visit = via_visit
+
+    def rows_in(self, month: date):
+        start = datetime.combine(month, datetime.min.time())
+        end = datetime.combine(add_months(month, 1), datetime.min.time())
+        if self.via_visit:
+            visits = GuestVisit.__table__
+            visit_ids = select(visits.c.id).where(visits.c.created_at >= start, visits.c.created_at < end)
+            return self.table.c.visit_id.in_(visit_ids)
+        return (self.table.c.created_at >= start) & (self.table.c.created_at < end)
+
+
+# Archive order matters: interactions before the visits they reference
+BUCKETS: List[MonthBucket] = [
+    MonthBucket(ConsumerEvent.__table__, partitioned=True),
+    MonthBucket(AccessLog.__table__, partitioned=True),
+    MonthBucket(GuestInteraction.__table__, via_visit=True),
+    MonthBucket(GuestVisit.__table__),
+]
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def archive_path(archive_dir: str, table: str, month: date) -> str:
+    return os.path.join(archive_dir, table, f"{table}-{month:%Y-%m}.csv.gz")
+
+
+async def ensure_partitions(months_ahead: int = MONTHS_AHEAD) -> List[str]:
+    """Create monthly partitions up to ``months_ahead`` (PostgreSQL only). Returns created names."""
+    from app.core.database import engine
+
+    created = []
+    async with engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            return created
+        for table in PARTITIONED_TABLES:
+            is_partitioned = await conn.scalar(
+                text("SELECT count(*) FROM pg_partitioned_table WHERE partrelid = to_regclass(:t)"),
+                {"t": table},
+            )
+            if not is_partitioned:
+                continue
+            month = month_start(date.today())
+            for _ in range(months_ahead + 1):
+                name = partition_name(table, month)
+                exists = await conn.scalar(text("SELECT to_regclass(:n) IS NOT NULL"), {"n": name})
+                if not exists:
+                    await conn.execute(text(
+                        f"CREATE TABLE {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                    ))
+                    created.append(name)
+                month = add_months(month, 1)
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+
+async def month_counts(bucket: MonthBucket, before: date) -> Dict[date, int]:
+    """Row counts per month for months starting before ``before``."""
+    from app.core.database import engine
+
+    async with engine.connect() as conn:
+        if bucket.via_visit:
+            visits = GuestVisit.__table__
+            source = bucket.table.join(visits, bucket.table.c.visit_id == visits.c.id)
+            created = visits.c.created_at
+        else:
+            source = bucket.table
+            created = bucket.table.c.created_at
+        oldest = await conn.scalar(select(func.min(created)).select_from(source))
+    counts: Dict[date, int] = {}
+    if oldest is None:
+        return counts
+    if isinstance(oldest, str):
+        oldest = datetime.fromisoformat(oldest)
+    month = month_start(oldest.date())
+    async with engine.connect() as conn:
+        while month < before:
+            count = await conn.scalar(
+                select(func.count()).select_from(bucket.table).where(bucket.rows_in(month))
+            )
+            if count:
+                counts[month] = count
+            month = add_months(month, 1)
+    return counts
+
+
+async def export_month(bucket: MonthBucket, month: date, archive_dir: str) -> int:
+    """Stream one month of rows into a gzip CSV (written atomically). Returns the row count."""
+    from app.core.database import engine
+
+    path = archive_path(archive_dir, bucket.name, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    columns = [c.name for c in bucket.table.columns]
+    written = 0
+    async with engine.connect() as conn:
+        result = await conn.stream(
+            select(bucket.table).where(bucket.rows_in(month)).order_by(bucket.table.c.id)
+        )
+        with gzip.open(tmp_path, "wt", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            async for chunk in result.partitions(EXPORT_CHUNK):
+                writer.writerows([_csv_value(v) for v in row] for row in chunk)
+                written += len(chunk)
+    os.replace(tmp_path, path)
+    return written
+
+
+async def purge_month(bucket: MonthBucket, month: date) -> None:
+    from app.core.database import engine
+
+    async with engine.begin() as conn:
+        if bucket.partitioned and conn.dialect.name == "postgresql":
+            name = partition_name(bucket.name, month)
+            if await conn.scalar(text("SELECT to_regclass(:n) IS NOT NULL"), {"n": name}):
+                await conn.execute(text(f"ALTER TABLE {bucket.name} DETACH PARTITION {name}"))
+                await conn.execute(text(f"DROP TABLE {name}"))
+                return
+        await conn.execute(delete(bucket.table).where(bucket.rows_in(month)))
+
+
+async def archive(keep_months: int, archive_dir: str, dry_run: bool = False) -> List[str]:
+    """Archive and purge every closed month older than ``keep_months``."""
+    cutoff = add_months(month_start(date.today()), -keep_months)
+    report = []
+    for bucket in BUCKETS:
+        for month, count in sorted((await month_counts(bucket, cutoff)).items()):
+            label = f"{bucket.name} {month:%Y-%m}: {count} rows"
+            if dry_run:
+                report.append(f"{label} (dry run)")
+                continue
+            exported = await export_month(bucket, month, archive_dir)
+            if exported != count:
+                # Rows arrived or vanished while exporting; leave the month for the next run
+                report.append(f"{label} exported {exported}, count changed - not purged")
+                continue
+            await purge_month(bucket, month)
+            report.append(f"{label} -> {archive_path(archive_dir, bucket.name, month)}")
+    return report
+
+
+async def status(archive_dir: str) -> List[str]:
+    lines = []
+    future = add_months(month_start(date.today()), 1)
+    for bucket in BUCKETS:
+        for month, count in sorted((await month_counts(bucket, future)).items()):
+            archived = os.path.exists(archive_path(archive_dir, bucket.name, month))
+            lines.append(f"{bucket.name:<20} {month:%Y-%m} {count:>10}{'  (archived)' if archived else ''}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(prog="python -m app.services.retention",
+                                     description="Partition upkeep and archival of log tables")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="rows per table and month")
+    partitions = sub.add_parser("partitions", help="create upcoming monthly partitions (PostgreSQL)")
+    partitions.add_argument("--ahead", type=int, default=MONTHS_AHEAD)
+    run = sub.add_parser("archive", help="export closed months to CSV.gz and purge them")
+    run.add_argument("--keep-months", type=int, default=settings.LOG_RETENTION_MONTHS)
+    run.add_argument("--archive-dir", default=settings.ARCHIVE_DIR)
+    run.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        lines = asyncio.run(status(settings.ARCHIVE_DIR))
+    elif args.command == "partitions":
+        lines = asyncio.run(ensure_partitions(args.ahead)) or ["Partitions up to date"]
+    else:
+        lines = asyncio.run(archive(args.keep_months, args.archive_dir, args.dry_run)) or ["Nothing to archive"]
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
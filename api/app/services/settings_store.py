@@ -0,0 +1,134 @@
+"""
+Database-backed system settings with an in-process cache.
+
+Settings groups (``delivery``, ``general``) are rows of ``app_settings``
+holding a JSON value and a version that every write increments. Each
+process keeps ``{key: value}`` in memory, so ``settings_store.get(key)`` is a
+dict lookup; it never touches the database or the filesystem.
+
+- Writes (``await settings_store.set(key, value)``) are a single-row
+  UPDATE (or INSERT for a new key) in one transaction, and update the local
+  cache immediately.
+- Other workers and replicas pick the change up within
+  ``SETTINGS_POLL_INTERVAL`` seconds: a background task compares the
+  ``(key, version)`` pairs and reloads only rows whose version moved.
+
+The cache is filled by ``load()`` at startup (``app.main``). Until then, and
+if the table is unreachable, ``get`` returns the caller's default.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.core.config import settings
+from app.services.event_buffer import register_buffer
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsStore:
+    """Cached view of ``app_settings``."""
+
+    def __init__(self, poll_interval: Optional[float] = None) -> None:
+        self.poll_interval = settings.SETTINGS_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._values: Dict[str, Any] = {}
+        self._versions: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.loaded = False
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for ``key`` (treat it as read-only)."""
+        return self._values.get(key, default)
+
+    def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    async def load(self, keys: Optional[list] = None) -> None:
+        """(Re)load ``keys`` (all rows when omitted) into the cache."""
+        from app.core.database import engine
+        from app.models.app_setting import AppSetting
+
+        query = select(AppSetting.key, AppSetting.value, AppSetting.version)
+        if keys is not None:
+            query = query.where(AppSetting.key.in_(keys))
+        async with engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+        if keys is None:
+            self._values, self._versions = {}, {}
+        for key, value, version in rows:
+            self._values[key] = value
+            self._versions[key] = version
+        self.loaded = True
+
+    async def refresh(self) -> int:
+        """Reload rows whose version changed elsewhere. Returns how many."""
+        from app.core.database import engine
+        from app.models.app_setting import AppSetting
+
+        async with engine.connect() as conn:
+            versions = dict((await conn.execute(select(AppSetting.key, AppSetting.version))).all())
+        changed = [key for key, version in versions.items() if self._versions.get(key) != version]
+        for key in set(self._versions) - set(versions):
+            self._values.pop(key, None)
+            self._versions.pop(key, None)
+        if changed:
+            await self.load(changed)
+        return len(changed)
+
+    async def set(self, key: str, value: Any) -> int:
+        """Store ``value`` under ``key`` atomically. Returns the new version."""
+        from app.core.database import engine
+        from app.models.app_setting import AppSetting
+
+        stmt = (
+            update(AppSetting)
+            .where(AppSetting.key == key)
+            .values(value=value, version=AppSetting.version + 1)
+            .returning(AppSetting.version)
+        )
+        for attempt in range(2):
+            try:
+                async with engine.begin() as conn:
+                    version = (await conn.execute(stmt)).scalar_one_or_none()
+                    if version is None:
+                        await conn.execute(AppSetting.__table__.insert().values(key=key, value=value, version=1))
+                        version = 1
+                break
+            except IntegrityError:
+                # Another writer inserted the key first: update that row instead
+                if attempt:
+                    raise
+        self._values[key] = value
+        self._versions[key] = version
+        return version
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except SQLAlchemyError as e:
+                logger.warning(f"Settings refresh failed: {e.__class__.__name__}: {e}")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running and self.poll_interval > 0:
+            self._task = asyncio.create_task(self._run(), name="settings-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+settings_store = register_buffer(SettingsStore())
@@ -0,0 +1,3 @@
+"""
+Developer tools (run with ``python -m app.tools.<name>``).
+"""
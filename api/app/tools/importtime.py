@@ -0,0 +1,157 @@
+"""
+Import-time profiler and budget check.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+then summarizes the slowest imports (cumulative and self time) and the
+cost per top-level package.
+
+Usage:
+    python -m app.tools.importtime                    # profile app.main
+    python -m app.tools.importtime app.routers.orders --top 15
+    python -m app.tools.importtime --check            # CI: budget + lazy deps
+
+``--check`` exits 1 when the cold import exceeds ``--budget-ms`` (median of
+``--runs`` fresh interpreters) or when any of the lazily loaded integrations
+(LAZY_MODULES) is imported eagerly.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+API_DIR = Path(__file__).resolve().parents[2]
+
+# Cold-import budget for app.main (ms); generous enough for shared CI runners
+DEFAULT_BUDGET_MS = 4000
+
+# Heavy integrations that must only load on first use
+LAZY_MODULES = ("stripe", "weasyprint", "cloudinary", "reportlab", "jinja2")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class ImportRecord:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    def __init__(self, module: str, self_us: int, cumulative_us: int, depth: int) -> None:
+        self.module = module
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def profile_import(module: str) -> List[ImportRecord]:
+    """Import ``module`` in a fresh interpreter and return its import records."""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    env.setdefault("SECRET_KEY", "importtime")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.splitlines()[-15:])
+        raise SystemExit(f"import {module} failed:\n{tail}")
+    return parse_importtime(result.stderr)
+
+
+def total_ms(records: List[ImportRecord], module: str) -> float:
+    for record in records:
+        if record.module == module:
+            return record.cumulative_us / 1000
+    return sum(r.self_us for r in records) / 1000
+
+
+def by_package(records: List[ImportRecord]) -> Dict[str, int]:
+    """Self time summed per top-level package (microseconds)."""
+    totals: Dict[str, int] = {}
+    for record in records:
+        totals[record.package] = totals.get(record.package, 0) + record.self_us
+    return totals
+
+
+def format_summary(records: List[ImportRecord], module: str, top: int) -> str:
+    lines = [f"Cold import of {module}: {total_ms(records, module):.0f} ms ({len(records)} modules)", ""]
+
+    lines.append(f"Top {top} by cumulative time:")
+    for record in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        lines.append(f"  {record.cumulative_us / 1000:>8.1f} ms  {record.module}")
+
+    lines.append("")
+    lines.append(f"Top {top} by self time:")
+    for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        lines.append(f"  {record.self_us / 1000:>8.1f} ms  {record.module}")
+
+    lines.append("")
+    lines.append(f"Top {top} packages (self time):")
+    for package, self_us in sorted(by_package(records).items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        lines.append(f"  {self_us / 1000:>8.1f} ms  {package}")
+    return "\n".join(lines)
+
+
+def eager_lazy_modules(records: List[ImportRecord]) -> List[str]:
+    imported = {record.package for record in records}
+    return [name for name in LAZY_MODULES if name in imported]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.importtime", description="Summarize python -X importtime")
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--check", action="store_true",
+                        help="fail on budget overrun or eager import of LAZY_MODULES")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters measured in --check mode")
+    args = parser.parse_args(argv)
+
+    records = profile_import(args.module)
+    print(format_summary(records, args.module, args.top))
+
+    if not args.check:
+        return 0
+
+    timings = [total_ms(records, args.module)]
+    for _ in range(max(args.runs - 1, 0)):
+        timings.append(total_ms(profile_import(args.module), args.module))
+    median_ms = statistics.median(timings)
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"cold import {median_ms:.0f} ms > budget {args.budget_ms:.0f} ms")
+    eager = eager_lazy_modules(records)
+    if eager:
+        failures.append(f"imported eagerly (must be lazy): {', '.join(eager)}")
+
+    print("")
+    print(f"Median cold import over {len(timings)} runs: {median_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Local SMTP sink for tests and benchmarks.
+
+Accepts every message and keeps it in memory; nothing is relayed. Speaks
+enough ESMTP for ``smtplib`` (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP,
+QUIT; no STARTTLS or AUTH, so run the app with ``EMAIL_USE_TLS=false`` and
+no SMTP credentials). ``latency`` delays every reply to mimic a remote
+server, and ``drop_sessions()`` closes open connections to exercise
+reconnects.
+
+Usage:
+    python -m app.tools.smtp_sink --port 1025 [--latency-ms 20]
+
+    sink = SMTPSink()            # in-process, random free port
+    host, port = sink.start()
+    ...
+    sink.messages                # [(mail_from, [rcpt, ...], raw bytes), ...]
+    sink.stop()
+"""
+import argparse
+from email import message_from_bytes
+from email.header import decode_header, make_header
+import socket
+import socketserver
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        if self.server.sink.latency:
+            time.sleep(self.server.sink.latency)
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def _read_data(self) -> bytes:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            # Dot-unstuffing (RFC 5321 4.5.2)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+    def handle(self) -> None:
+        sink = self.server.sink
+        sink._count_session(self.connection)
+        mail_from, rcpt_tos = None, []
+        self._reply("220 refarm-sink ESMTP")
+        while True:
+            try:
+                line = self.rfile.readline()
+            except OSError:
+                return
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-refarm-sink\r\n250-8BITMIME\r\n250-SMTPUTF8\r\n")
+                self._reply("250 SIZE 26214400")
+            elif verb == "HELO":
+                self._reply("250 refarm-sink")
+            elif verb == "MAIL":
+                mail_from, rcpt_tos = command.split(":", 1)[1].split()[0].strip("<>"), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpt_tos.append(command.split(":", 1)[1].strip().strip("<>"))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                sink._store(mail_from, rcpt_tos, self._read_data())
+                mail_from, rcpt_tos = None, []
+                self._reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                if verb == "RSET":
+                    mail_from, rcpt_tos = None, []
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """In-memory SMTP server on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.messages: List[Tuple[Optional[str], List[str], bytes]] = []
+        self.sessions = 0
+        self._connections: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _count_session(self, connection: socket.socket) -> None:
+        with self._lock:
+            self.sessions += 1
+            self._connections.append(connection)
+
+    def drop_sessions(self) -> None:
+        """Close every open client connection (like a server idle timeout)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _store(self, mail_from: Optional[str], rcpt_tos: List[str], data: bytes) -> None:
+        with self._lock:
+            self.messages.append((mail_from, list(rcpt_tos), data))
+
+    def subjects(self) -> List[str]:
+        return [
+            str(make_header(decode_header(message_from_bytes(data).get("Subject", ""))))
+            for _, _, data in self.messages
+        ]
+
+    def start(self) -> Tuple[str, int]:
+        self._server = _Server((self.host, self.port), _SMTPHandler)
+        self._server.sink = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="smtp-sink", daemon=True)
+        self._thread.start()
+        return self.host, self.port
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "SMTPSink":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.tools.smtp_sink", description="Local SMTP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay before every reply")
+    args = parser.parse_args(argv)
+
+    sink = SMTPSink(args.host, args.port, latency=args.latency_ms / 1000)
+    host, port = sink.start()
+    print(f"SMTP sink listening on {host}:{port} (EMAIL_SMTP_HOST={host} EMAIL_SMTP_PORT={port} EMAIL_USE_TLS=false)")
+    seen = 0
+    try:
+        while True:
+            time.sleep(0.5)
+            subjects = sink.subjects()
+            for subject in subjects[seen:]:
+                print(f"[{sink.sessions} sessions] {subject}")
+            seen = len(subjects)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,816 @@
+"""
+Synthetic dataset generator for scale testing.
+
+Bulk-generates farmers, products, retail products, delivery slots,
+restaurants with B2B orders, consumers with B2C orders, consumer events,
+guest visits/interactions and access logs. Every date is relative to
+``--as-of`` (history ends there, delivery slots continue after it), so the
+output is deterministic for a given ``--seed``, ``--as-of`` and set of
+counts. ``--as-of`` defaults to the start of the current hour and is logged,
+so a run can be repeated exactly.
+
+Usage:
+    python -m app.tools.synth --restaurants 500 --farmers 80 --consumers 20000 --months 24
+    python -m app.tools.synth --database-url sqlite+aiosqlite:///./synth.db --create-schema
+    python -m app.tools.synth --seed 42 --as-of 2026-10-01T12:00
+
+PostgreSQL (asyncpg) targets are loaded with COPY; every other backend uses
+multi-row INSERTs. IDs are allocated client-side from the current max(id),
+so the generator can be run repeatedly against the same database.
+"""
+import argparse
+import asyncio
+import enum
+import json
+import logging
+import math
+import random
+import time as time_module
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Enum as SAEnum, JSON, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.utils import calculate_retail_price
+from app.models import (
+    AccessLog,
+    Consumer,
+    ConsumerEvent,
+    ConsumerOrder,
+    ConsumerOrderItem,
+    DeliverySlot,
+    Farmer,
+    GuestInteraction,
+    GuestVisit,
+    Order,
+    OrderItem,
+    Product,
+    Restaurant,
+    RetailProduct,
+)
+from app.models.enums import (
+    DeliverySlotType,
+    DeliveryTimeSlot,
+    FarmingMethod,
+    HarvestStatus,
+    OrderStatus,
+    ProductCategory,
+    StockType,
+    TaxRate,
+)
+
+logger = logging.getLogger(__name__)
+
+TZ = ZoneInfo(settings.TZ)
+
+# (name, category, unit, base cost price, months in season)
+VEGETABLES = [
+    ("キャベツ", ProductCategory.LEAFY, "玉", 120, (1, 2, 3, 4, 5, 11, 12)),
+    ("白菜", ProductCategory.LEAFY, "玉", 150, (1, 2, 11, 12)),
+    ("ほうれん草", ProductCategory.LEAFY, "束", 110, (1, 2, 3, 10, 11, 12)),
+    ("小松菜", ProductCategory.LEAFY, "束", 90, (1, 2, 3, 10, 11, 12)),
+    ("水菜", ProductCategory.LEAFY, "袋", 100, (1, 2, 3, 11, 12)),
+    ("春菊", ProductCategory.LEAFY, "束", 120, (1, 2, 11, 12)),
+    ("フリルレタス", ProductCategory.LEAFY, "個", 130, (3, 4, 5, 6, 9, 10, 11)),
+    ("サニーレタス", ProductCategory.LEAFY, "個", 110, (3, 4, 5, 6, 9, 10, 11)),
+    ("ルッコラ", ProductCategory.LEAFY, "袋", 150, (3, 4, 5, 10, 11)),
+    ("モロヘイヤ", ProductCategory.LEAFY, "袋", 120, (6, 7, 8, 9)),
+    ("大根", ProductCategory.ROOT, "本", 130, (1, 2, 3, 10, 11, 12)),
+    ("人参", ProductCategory.ROOT, "袋", 140, (1, 2, 3, 4, 10, 11, 12)),
+    ("玉ねぎ", ProductCategory.ROOT, "kg", 200, (4, 5, 6, 7, 8, 9)),
+    ("新じゃがいも", ProductCategory.ROOT, "kg", 260, (5, 6, 7)),
+    ("さつまいも", ProductCategory.ROOT, "kg", 300, (9, 10, 11, 12)),
+    ("里芋", ProductCategory.ROOT, "袋", 280, (10, 11, 12, 1)),
+    ("ごぼう", ProductCategory.ROOT, "本", 160, (11, 12, 1, 2)),
+    ("かぶ", ProductCategory.ROOT, "束", 150, (10, 11, 12, 1, 2, 3)),
+    ("トマト", ProductCategory.FRUIT_VEG, "kg", 450, (5, 6, 7, 8, 9)),
+    ("ミニトマト", ProductCategory.FRUIT_VEG, "パック", 250, (5, 6, 7, 8, 9, 10)),
+    ("きゅうり", ProductCategory.FRUIT_VEG, "袋", 150, (5, 6, 7, 8, 9)),
+    ("なす", ProductCategory.FRUIT_VEG, "袋", 160, (6, 7, 8, 9, 10)),
+    ("ピーマン", ProductCategory.FRUIT_VEG, "袋", 140, (6, 7, 8, 9, 10)),
+    ("万願寺とうがらし", ProductCategory.FRUIT_VEG, "袋", 220, (6, 7, 8, 9)),
+    ("ズッキーニ", ProductCategory.FRUIT_VEG, "本", 120, (6, 7, 8)),
+    ("オクラ", ProductCategory.FRUIT_VEG, "袋", 150, (7, 8, 9)),
+    ("かぼちゃ", ProductCategory.FRUIT_VEG, "個", 350, (7, 8, 9, 10)),
+    ("とうもろこし", ProductCategory.FRUIT_VEG, "本", 180, (6, 7, 8)),
+    ("いちご", ProductCategory.FRUIT_VEG, "パック", 600, (1, 2, 3, 4)),
+    ("しいたけ", ProductCategory.MUSHROOM, "パック", 250, (3, 4, 10, 11, 12)),
+    ("ひらたけ", ProductCategory.MUSHROOM, "パック", 200, (10, 11, 12, 1)),
+    ("バジル", ProductCategory.HERB, "袋", 200, (6, 7, 8, 9)),
+    ("大葉", ProductCategory.HERB, "束", 100, (6, 7, 8, 9)),
+    ("パクチー", ProductCategory.HERB, "袋", 180, (3, 4, 5, 10, 11)),
+    ("九条ねぎ", ProductCategory.OTHER, "束", 160, (1, 2, 3, 10, 11, 12)),
+    ("スナップえんどう", ProductCategory.OTHER, "袋", 220, (3, 4, 5)),
+    ("そら豆", ProductCategory.OTHER, "袋", 260, (4, 5, 6)),
+    ("枝豆", ProductCategory.OTHER, "袋", 240, (7, 8, 9)),
+]
+VARIETY_PREFIXES = ["神戸", "西区", "北区", "淡路", "六甲", "有機", "朝採れ", "特選", "訳あり", ""]
+FARM_AREAS = ["神戸市西区", "神戸市北区", "明石市", "三木市", "淡路市", "南あわじ市", "加古川市", "丹波篠山市"]
+FARM_SUFFIXES = ["ファーム", "農園", "菜園", "農場", "ふぁーむ"]
+FAMILY_NAMES = ["山田", "田中", "中村", "小林", "松本", "井上", "木村", "林", "清水", "山口", "森", "池田", "橋本", "石川", "前田"]
+GIVEN_NAMES = ["太郎", "花子", "健太", "美咲", "翔", "陽菜", "大輔", "さくら", "拓海", "結衣"]
+RESTAURANT_KINDS = [
+    ("ビストロ", "フレンチ"), ("トラットリア", "イタリアン"), ("食堂", "和食"),
+    ("割烹", "和食"), ("カフェ", "カフェ"), ("キッチン", "洋食"), ("酒場", "居酒屋"),
+]
+RESTAURANT_WORDS = ["こうべ", "海岸通", "北野", "元町", "三宮", "岡本", "灘", "垂水", "須磨", "六甲"]
+SEARCH_TERMS = ["トマト", "レタス", "玉ねぎ", "人参", "有機", "訳あり", "いちご", "大根", "なす", "きのこ", "ハーブ", "セット"]
+PAGES = ["/local", "/local/products", "/local/cart", "/local/farmers", "/local/orders", "/local/mypage"]
+STAMP_TYPES = ["delicious", "cheer", "nice", "eat_again"]
+USER_AGENTS = [
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Line/14.5.0",
+    "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 Line/14.4.1",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0",
+]
+HOME_SLOT_TIMES = ["14:00〜16:00", "16:00〜18:00", "18:00〜20:00"]
+UNIV_SLOT_TIMES = ["12:00〜13:00", "17:00〜18:00"]
+B2C_DELIVERY_WEEKDAYS = (2, 5)  # Wed / Sat (date.weekday())
+ORDER_LEAD_DAYS = (2, 6)  # consumer orders are placed this many days before the slot
+
+
+class BulkWriter:
+    """Buffers rows per table and flushes them with COPY or executemany."""
+
+    def __init__(self, conn: AsyncConnection, batch_size: int) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg"
+        self._buffers: Dict[Table, List[dict]] = {}
+        self.counts: Dict[str, int] = {}
+
+    async def add(self, table: Table, row: dict) -> None:
+        buffer = self._buffers.setdefault(table, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            await self._flush_table(table)
+
+    async def flush(self) -> None:
+        for table in list(self._buffers):
+            await self._flush_table(table)
+
+    async def _flush_table(self, table: Table) -> None:
+        rows = self._buffers.get(table)
+        if not rows:
+            return
+        self._buffers[table] = []
+        # executemany/COPY need a uniform column list per statement
+        groups: Dict[tuple, List[dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row), []).append(row)
+        for group in groups.values():
+            if self.use_copy:
+                await self._copy(table, group)
+            else:
+                await self.conn.execute(table.insert(), group)
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+    async def _copy(self, table: Table, rows: List[dict]) -> None:
+        columns = list(rows[0].keys())
+        converters = [_copy_converter(table.c[name]) for name in columns]
+        records = [
+            tuple(convert(row[name]) for name, convert in zip(columns, converters))
+            for row in rows
+        ]
+        raw = await self.conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns
+        )
+
+
+def _copy_converter(column):
+    """Convert Python values to what asyncpg COPY expects for the column."""
+    if isinstance(column.type, SAEnum):
+        # SQLAlchemy persists enum member *names*
+        return lambda v: v.name if isinstance(v, enum.Enum) else v
+    if isinstance(column.type, JSON):
+        return lambda v: json.dumps(v, ensure_ascii=False) if v is not None else None
+    return lambda v: v
+
+
+class IdAllocator:
+    """Hands out primary keys above the current max(id) of each table."""
+
+    def __init__(self) -> None:
+        self._next: Dict[str, int] = {}
+
+    async def load(self, conn: AsyncConnection, tables: List[Table]) -> None:
+        for table in tables:
+            current = await conn.scalar(select(func.max(table.c.id)))
+            self._next[table.name] = (current or 0) + 1
+
+    def take(self, table: Table) -> int:
+        value = self._next[table.name]
+        self._next[table.name] = value + 1
+        return value
+
+
+def _in_season(month: int, season: tuple) -> bool:
+    return month in season
+
+
+def _stamp(day: date, rng: random.Random, start_hour: int = 7, end_hour: int = 23) -> datetime:
+    seconds = rng.randint(start_hour * 3600, end_hour * 3600 - 1)
+    return datetime.combine(day, time(0, 0), tzinfo=TZ) + timedelta(seconds=seconds)
+
+
+def default_as_of() -> datetime:
+    """Start of the current hour: stable across runs within the hour."""
+    return datetime.now(TZ).replace(minute=0, second=0, microsecond=0)
+
+
+def parse_as_of(value: str) -> datetime:
+    """ISO date or date-time for ``--as-of``; naive values are in ``settings.TZ``, a bare date means 00:00."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date or date-time: {value!r}")
+    return parsed.replace(tzinfo=TZ) if parsed.tzinfo is None else parsed.astimezone(TZ)
+
+
+def _parse_slot_times(label: str) -> tuple:
+    start, end = label.split("〜")
+    return time.fromisoformat(start), time.fromisoformat(end)
+
+
+class SyntheticDataset:
+    """Deterministic generator writing through a BulkWriter."""
+
+    def __init__(self, args: argparse.Namespace, writer: BulkWriter, ids: IdAllocator) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.writer = writer
+        self.ids = ids
+        self.now = args.as_of or default_as_of()
+        self.today = self.now.date()
+        self.start = (self.today.replace(day=1) - relativedelta(months=args.months - 1))
+        self.farmers: List[dict] = []
+        self.products: List[dict] = []
+        self.retail_products: List[dict] = []
+        self.restaurants: List[dict] = []
+        self.consumers: List[dict] = []
+        self.slots_by_date: Dict[date, List[dict]] = {}
+
+    def _at(self, day: date, start_hour: int = 7, end_hour: int = 23) -> datetime:
+        """Random time on ``day`` (``_stamp``), never later than ``--as-of``."""
+        return min(_stamp(day, self.rng, start_hour, end_hour), self.now)
+
+    def _past(self, value: datetime) -> datetime:
+        return min(value, self.now)
+
+    def _days(self):
+        day = self.start
+        while day <= self.today:
+            yield day
+            day += timedelta(days=1)
+
+    def _seasonal_weights(self, items: List[dict], month: int) -> List[float]:
+        return [3.0 if _in_season(month, item["_season"]) else 0.4 for item in items]
+
+    async def generate(self) -> None:
+        await self._farmers_and_products()
+        await self._retail_products()
+        await self._restaurants()
+        await self._delivery_slots()
+        await self._consumers()
+        await self._b2b_orders()
+        await self._b2c_orders_and_events()
+        await self._guest_activity()
+        await self._access_logs()
+        await self.writer.flush()
+
+    async def _farmers_and_products(self) -> None:
+        rng = self.rng
+        farmer_table = Farmer.__table__
+        product_table = Product.__table__
+        for _ in range(self.args.farmers):
+            farmer_id = self.ids.take(farmer_table)
+            family = rng.choice(FAMILY_NAMES)
+            created = self._at(self.start - timedelta(days=rng.randint(0, 180)))
+            specialties = rng.sample(VEGETABLES, k=min(len(VEGETABLES), self.args.products_per_farmer))
+            farmer = {
+                "id": farmer_id,
+                "name": f"{family}{rng.choice(FARM_SUFFIXES)}",
+                "main_crop": specialties[0][0],
+                "address": f"兵庫県{rng.choice(FARM_AREAS)}",
+                "bio": f"{specialties[0][0]}を中心に季節の野菜を育てています。",
+                "selectable_days": json.dumps(sorted(rng.sample(range(7), k=rng.randint(1, 4)))),
+                "line_user_id": f"Usynthf{farmer_id:010d}",
+                "is_active": 1 if rng.random() > 0.05 else 0,
+                # Set explicitly: the column's server default is now()
+                "info_confirmed_at": created,
+                "created_at": created,
+                "updated_at": created,
+            }
+            self.farmers.append(farmer)
+            await self.writer.add(farmer_table, farmer)
+
+            for order, (veg, category, unit, base_cost, season) in enumerate(specialties):
+                product_id = self.ids.take(product_table)
+                cost = int(base_cost * rng.uniform(0.8, 1.3))
+                prefix = rng.choice(VARIETY_PREFIXES)
+                in_season_now = _in_season(self.today.month, season)
+                product = {
+                    "id": product_id,
+                    "farmer_id": farmer_id,
+                    "name": f"{prefix}{veg}",
+                    "description": f"{farmer['name']}の{veg}です。",
+                    "farming_method": rng.choice(list(FarmingMethod)).value,
+                    "weight": rng.choice([None, 100, 150, 200, 300, 500, 1000]),
+                    "price": Decimal(cost) / Decimal("0.8"),
+                    "cost_price": cost,
+                    "price_multiplier": Decimal("0.80"),
+                    "harvest_status": (HarvestStatus.HARVESTABLE if in_season_now else rng.choice(
+                        [HarvestStatus.WAIT_1WEEK, HarvestStatus.WAIT_2WEEKS, HarvestStatus.ENDED]
+                    )).value,
+                    "tax_rate": TaxRate.REDUCED,
+                    "unit": unit,
+                    "stock_type": StockType.KOBE if "神戸" in farmer["address"] else StockType.OTHER,
+                    "category": category,
+                    "stock_quantity": rng.randint(0, 200),
+                    "is_active": 1 if rng.random() > 0.1 else 0,
+                    "is_featured": 1 if rng.random() < 0.1 else 0,
+                    "is_wakeari": 1 if prefix == "訳あり" else 0,
+                    "display_order": order,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+                product["price"] = product["price"].quantize(Decimal("1"))
+                self.products.append({**product, "_season": season})
+                await self.writer.add(product_table, product)
+
+    async def _retail_products(self) -> None:
+        rng = self.rng
+        table = RetailProduct.__table__
+        for product in self.products:
+            if rng.random() > self.args.retail_ratio:
+                continue
+            retail_id = self.ids.take(table)
+            conversion = rng.choice([Decimal("1"), Decimal("2"), Decimal("3"), Decimal("0.5")])
+            retail_price = calculate_retail_price(Decimal(product["cost_price"]) / conversion, Decimal("0.7"))
+            row = {
+                "id": retail_id,
+                "source_product_id": product["id"],
+                "name": product["name"],
+                "description": product["description"],
+                "retail_price": retail_price,
+                "tax_rate": 8,
+                "retail_unit": rng.choice(["パック", "袋", "個", "束"]),
+                "retail_quantity_label": rng.choice([None, "2個入り", "約300g", "1束"]),
+                "conversion_factor": conversion,
+                "set_quantity": rng.choice([1, 1, 1, 2]),
+                "waste_margin_pct": rng.choice([10, 15, 20, 25]),
+                "image_urls": [],
+                "category": product["category"].value,
+                "is_active": 1 if rng.random() > 0.1 else 0,
+                "is_featured": 1 if rng.random() < 0.15 else 0,
+                "is_wakeari": product["is_wakeari"],
+                "is_medama": 1 if rng.random() < 0.05 else 0,
+                "display_order": rng.randint(0, 100),
+                "created_at": product["created_at"],
+                "updated_at": product["updated_at"],
+            }
+            self.retail_products.append({
+                **row,
+                "_season": product["_season"],
+                "_source": product,
+            })
+            await self.writer.add(table, row)
+
+    async def _restaurants(self) -> None:
+        rng = self.rng
+        table = Restaurant.__table__
+        for _ in range(self.args.restaurants):
+            restaurant_id = self.ids.take(table)
+            kind, cuisine = rng.choice(RESTAURANT_KINDS)
+            created = self._at(self.start - timedelta(days=rng.randint(0, 90)))
+            row = {
+                "id": restaurant_id,
+                "line_user_id": f"Usynthr{restaurant_id:010d}",
+                "name": f"{kind} {rng.choice(RESTAURANT_WORDS)}",
+                "phone_number": f"078-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                "address": f"兵庫県神戸市中央区{rng.randint(1, 9)}-{rng.randint(1, 30)}-{rng.randint(1, 20)}",
+                "cuisine_type": cuisine,
+                "closing_date": rng.choice([None, 20, 25, 99]),
+                "shipping_fee": rng.choice([0, 500, 800]),
+                "is_active": 1,
+                "created_at": created,
+                "updated_at": created,
+            }
+            # Ordering cadence: deliveries per week
+            self.restaurants.append({**row, "_per_week": rng.choice([0.5, 1, 1, 2, 3])})
+            await self.writer.add(table, row)
+
+    async def _delivery_slots(self) -> None:
+        rng = self.rng
+        table = DeliverySlot.__table__
+        last_day = self.today + timedelta(days=21)
+        day = self.start
+        while day <= last_day:
+            if day.weekday() in B2C_DELIVERY_WEEKDAYS:
+                for slot_type, labels in (
+                    (DeliverySlotType.HOME, HOME_SLOT_TIMES),
+                    (DeliverySlotType.UNIVERSITY, UNIV_SLOT_TIMES),
+                ):
+                    for label in labels:
+                        start_time, end_time = _parse_slot_times(label)
+                        created = self._at(day - timedelta(days=14))
+                        row = {
+                            "id": self.ids.take(table),
+                            "date": day,
+                            "slot_type": slot_type,
+                            "start_time": start_time,
+                            "end_time": end_time,
+                            "time_text": label,
+                            "is_active": day >= self.today or rng.random() > 0.3,
+                            "created_at": created,
+                            "updated_at": created,
+                        }
+                        self.slots_by_date.setdefault(day, []).append(row)
+                        await self.writer.add(table, row)
+            day += timedelta(days=1)
+
+    async def _consumers(self) -> None:
+        rng = self.rng
+        table = Consumer.__table__
+        span_days = max((self.today - self.start).days, 1)
+        for _ in range(self.args.consumers):
+            consumer_id = self.ids.take(table)
+            # Sign-ups skew towards recent months (growing user base)
+            joined = self.start + timedelta(days=int(span_days * math.sqrt(rng.random())))
+            created = self._at(joined)
+            row = {
+                "id": consumer_id,
+                "line_user_id": f"Usynthc{consumer_id:010d}",
+                "name": f"{rng.choice(FAMILY_NAMES)} {rng.choice(GIVEN_NAMES)}",
+                "phone_number": f"090-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+                "postal_code": f"65{rng.randint(0, 9)}-{rng.randint(1000, 9999)}",
+                "address": f"兵庫県神戸市西区学園東町{rng.randint(1, 9)}-{rng.randint(1, 30)}",
+                "is_active": 1,
+                "created_at": created,
+                "updated_at": created,
+            }
+            self.consumers.append({**row, "_joined": joined, "_activity": rng.paretovariate(1.5)})
+            await self.writer.add(table, row)
+
+    async def _b2b_orders(self) -> None:
+        rng = self.rng
+        order_table = Order.__table__
+        item_table = OrderItem.__table__
+        active_products = [p for p in self.products if p["is_active"] == 1] or self.products
+        if not active_products:
+            return
+        slots = list(DeliveryTimeSlot)
+        for day in self._days():
+            if day.weekday() == 6:  # no deliveries on Sunday
+                continue
+            month_weights = self._seasonal_weights(active_products, day.month)
+            for restaurant in self.restaurants:
+                if rng.random() > restaurant["_per_week"] / 6:
+                    continue
+                order_id = self.ids.take(order_table)
+                created = self._at(day - timedelta(days=rng.randint(1, 3)), 8, 22)
+                picked = rng.choices(active_products, weights=month_weights, k=rng.randint(2, 10))
+                subtotal = Decimal(0)
+                tax_amount = Decimal(0)
+                seen = set()
+                for product in picked:
+                    if product["id"] in seen:
+                        continue
+                    seen.add(product["id"])
+                    quantity = rng.randint(1, 12)
+                    item_subtotal = product["price"] * quantity
+                    item_tax = (item_subtotal * Decimal("0.08")).quantize(Decimal("0.01"))
+                    await self.writer.add(item_table, {
+                        "id": self.ids.take(item_table),
+                        "order_id": order_id,
+                        "product_id": product["id"],
+                        "quantity": quantity,
+                        "unit_price": product["price"],
+                        "wholesale_price": product["cost_price"],
+                        "tax_rate": 8,
+                        "subtotal": item_subtotal,
+                        "tax_amount": item_tax,
+                        "total_amount": item_subtotal + item_tax,
+                        "product_name": product["name"],
+                        "product_unit": product["unit"],
+                        "created_at": created,
+                        "updated_at": created,
+                    })
+                    subtotal += item_subtotal
+                    tax_amount += item_tax
+                shipping_fee = restaurant["shipping_fee"]
+                status = self._status_for(day, rng)
+                await self.writer.add(order_table, {
+                    "id": order_id,
+                    "restaurant_id": restaurant["id"],
+                    "delivery_date": datetime.combine(day, time(0, 0), tzinfo=TZ),
+                    "delivery_time_slot": rng.choice(slots),
+                    "status": status,
+                    "subtotal": subtotal,
+                    "tax_amount": tax_amount,
+                    "shipping_fee": shipping_fee,
+                    "total_amount": subtotal + tax_amount + shipping_fee,
+                    "delivery_address": restaurant["address"],
+                    "delivery_phone": restaurant["phone_number"],
+                    "confirmed_at": self._past(created + timedelta(hours=2)) if status != OrderStatus.PENDING else None,
+                    "delivered_at": self._at(day, 12, 18) if status == OrderStatus.DELIVERED else None,
+                    "cancelled_at": self._past(created + timedelta(hours=5)) if status == OrderStatus.CANCELLED else None,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+
+    def _status_for(self, day: date, rng: random.Random) -> OrderStatus:
+        if rng.random() < 0.04:
+            return OrderStatus.CANCELLED
+        if day < self.today:
+            return OrderStatus.DELIVERED
+        return rng.choice([OrderStatus.PENDING, OrderStatus.CONFIRMED])
+
+    async def _b2c_orders_and_events(self) -> None:
+        rng = self.rng
+        order_table = ConsumerOrder.__table__
+        item_table = ConsumerOrderItem.__table__
+        event_table = ConsumerEvent.__table__
+        catalog = [rp for rp in self.retail_products if rp["is_active"] == 1] or self.retail_products
+        if not catalog:
+            return
+        # Orders are placed ORDER_LEAD_DAYS before the slot, so only slots up to
+        # today + the shortest lead can have been ordered already
+        last_order_day = self.today + timedelta(days=ORDER_LEAD_DAYS[0])
+        delivery_days = sorted(d for d in self.slots_by_date if d <= last_order_day)
+        span_days = (self.today - self.start).days + 1
+        for consumer in self.consumers:
+            active_days = (self.today - consumer["_joined"]).days + 1
+            months_active = max(active_days / 30, 0.1)
+            n_sessions = int(self.args.events_per_consumer_month * months_active * consumer["_activity"] / 3)
+            n_orders = int(months_active * 0.6 * consumer["_activity"] / 2 + rng.random())
+            for _ in range(n_sessions):
+                day = consumer["_joined"] + timedelta(days=rng.randrange(active_days))
+                weights = self._seasonal_weights(catalog, day.month)
+                session_id = f"s{rng.getrandbits(48):012x}"
+                at = self._at(day)
+                for event_type, product in self._session_events(catalog, weights):
+                    at = self._past(at + timedelta(seconds=rng.randint(2, 90)))
+                    await self.writer.add(event_table, {
+                        "id": self.ids.take(event_table),
+                        "consumer_id": consumer["id"],
+                        "session_id": session_id,
+                        "event_type": event_type,
+                        "page": rng.choice(PAGES),
+                        "product_id": product["id"] if product else None,
+                        "product_name": product["name"] if product else None,
+                        "farmer_id": product["_source"]["farmer_id"] if product else None,
+                        "quantity": 1 if event_type == "add_to_cart" else None,
+                        "search_query": rng.choice(SEARCH_TERMS) if event_type == "search" else None,
+                        "ip_address": f"203.0.113.{rng.randint(1, 254)}",
+                        "user_agent": rng.choice(USER_AGENTS),
+                        "created_at": at,
+                        "updated_at": at,
+                    })
+            for _ in range(n_orders):
+                candidates = [d for d in delivery_days if d >= consumer["_joined"]]
+                if not candidates:
+                    break
+                day = rng.choice(candidates)
+                slot = rng.choice(self.slots_by_date[day])
+                await self._consumer_order(consumer, slot, day, catalog, order_table, item_table)
+        logger.info(f"Generated B2C activity for {len(self.consumers)} consumers over {span_days} days")
+
+    def _session_events(self, catalog: List[dict], weights: List[float]):
+        rng = self.rng
+        yield "page_view", None
+        if rng.random() < 0.3:
+            yield "search", None
+        for product in rng.choices(catalog, weights=weights, k=rng.randint(1, 6)):
+            yield "product_view", product
+            if rng.random() < 0.25:
+                yield "add_to_cart", product
+        if rng.random() < 0.2:
+            yield "cart_view", None
+
+    async def _consumer_order(self, consumer, slot, day, catalog, order_table, item_table) -> None:
+        rng = self.rng
+        order_id = self.ids.take(order_table)
+        created = self._at(day - timedelta(days=rng.randint(*ORDER_LEAD_DAYS)))
+        weights = self._seasonal_weights(catalog, day.month)
+        subtotal = Decimal(0)
+        tax_amount = Decimal(0)
+        for rp in {rp["id"]: rp for rp in rng.choices(catalog, weights=weights, k=rng.randint(1, 6))}.values():
+            quantity = rng.randint(1, 4)
+            item_subtotal = rp["retail_price"] * quantity
+            item_tax = item_subtotal * Decimal("0.08")
+            await self.writer.add(item_table, {
+                "id": self.ids.take(item_table),
+                "order_id": order_id,
+                "product_id": rp["source_product_id"],
+                "retail_product_id": rp["id"],
+                "quantity": quantity,
+                "unit_price": rp["retail_price"],
+                "tax_rate": 8,
+                "subtotal": item_subtotal,
+                "tax_amount": item_tax,
+                "total_amount": item_subtotal + item_tax,
+                "product_name": rp["name"],
+                "product_unit": rp["retail_unit"],
+                "created_at": created,
+                "updated_at": created,
+            })
+            subtotal += item_subtotal
+            tax_amount += item_tax
+        is_home = slot["slot_type"] == DeliverySlotType.HOME
+        shipping_fee = 500 if is_home else 0
+        status = self._status_for(day, rng)
+        payment_method = rng.choice(["cash_on_delivery", "card"])
+        await self.writer.add(order_table, {
+            "id": order_id,
+            "consumer_id": consumer["id"],
+            "delivery_slot_id": slot["id"],
+            "delivery_type": slot["slot_type"],
+            "delivery_label": "自宅へ配送" if is_home else "ユニバードーム付近で受取",
+            "delivery_time_label": slot["time_text"],
+            "delivery_address": consumer["address"] if is_home else None,
+            "payment_method": payment_method,
+            "stripe_payment_intent_id": f"pi_synth_{order_id}" if payment_method == "card" else None,
+            "status": status,
+            "subtotal": subtotal,
+            "tax_amount": tax_amount,
+            "shipping_fee": shipping_fee,
+            "discount_amount": Decimal(0),
+            "total_amount": subtotal + tax_amount + shipping_fee,
+            "confirmed_at": self._past(created + timedelta(hours=3)) if status != OrderStatus.PENDING else None,
+            "delivered_at": self._at(day, 12, 20) if status == OrderStatus.DELIVERED else None,
+            "cancelled_at": self._past(created + timedelta(hours=6)) if status == OrderStatus.CANCELLED else None,
+            "created_at": created,
+            "updated_at": created,
+        })
+        if status != OrderStatus.CANCELLED:
+            await self.writer.add(ConsumerEvent.__table__, {
+                "id": self.ids.take(ConsumerEvent.__table__),
+                "consumer_id": consumer["id"],
+                "event_type": "order_complete",
+                "page": "/local/order-complete",
+                "cart_total": int(subtotal + tax_amount + shipping_fee),
+                "metadata": {"order_id": order_id},
+                "created_at": created,
+                "updated_at": created,
+            })
+
+    async def _guest_activity(self) -> None:
+        rng = self.rng
+        visit_table = GuestVisit.__table__
+        interaction_table = GuestInteraction.__table__
+        farmer_ids = [f["id"] for f in self.farmers if f["is_active"] == 1] or [f["id"] for f in self.farmers]
+        for day in self._days():
+            for restaurant in self.restaurants:
+                for _ in range(self._poisson(self.args.guest_visits_per_restaurant_day)):
+                    visit_id = self.ids.take(visit_table)
+                    at = self._at(day, 11, 22)
+                    await self.writer.add(visit_table, {
+                        "id": visit_id,
+                        "restaurant_id": restaurant["id"],
+                        "visitor_id": f"v{rng.getrandbits(64):016x}",
+                        "stay_time_seconds": int(rng.expovariate(1 / 45)),
+                        "scroll_depth": rng.randint(5, 100),
+                        "created_at": at,
+                        "updated_at": at,
+                    })
+                    if not farmer_ids or rng.random() > 0.35:
+                        continue
+                    for _ in range(rng.randint(1, 3)):
+                        kind = rng.choices(["STAMP", "MESSAGE", "INTEREST"], weights=[6, 2, 2])[0]
+                        at = self._past(at + timedelta(seconds=rng.randint(5, 120)))
+                        await self.writer.add(interaction_table, {
+                            "id": self.ids.take(interaction_table),
+                            "visit_id": visit_id,
+                            "farmer_id": rng.choice(farmer_ids),
+                            "interaction_type": kind,
+                            "stamp_type": rng.choice(STAMP_TYPES) if kind == "STAMP" else None,
+                            "comment": "とても美味しかったです！" if kind == "MESSAGE" else None,
+                            "nickname": rng.choice(GIVEN_NAMES) if kind == "MESSAGE" else None,
+                            "created_at": at,
+                            "updated_at": at,
+                        })
+
+    async def _access_logs(self) -> None:
+        rng = self.rng
+        table = AccessLog.__table__
+        actors = [("restaurant", r) for r in self.restaurants] + [("farmer", f) for f in self.farmers]
+        for day in self._days():
+            for actor_type, actor in actors:
+                if rng.random() > self.args.access_log_probability:
+                    continue
+                at = self._at(day)
+                await self.writer.add(table, {
+                    "id": self.ids.take(table),
+                    "actor_type": actor_type,
+                    "actor_id": actor["id"],
+                    "actor_name": actor["name"],
+                    "line_user_id": actor["line_user_id"],
+                    "action": "verify",
+                    "path": "/api/auth/verify",
+                    "ip_address": f"198.51.100.{rng.randint(1, 254)}",
+                    "user_agent": rng.choice(USER_AGENTS),
+                    "created_at": at,
+                    "updated_at": at,
+                })
+
+    def _poisson(self, lam: float) -> int:
+        """Knuth's algorithm; lam is small (visits per restaurant per day)."""
+        limit = math.exp(-lam)
+        k, p = 0, 1.0
+        while True:
+            p *= self.rng.random()
+            if p <= limit:
+                return k
+            k += 1
+
+
+GENERATED_TABLES = [
+    Farmer.__table__, Product.__table__, RetailProduct.__table__, Restaurant.__table__,
+    DeliverySlot.__table__, Consumer.__table__, Order.__table__, OrderItem.__table__,
+    ConsumerOrder.__table__, ConsumerOrderItem.__table__, ConsumerEvent.__table__,
+    GuestVisit.__table__, GuestInteraction.__table__, AccessLog.__table__,
+]
+
+
+async def _reset_sequences(conn: AsyncConnection) -> None:
+    """Move PostgreSQL serial sequences past the client-allocated ids."""
+    for table in GENERATED_TABLES:
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+        ))
+
+
+async def run(args: argparse.Namespace) -> Dict[str, int]:
+    if args.as_of is None:
+        args.as_of = default_as_of()
+    logger.info(f"Generating synthetic dataset as of {args.as_of.isoformat()} (seed {args.seed})")
+    engine = create_async_engine(args.database_url or settings.DATABASE_URL)
+    started = time_module.perf_counter()
+    try:
+        if args.create_schema:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+        async with engine.begin() as conn:
+            if conn.dialect.name == "sqlite":
+                await conn.execute(text("PRAGMA foreign_keys=OFF"))
+            ids = IdAllocator()
+            await ids.load(conn, GENERATED_TABLES)
+            writer = BulkWriter(conn, args.batch_size)
+            await SyntheticDataset(args, writer, ids).generate()
+            if conn.dialect.name == "postgresql":
+                await _reset_sequences(conn)
+    finally:
+        await engine.dispose()
+
+    elapsed = time_module.perf_counter() - started
+    for name, count in sorted(writer.counts.items()):
+        logger.info(f"  {name:<24} {count:>10,}")
+    logger.info(f"Synthetic dataset generated in {elapsed:.1f}s")
+    return writer.counts
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.tools.synth",
+        description="Generate a deterministic synthetic dataset for scale testing.",
+    )
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--farmers", type=int, default=20)
+    parser.add_argument("--consumers", type=int, default=2000)
+    parser.add_argument("--months", type=int, default=12, help="history length")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=parse_as_of, default=None,
+                        help="reference date-time (ISO); defaults to the start of the current hour")
+    parser.add_argument("--products-per-farmer", type=int, default=8)
+    parser.add_argument("--retail-ratio", type=float, default=0.6,
+                        help="share of farmer products that get a retail product")
+    parser.add_argument("--events-per-consumer-month", type=float, default=4.0,
+                        help="browsing sessions per consumer per month (avg)")
+    parser.add_argument("--guest-visits-per-restaurant-day", type=float, default=0.8)
+    parser.add_argument("--access-log-probability", type=float, default=0.3,
+                        help="daily probability that a restaurant/farmer signs in")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--database-url", default=None,
+                        help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--create-schema", action="store_true",
+                        help="create missing tables first (handy for SQLite)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = build_parser().parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
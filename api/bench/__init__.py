@@ -0,0 +1,10 @@
+"""
+End-to-end API load and benchmark suite.
+
+Run from the ``api`` directory:
+
+    python -m bench --prepare --database-url sqlite+aiosqlite:///./bench.db
+    python -m bench --duration 30 --concurrency 16
+
+See ``python -m bench --help`` and bench/README.md.
+"""
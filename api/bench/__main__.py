@@ -0,0 +1,160 @@
+"""
+Benchmark runner.
+
+    python -m bench [--prepare] [--duration 30] [--concurrency 16] [--mix catalog=5,checkout=2]
+
+Exit status is 1 when any endpoint regresses beyond the baseline tolerance
+(or returns errors), so the command can gate CI.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None,
+                        help="target database (default: sqlite+aiosqlite:///./bench.db)")
+    parser.add_argument("--prepare", action="store_true",
+                        help="create the schema and load a synthetic dataset before running")
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--farmers", type=int, default=20)
+    parser.add_argument("--consumers", type=int, default=2000)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", default=None,
+                        help="reference date-time for --prepare (see python -m app.tools.synth)")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unmeasured warm-up")
+    parser.add_argument("--concurrency", type=int, default=8, help="virtual users")
+    parser.add_argument("--mix", default=None,
+                        help="scenario weights, e.g. catalog=5,checkout=2 (default: built-in mix)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="allowed regression as a fraction (default: from baseline file)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write this run's numbers (with headroom) to the baseline file")
+    parser.add_argument("--json", type=Path, default=None, help="also write the report as JSON")
+    return parser
+
+
+def parse_mix(value, scenarios) -> dict:
+    if not value:
+        return {name: weight for name, (_, weight) in scenarios.items()}
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in scenarios:
+            raise SystemExit(f"unknown scenario {name!r}; choose from {', '.join(scenarios)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def virtual_user(index, client, fixtures, recorder, mix, scenarios, stop_at, seed):
+    from bench.scenarios import Session
+
+    rng = random.Random(seed * 1000 + index)
+    session = Session(client, fixtures, recorder, rng)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < stop_at:
+        name = rng.choices(names, weights=weights)[0]
+        try:
+            await scenarios[name][0](session)
+        except Exception as exc:
+            logging.getLogger("bench").warning(f"scenario {name} failed: {exc!r}")
+
+
+async def run_load(args, client, fixtures, mix, scenarios, recorder, duration) -> float:
+    started = time.perf_counter()
+    stop_at = started + duration
+    await asyncio.gather(*[
+        virtual_user(i, client, fixtures, recorder, mix, scenarios, stop_at, args.seed)
+        for i in range(args.concurrency)
+    ])
+    return time.perf_counter() - started
+
+
+async def main_async(args) -> int:
+    from bench.harness import build_client, load_fixtures
+    from bench.scenarios import SCENARIOS
+    from bench.stats import Recorder, baseline_from_report, compare, format_report, load_baseline
+
+    if args.prepare:
+        from app.tools import synth
+
+        synth_args = synth.build_parser().parse_args([
+            "--restaurants", str(args.restaurants),
+            "--farmers", str(args.farmers),
+            "--consumers", str(args.consumers),
+            "--months", str(args.months),
+            "--seed", str(args.seed),
+            "--create-schema",
+            *(["--as-of", args.as_of] if args.as_of else []),
+        ])
+        await synth.run(synth_args)
+
+    mix = parse_mix(args.mix, SCENARIOS)
+    fixtures = await load_fixtures()
+    client, line_stub = build_client()
+    async with client:
+        if args.warmup > 0:
+            await run_load(args, client, fixtures, mix, SCENARIOS, Recorder(), args.warmup)
+        recorder = Recorder()
+        elapsed = await run_load(args, client, fixtures, mix, SCENARIOS, recorder, args.duration)
+
+    report = recorder.report(elapsed)
+    print(format_report(report, elapsed))
+    print(f"(stubbed LINE pushes: {line_stub.pushed})")
+
+    if args.json:
+        args.json.write_text(json.dumps({"elapsed_s": elapsed, "endpoints": report}, indent=2), encoding="utf-8")
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        tolerance = args.tolerance if args.tolerance is not None else baseline.get("tolerance", 0.2)
+        updated = baseline_from_report(report, tolerance)
+        if "reference" in baseline:
+            updated = {"reference": baseline["reference"], **updated}
+        args.baseline.write_text(
+            json.dumps(updated, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    failures = compare(report, baseline, args.tolerance)
+    if failures:
+        print("\nREGRESSIONS:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nAll endpoints within budget.")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    # Never inherit DATABASE_URL: the benchmark writes orders
+    os.environ["DATABASE_URL"] = args.database_url or "sqlite+aiosqlite:///./bench.db"
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+    # Keep the profiler and request logging out of the measurements
+    os.environ["DEBUG"] = "False"
+    os.environ["QUERY_PROFILER_ENABLED"] = "False"
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
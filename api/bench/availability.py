@@ -0,0 +1,161 @@
+"""
+Farmer availability benchmark.
+
+    python -m bench.availability [--farmers 60] [--days 90] [--overrides 0.05] [--runs 20]
+
+Builds ``--farmers`` farmers with random weekly settings (a few without any,
+a few with invalid JSON) and ``FarmerSchedule`` overrides on a fraction
+``--overrides`` of farmer-days, then times the body of
+``POST /api/farmers/availability/bulk`` without the database round trips:
+
+- ``legacy``: the previous loop (JSON parse and ``strftime('%w')`` per
+  farmer per day, ORM-like override objects),
+- ``mask``: ``app.services.availability`` (cached weekday masks, per-range
+  bit patterns, date-indexed overrides).
+
+Both must return identical results; the benchmark exits with status 1
+otherwise.
+"""
+import argparse
+from datetime import date, timedelta
+import json
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+
+def build_dataset(farmers: int, days: int, override_ratio: float, seed: int = 7):
+    rng = random.Random(seed)
+    start = date(2026, 11, 2)
+    end = start + timedelta(days=days - 1)
+    farmer_rows = []
+    for fid in range(1, farmers + 1):
+        kind = fid % 10
+        if kind == 0:
+            selectable_days = None
+        elif kind == 9:
+            selectable_days = "mon,wed"
+        else:
+            selectable_days = json.dumps(sorted(rng.sample(range(7), k=rng.randint(1, 4))))
+        farmer_rows.append(SimpleNamespace(id=fid, selectable_days=selectable_days))
+    schedules = []
+    for fid in range(1, farmers + 1):
+        for i in range(days):
+            if rng.random() < override_ratio:
+                is_available = rng.random() < 0.5
+                notes = rng.choice([None, "収穫祭", "臨時休業"])
+                schedules.append(SimpleNamespace(
+                    farmer_id=fid, date=start + timedelta(days=i), is_available=is_available, notes=notes,
+                ))
+    # Ask for one unknown farmer too, like a stale cart would
+    farmer_ids = list(range(1, farmers + 1)) + [farmers + 1000]
+    return farmer_ids, farmer_rows, schedules, start, end
+
+
+def legacy(farmer_ids, farmer_rows, schedules, start_date, end_date) -> dict:
+    """The bulk availability loop as it was before the weekday masks."""
+    farmer_map = {f.id: f for f in farmer_rows}
+    schedule_map = {}
+    for s in schedules:
+        if s.farmer_id not in schedule_map:
+            schedule_map[s.farmer_id] = {}
+        schedule_map[s.farmer_id][s.date] = s
+
+    results = {}
+    curr = start_date
+    while curr <= end_date:
+        date_str = curr.strftime("%Y-%m-%d")
+        available_ids = []
+        unavailable = []
+        for fid in farmer_ids:
+            farmer = farmer_map.get(fid)
+            if not farmer:
+                continue
+            over = schedule_map.get(fid, {}).get(curr)
+            if over:
+                if over.is_available:
+                    available_ids.append(fid)
+                else:
+                    unavailable.append({"id": fid, "reason": over.notes or "休業日設定"})
+                continue
+            is_avail = False
+            weekly_setting_exists = False
+            if farmer.selectable_days:
+                try:
+                    allowed = json.loads(farmer.selectable_days)
+                    if isinstance(allowed, list):
+                        weekly_setting_exists = True
+                        day_idx = int(curr.strftime('%w'))
+                        is_avail = day_idx in allowed
+                except Exception:
+                    pass
+            if not weekly_setting_exists:
+                day_idx = int(curr.strftime('%w'))
+                is_avail = (day_idx == 3)
+            if is_avail:
+                available_ids.append(fid)
+            else:
+                reason = "曜日設定 (初期設定: 水曜のみ)" if not weekly_setting_exists else "曜日設定"
+                unavailable.append({"id": fid, "reason": reason})
+        results[date_str] = {
+            "available": available_ids,
+            "unavailable": unavailable,
+            "all_available": len(unavailable) == 0,
+        }
+        curr += timedelta(days=1)
+    return results
+
+
+def masked(farmer_ids, farmer_rows, schedules, start_date, end_date) -> dict:
+    from app.services.availability import check_range, index_overrides
+
+    selectable_days = {f.id: f.selectable_days for f in farmer_rows}
+    overrides = index_overrides(
+        ((s.farmer_id, s.date, s.is_available, s.notes) for s in schedules), start_date
+    )
+    return check_range(farmer_ids, selectable_days, overrides, start_date, end_date)
+
+
+def clear_caches() -> None:
+    from app.services.availability import range_bits, weekday_mask
+
+    weekday_mask.cache_clear()
+    range_bits.cache_clear()
+
+
+def measure(fn, dataset, runs: int, cold: bool = False) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(runs):
+        if cold:
+            clear_caches()
+        started = time.perf_counter()
+        fn(*dataset)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.availability", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--farmers", type=int, default=60)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--overrides", type=float, default=0.05, help="fraction of farmer-days with a FarmerSchedule row")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    dataset = build_dataset(args.farmers, args.days, args.overrides)
+    if legacy(*dataset) != masked(*dataset):
+        raise SystemExit("availability results differ between legacy and mask implementations")
+
+    print(f"{args.farmers} farmers x {args.days} days, {len(dataset[2])} overrides")
+    print(f"{'impl':<14}{'median ms':>11}{'speedup':>9}")
+    base = measure(legacy, dataset, args.runs)
+    print(f"{'legacy':<14}{base:>11.2f}{1:>8.1f}x")
+    for label, cold in (("mask (cold)", True), ("mask", False)):
+        elapsed = measure(masked, dataset, args.runs, cold=cold)
+        print(f"{label:<14}{elapsed:>11.2f}{base / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
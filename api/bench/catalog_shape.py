@@ -0,0 +1,156 @@
+"""
+Catalog payload shape benchmark.
+
+    python -m bench.catalog_shape [--products 1000] [--farmers 25] [--runs 20]
+
+Builds ``--products`` unsaved ``Product`` rows spread over ``--farmers``
+farmers (profiles with bio, commitments and chef comments like the real
+ones), then measures the payload size and the median time to turn the page
+into response bytes:
+
+- ``nested``: what ``GET /api/products`` does by default -- FastAPI
+  validates the ``ProductListResponse`` against the route's
+  ``response_model`` and renders it with ``JSONResponse``,
+- ``normalized``: ``?shape=normalized`` (``app.core.catalog_shape``) --
+  each farmer once in ``farmers``, serialized in a single pass.
+
+The normalized payload must carry the same data (every nested ``farmer``
+equals ``farmers[farmer_id]``); the benchmark exits with status 1 otherwise.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import json
+import random
+import statistics
+import time
+
+
+def build_dataset(products: int, farmers: int, seed: int = 7) -> list:
+    from app.models import Farmer, Product
+    from app.models.enums import HarvestStatus, ProductCategory, StockType, TaxRate
+
+    rng = random.Random(seed)
+    created = datetime(2026, 4, 1, 9, 0, tzinfo=timezone(timedelta(hours=9)))
+    farmer_rows = [
+        Farmer(
+            id=fid,
+            name=f"生産者 {fid}",
+            main_crop="トマト、レタス、季節の葉物",
+            profile_photo_url=f"https://res.cloudinary.com/refarm/image/upload/farmers/{fid}.jpg",
+            cover_photo_url=f"https://res.cloudinary.com/refarm/image/upload/farmers/{fid}_cover.jpg",
+            bio="神戸市西区で農薬を使わずに野菜を育てています。" * 4,
+            address="兵庫県神戸市西区岩岡町",
+            farming_method="有機栽培",
+            certifications="JAS有機認証",
+            commitments=[{"title": "土づくり", "body": "堆肥から手作りしています。" * 3, "image_url": None}],
+            achievements=["2024 神戸野菜コンテスト入賞"],
+            chef_comments=[{"name": "シェフ", "comment": "香りがしっかりしていて使いやすい。" * 2}],
+            article_url=["https://example.com/articles/1"],
+            video_url=[],
+            kodawari="朝採りをその日のうちに届けます。",
+            selectable_days="[1,3,5]",
+            is_active=1,
+            created_at=created,
+            updated_at=created,
+        )
+        for fid in range(1, farmers + 1)
+    ]
+    rows = []
+    categories = list(ProductCategory)
+    for pid in range(1, products + 1):
+        farmer = farmer_rows[rng.randrange(farmers)]
+        rows.append(Product(
+            id=pid,
+            farmer_id=farmer.id,
+            farmer=farmer,
+            name=f"商品 {pid}",
+            variety="ハンサムグリーン",
+            description="朝採りの新鮮な野菜です。",
+            price=Decimal(rng.randrange(150, 800)),
+            cost_price=rng.randrange(80, 400),
+            price_multiplier=Decimal("0.8"),
+            harvest_status=HarvestStatus.HARVESTABLE,
+            tax_rate=TaxRate.REDUCED,
+            unit="袋",
+            stock_type=StockType.KOBE,
+            category=rng.choice(categories),
+            stock_quantity=rng.randrange(0, 50),
+            image_url=f"https://res.cloudinary.com/refarm/image/upload/products/{pid}.jpg",
+            is_active=1,
+            is_featured=0,
+            is_wakeari=0,
+            display_order=0,
+            created_at=created,
+            updated_at=created,
+        ))
+    return rows
+
+
+_nested_field = None
+
+
+def nested(products: list) -> bytes:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    from app.schemas import ProductListResponse
+
+    global _nested_field
+    if _nested_field is None:
+        # FastAPI builds the response field once per route
+        _nested_field = create_response_field(name="Response_list_products", type_=ProductListResponse)
+    content = ProductListResponse(items=products, total=len(products), skip=0, limit=len(products))
+    body = asyncio.run(serialize_response(field=_nested_field, response_content=content))
+    return JSONResponse(body).body
+
+
+def normalized(products: list) -> bytes:
+    from app.core.catalog_shape import normalized_products
+
+    return normalized_products(products, len(products), 0, len(products)).body
+
+
+def check(nested_body: bytes, normalized_body: bytes) -> None:
+    a, b = json.loads(nested_body), json.loads(normalized_body)
+    for x, y in zip(a["items"], b["items"]):
+        farmer = x.pop("farmer")
+        if farmer != b["farmers"][str(y["farmer_id"])] or x != y:
+            raise SystemExit(f"normalized payload differs for product {x['id']}")
+    if len(a["items"]) != len(b["items"]) or a["total"] != b["total"]:
+        raise SystemExit("normalized payload differs in length")
+
+
+def measure(fn, products: list, runs: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(products)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.catalog_shape", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--farmers", type=int, default=25)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    products = build_dataset(args.products, args.farmers)
+    nested_body, normalized_body = nested(products), normalized(products)
+    check(nested_body, normalized_body)
+
+    print(f"{args.products} products, {args.farmers} farmers")
+    print(f"{'shape':<12}{'bytes':>11}{'median ms':>11}{'speedup':>9}")
+    base = measure(nested, products, args.runs)
+    print(f"{'nested':<12}{len(nested_body):>11}{base:>11.2f}{1:>8.1f}x")
+    elapsed = measure(normalized, products, args.runs)
+    print(f"{'normalized':<12}{len(normalized_body):>11}{elapsed:>11.2f}{base / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Email delivery throughput benchmark.
+
+    python -m bench.email [--messages 200] [--latency-ms 5] [--pool-size 2] [--batch-window 0.05]
+
+Sends order-notification-sized messages to a local SMTP sink
+(``app.tools.smtp_sink``) that delays each reply by ``--latency-ms`` to
+stand in for a remote server, and compares:
+
+- ``per-message``: the previous delivery (connect, EHLO, send, QUIT for
+  every message, on the caller's thread),
+- ``pooled``: ``MailQueue`` (pooled sessions, batching, worker threads).
+
+Reports messages/s, SMTP sessions opened and how long the caller (the event
+loop, for the pooled path) was blocked per message.
+"""
+import argparse
+import asyncio
+from email.message import EmailMessage
+import smtplib
+import time
+from typing import List
+
+
+def build_messages(count: int) -> List[EmailMessage]:
+    messages = []
+    for i in range(count):
+        msg = EmailMessage()
+        msg["Subject"] = f"[Refarm] 新しい注文（消費者） #{i + 1}"
+        msg["From"] = "bench@refarm.local"
+        msg["To"] = "orders@refarm.local"
+        msg.set_content(f"新しい注文（消費者）\n注文者: ベンチ {i + 1}\n合計: ¥{1200 + i:,}\n")
+        msg.add_alternative("<html><body>" + "<tr><td>神戸産 野菜</td><td>¥300</td></tr>" * 20 + "</body></html>", subtype="html")
+        messages.append(msg)
+    return messages
+
+
+def per_message(host: str, port: int, messages: List[EmailMessage]) -> float:
+    """Seconds spent sending each message on its own connection."""
+    started = time.perf_counter()
+    for msg in messages:
+        with smtplib.SMTP(host, port) as smtp:
+            smtp.send_message(msg)
+    return time.perf_counter() - started
+
+
+async def pooled(messages: List[EmailMessage], pool_size: int, window: float) -> tuple:
+    """(total seconds, seconds the loop spent inside send())"""
+    from app.services.mail_delivery import MailQueue, SMTPPool
+
+    queue = MailQueue(SMTPPool(size=pool_size), window=window)
+    queue.start()
+    started = time.perf_counter()
+    blocked = 0.0
+    for msg in messages:
+        call = time.perf_counter()
+        queue.send(msg)
+        blocked += time.perf_counter() - call
+        await asyncio.sleep(0)
+    await queue.stop()
+    stats = queue.stats()
+    if stats["sent"] != len(messages):
+        raise RuntimeError(f"pooled delivery incomplete: {stats}")
+    return time.perf_counter() - started, blocked
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.email", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="sink delay per SMTP reply")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--batch-window", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    from app.core.config import settings
+    from app.tools.smtp_sink import SMTPSink
+
+    messages = build_messages(args.messages)
+    print(f"{'mode':<14}{'msgs':>6}{'msg/s':>9}{'sessions':>10}{'blocked ms/msg':>16}")
+    with SMTPSink(latency=args.latency_ms / 1000) as sink:
+        settings.EMAIL_SMTP_HOST, settings.EMAIL_SMTP_PORT = sink.host, sink.port
+        settings.EMAIL_USE_TLS = False
+        settings.EMAIL_SMTP_USER = settings.EMAIL_SMTP_PASSWORD = ""
+
+        elapsed = per_message(sink.host, sink.port, messages)
+        print(
+            f"{'per-message':<14}{len(messages):>6}{len(messages) / elapsed:>9.1f}"
+            f"{sink.sessions:>10}{elapsed * 1000 / len(messages):>16.2f}"
+        )
+
+        sessions_before = sink.sessions
+        elapsed, blocked = asyncio.run(pooled(messages, args.pool_size, args.batch_window))
+        print(
+            f"{'pooled':<14}{len(messages):>6}{len(messages) / elapsed:>9.1f}"
+            f"{sink.sessions - sessions_before:>10}{blocked * 1000 / len(messages):>16.3f}"
+        )
+        if len(sink.messages) != 2 * len(messages):
+            raise SystemExit(f"sink received {len(sink.messages)} of {2 * len(messages)} messages")
+
+
+if __name__ == "__main__":
+    main()
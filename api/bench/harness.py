@@ -0,0 +1,176 @@
+"""
+In-process application harness for the benchmark.
+
+Boots ``app.main:app`` behind an ``httpx.ASGITransport`` and replaces the
+external dependencies that would otherwise dominate (or break) a local run:
+
+* LINE ID token verification -> the bearer token *is* the LINE user id
+* LINE Messaging API pushes  -> counted no-ops
+* Admin login                -> a JWT minted for a dedicated bench admin
+
+The application must be imported only after DATABASE_URL is final, so
+everything here imports ``app`` lazily.
+"""
+from typing import List, Optional
+
+import httpx
+from fastapi import Header, HTTPException, Query, status
+from sqlalchemy import func, or_, select
+
+
+class StubLineMessaging:
+    """Stands in for LineNotificationService network calls."""
+
+    def __init__(self) -> None:
+        self.pushed = 0
+
+    async def get_access_token(self, channel_id: str, channel_secret: str, long_lived_token: str = None) -> str:
+        return "bench-line-token"
+
+    async def send_push_message(self, token: str, to_user_id: str, text: str):
+        self.pushed += 1
+
+
+async def stub_line_user_id(
+    authorization: Optional[str] = Header(None),
+    token: Optional[str] = Query(None),
+) -> str:
+    """LINE verifier stub: accepts ``Bearer <line_user_id>`` as-is."""
+    value = None
+    if authorization and authorization.lower().startswith("bearer "):
+        value = authorization.split(" ", 1)[1].strip()
+    value = value or token
+    if not value:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="missing bench token")
+    return value
+
+
+class BenchFixtures:
+    """Ids sampled from the database that scenarios draw from."""
+
+    def __init__(self) -> None:
+        self.consumer_line_ids: List[str] = []
+        self.restaurants: List[dict] = []
+        self.product_ids: List[int] = []
+        self.retail_product_ids: List[int] = []
+        self.slot_ids: List[int] = []
+        self.order_ids: List[int] = []
+        self.aggregation_dates: List[str] = []
+        self.admin_token: str = ""
+
+    def validate(self) -> None:
+        missing = [
+            name for name in (
+                "consumer_line_ids", "restaurants", "product_ids",
+                "retail_product_ids", "slot_ids", "order_ids",
+            )
+            if not getattr(self, name)
+        ]
+        if missing:
+            raise SystemExit(
+                f"Benchmark database has no usable {', '.join(missing)}; "
+                "run with --prepare (or python -m app.tools.synth) first."
+            )
+
+
+async def load_fixtures(sample_size: int = 500) -> BenchFixtures:
+    from app.core.database import AsyncSessionLocal
+    from app.core.security import create_access_token, get_password_hash
+    from app.models import Consumer, DeliverySlot, Farmer, Order, Product, Restaurant, RetailProduct
+    from app.models.admin import Admin
+
+    fixtures = BenchFixtures()
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(Consumer.line_user_id)
+            .where(Consumer.is_active == 1, Consumer.name.isnot(None), Consumer.phone_number.isnot(None))
+            .order_by(Consumer.id)
+            .limit(sample_size)
+        )
+        fixtures.consumer_line_ids = [r[0] for r in rows]
+
+        rows = await db.execute(
+            select(Restaurant.id, Restaurant.address, Restaurant.phone_number)
+            .where(Restaurant.deleted_at.is_(None))
+            .order_by(Restaurant.id)
+            .limit(sample_size)
+        )
+        fixtures.restaurants = [
+            {"id": r.id, "address": r.address, "phone": r.phone_number} for r in rows
+        ]
+
+        rows = await db.execute(
+            select(Product.id)
+            .join(Product.farmer)
+            .where(
+                Product.is_active == 1,
+                Product.deleted_at.is_(None),
+                Farmer.is_active == 1,
+                # create_order rejects quantities above stock; scenarios order up to 10
+                or_(Product.stock_quantity.is_(None), Product.stock_quantity >= 10),
+            )
+            .order_by(Product.id)
+            .limit(sample_size)
+        )
+        fixtures.product_ids = [r[0] for r in rows]
+
+        rows = await db.execute(
+            select(RetailProduct.id)
+            .join(RetailProduct.source_product)
+            .join(Product.farmer)
+            .where(
+                RetailProduct.is_active == 1,
+                RetailProduct.deleted_at.is_(None),
+                Farmer.is_active == 1,
+            )
+            .order_by(RetailProduct.id)
+            .limit(sample_size)
+        )
+        fixtures.retail_product_ids = [r[0] for r in rows]
+
+        rows = await db.execute(
+            select(DeliverySlot.id)
+            .where(DeliverySlot.is_active.is_(True), DeliverySlot.date >= func.current_date())
+            .order_by(DeliverySlot.date)
+            .limit(50)
+        )
+        fixtures.slot_ids = [r[0] for r in rows]
+
+        rows = await db.execute(select(Order.id).order_by(Order.id.desc()).limit(sample_size))
+        fixtures.order_ids = [r[0] for r in rows]
+
+        rows = await db.execute(
+            select(func.date(Order.delivery_date)).group_by(func.date(Order.delivery_date))
+            .order_by(func.date(Order.delivery_date).desc()).limit(30)
+        )
+        fixtures.aggregation_dates = [str(r[0])[:10] for r in rows]
+
+        admin = (await db.execute(select(Admin).where(Admin.email == "bench@refarm.local"))).scalar_one_or_none()
+        if admin is None:
+            admin = Admin(
+                email="bench@refarm.local",
+                hashed_password=get_password_hash("bench-only"),
+                role="super_admin",
+            )
+            db.add(admin)
+            await db.commit()
+        fixtures.admin_token = create_access_token({"sub": admin.email, "role": "super_admin"})
+
+    fixtures.validate()
+    return fixtures
+
+
+def build_client(base_url: str = "http://bench") -> tuple:
+    """Return (httpx.AsyncClient, StubLineMessaging) wired to the in-process app."""
+    from app.core.dependencies import get_line_user_id
+    from app.main import app
+    from app.services.line_notify import line_service
+
+    stub = StubLineMessaging()
+    line_service.get_access_token = stub.get_access_token
+    line_service.send_push_message = stub.send_push_message
+    app.dependency_overrides[get_line_user_id] = stub_line_user_id
+
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60.0)
+    return client, stub
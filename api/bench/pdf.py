@@ -0,0 +1,156 @@
+"""
+Invoice PDF renderer benchmark.
+
+    python -m bench.pdf [--lines 1,50,500] [--runs 5] [--renderers weasyprint,reportlab]
+
+Renders synthetic invoices (8% produce lines, every tenth line at 10%, plus
+a shipping fee) through ``generate_invoice_pdf`` with each ``PDF_RENDERER``
+and reports:
+
+- ``cold ms``: first render in a fresh process (imports, fonts, stylesheet
+  parsing, template compilation included),
+- ``warm ms``: first render in a fresh process after ``warm_up_renderers()``,
+  i.e. what the first request sees once the startup warm-up has finished,
+- ``median ms``: steady-state render time over ``--runs`` renders,
+- peak Python allocation (tracemalloc; native allocations inside
+  Pango/Cairo are not included) and PDF size.
+
+Peak allocation is taken from one extra render so tracing does not skew the
+timings.
+"""
+import argparse
+from datetime import datetime
+from decimal import Decimal
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import List
+
+RENDERERS = ("weasyprint", "reportlab")
+
+
+def build_order(lines: int) -> SimpleNamespace:
+    items = []
+    subtotal = tax = 0
+    for i in range(lines):
+        rate = 10 if i % 10 == 9 else 8
+        quantity = 1 + i % 7
+        unit_price = 120 + (i * 37) % 900
+        line_subtotal = quantity * unit_price
+        line_tax = line_subtotal * rate // 100
+        subtotal += line_subtotal
+        tax += line_tax
+        items.append(SimpleNamespace(
+            product_name=f"神戸産 野菜 {i + 1:03d}",
+            product_unit="個" if rate == 8 else "袋",
+            quantity=quantity,
+            unit_price=Decimal(unit_price),
+            tax_rate=rate,
+            subtotal=Decimal(line_subtotal),
+            tax_amount=Decimal(line_tax),
+        ))
+    shipping_fee = 800
+    return SimpleNamespace(
+        id=lines,
+        created_at=datetime(2026, 10, 1, 9, 0),
+        confirmed_at=datetime(2026, 10, 1, 10, 0),
+        shipping_fee=shipping_fee,
+        subtotal=Decimal(subtotal),
+        tax_amount=Decimal(tax),
+        total_amount=Decimal(subtotal + tax + shipping_fee),
+        restaurant=SimpleNamespace(name="ベンチマーク食堂"),
+        order_items=items,
+    )
+
+
+def measure(render, order, runs: int) -> dict:
+    render(order)  # discard the first render
+    timings: List[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        render(order)
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    pdf = render(order)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(timings), "peak_mb": peak / 1e6, "pdf_kb": len(pdf) / 1024}
+
+
+def first_render(renderer: str, lines: int, warm: bool) -> dict:
+    """Time the first render in this (fresh) process."""
+    from app.core.config import settings
+
+    settings.PDF_RENDERER = renderer
+    order = build_order(lines)
+    result = {"warm_up_ms": 0.0}
+    if warm:
+        from app.services.pdf import warm_up_renderers
+
+        started = time.perf_counter()
+        warm_up_renderers()
+        result["warm_up_ms"] = (time.perf_counter() - started) * 1000
+
+    from app.services.invoice import generate_invoice_pdf
+
+    started = time.perf_counter()
+    generate_invoice_pdf(order)
+    result["first_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def first_render_subprocess(renderer: str, lines: int, warm: bool) -> dict:
+    argv = [sys.executable, "-m", "bench.pdf", "--first-render", renderer, "--lines", str(lines)]
+    if warm:
+        argv.append("--warm")
+    proc = subprocess.run(argv, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.pdf", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", default="1,50,500", help="comma-separated order sizes")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--renderers", default=",".join(RENDERERS))
+    parser.add_argument("--first-render", metavar="RENDERER", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.first_render:
+        # Child process for the cold / warm first-render columns
+        print(json.dumps(first_render(args.first_render, int(args.lines), args.warm)))
+        return
+
+    from app.core.config import settings
+    from app.services.invoice import generate_invoice_pdf
+
+    sizes = [int(n) for n in args.lines.split(",")]
+    print(
+        f"{'renderer':<12}{'lines':>6}{'cold ms':>10}{'warm ms':>10}{'median ms':>12}"
+        f"{'peak MB':>10}{'PDF KB':>9}"
+    )
+    for renderer in args.renderers.split(","):
+        settings.PDF_RENDERER = renderer
+        for lines in sizes:
+            try:
+                result = measure(generate_invoice_pdf, build_order(lines), args.runs)
+                cold = first_render_subprocess(renderer, lines, warm=False)
+                warm = first_render_subprocess(renderer, lines, warm=True)
+            except (ImportError, OSError, RuntimeError) as e:
+                # WeasyPrint needs Pango/Cairo system libraries
+                print(f"{renderer:<12}{lines:>6}  unavailable: {str(e).splitlines()[0]}")
+                break
+            print(
+                f"{renderer:<12}{lines:>6}{cold['first_ms']:>10.1f}{warm['first_ms']:>10.1f}"
+                f"{result['median_ms']:>12.1f}{result['peak_mb']:>10.1f}{result['pdf_kb']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark scenarios.
+
+Each scenario is one "user journey" made of several requests. Every request
+is timed and recorded under a stable endpoint label so runs can be compared
+with bench/baseline.json.
+"""
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from bench.harness import BenchFixtures
+from bench.stats import Recorder
+
+logger = logging.getLogger("bench")
+
+
+class Session:
+    """A virtual user: shared client, fixture ids, its own RNG."""
+
+    def __init__(self, client: httpx.AsyncClient, fixtures: BenchFixtures, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.fixtures = fixtures
+        self.recorder = recorder
+        self.rng = rng
+
+    async def request(self, label: str, method: str, url: str, expect=(200,), **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            # Drain streamed bodies (PDFs) inside the timed section
+            await response.aread()
+            status_code = response.status_code
+        except Exception:
+            self.recorder.record(label, (time.perf_counter() - started) * 1000, 599, ok=False)
+            raise
+        ok = status_code in expect
+        self.recorder.record(label, (time.perf_counter() - started) * 1000, status_code, ok=ok)
+        if not ok:
+            logger.warning(f"{label} -> {status_code}: {response.text[:200]}")
+        return response
+
+
+async def catalog_browse(s: Session) -> None:
+    """Consumer browses the retail catalog and opens a few products."""
+    await s.request("GET /api/retail-products/", "GET", "/api/retail-products/", params={"limit": 50})
+    await s.request("GET /api/delivery-slots/", "GET", "/api/delivery-slots/")
+    for retail_id in s.rng.sample(s.fixtures.retail_product_ids, k=min(3, len(s.fixtures.retail_product_ids))):
+        await s.request("GET /api/retail-products/retail/{id}", "GET", f"/api/retail-products/retail/{retail_id}")
+    await s.request("GET /api/products/", "GET", "/api/products/", params={"limit": 50})
+
+
+async def consumer_checkout(s: Session) -> None:
+    """Consumer places a cash-on-delivery order via create_consumer_order."""
+    line_user_id = s.rng.choice(s.fixtures.consumer_line_ids)
+    items = [
+        {"retail_product_id": rid, "quantity": s.rng.randint(1, 3)}
+        for rid in s.rng.sample(s.fixtures.retail_product_ids, k=min(s.rng.randint(1, 5), len(s.fixtures.retail_product_ids)))
+    ]
+    await s.request(
+        "POST /api/consumer-orders/", "POST", "/api/consumer-orders/",
+        expect=(201,),
+        headers={"Authorization": f"Bearer {line_user_id}"},
+        json={
+            "delivery_slot_id": s.rng.choice(s.fixtures.slot_ids),
+            "payment_method": "cash_on_delivery",
+            "items": items,
+        },
+    )
+    await s.request(
+        "GET /api/consumer-orders/", "GET", "/api/consumer-orders/",
+        headers={"Authorization": f"Bearer {line_user_id}"},
+    )
+
+
+async def restaurant_order(s: Session) -> None:
+    """Restaurant places a B2B order via create_order and lists its orders."""
+    restaurant = s.rng.choice(s.fixtures.restaurants)
+    items = [
+        {"product_id": pid, "quantity": s.rng.randint(1, 10)}
+        for pid in s.rng.sample(s.fixtures.product_ids, k=min(s.rng.randint(2, 8), len(s.fixtures.product_ids)))
+    ]
+    delivery = (datetime.now() + timedelta(days=s.rng.randint(1, 7))).replace(hour=0, minute=0, second=0, microsecond=0)
+    await s.request(
+        "POST /api/orders/", "POST", "/api/orders/",
+        expect=(201,),
+        json={
+            "restaurant_id": restaurant["id"],
+            "delivery_date": delivery.isoformat(),
+            "delivery_time_slot": "12-14",
+            "delivery_address": restaurant["address"],
+            "delivery_phone": restaurant["phone"],
+            "items": items,
+        },
+    )
+    await s.request("GET /api/orders/", "GET", "/api/orders/", params={"restaurant_id": restaurant["id"], "limit": 20})
+
+
+async def admin_aggregation(s: Session) -> None:
+    """Admin dashboard: daily procurement aggregation and consumer analytics."""
+    if s.fixtures.aggregation_dates:
+        await s.request(
+            "GET /api/orders/aggregation/daily", "GET", "/api/orders/aggregation/daily",
+            params={"date": s.rng.choice(s.fixtures.aggregation_dates)},
+        )
+    await s.request(
+        "GET /api/admin/consumer-analytics/summary", "GET", "/api/admin/consumer-analytics/summary",
+        headers={"Authorization": f"Bearer {s.fixtures.admin_token}"},
+    )
+
+
+async def pdf_download(s: Session) -> None:
+    """Restaurant downloads an invoice and a delivery slip."""
+    order_id = s.rng.choice(s.fixtures.order_ids)
+    await s.request(
+        "GET /api/orders/{id}/invoice", "GET", f"/api/orders/{order_id}/invoice",
+        params={"no_notify": "true"},
+    )
+    await s.request(
+        "GET /api/orders/{id}/delivery_slip", "GET", f"/api/orders/{order_id}/delivery_slip",
+        params={"no_notify": "true"},
+    )
+
+
+# name -> (coroutine, weight in the default mix)
+SCENARIOS = {
+    "catalog": (catalog_browse, 50),
+    "checkout": (consumer_checkout, 20),
+    "restaurant_order": (restaurant_order, 15),
+    "admin": (admin_aggregation, 10),
+    "pdf": (pdf_download, 5),
+}
@@ -0,0 +1,170 @@
+"""
+JSON serialization benchmark for large list responses.
+
+    python -m bench.serialization [--sizes 100,1000] [--runs 20]
+
+Times how long a page of ``--sizes`` items takes to become response bytes,
+with the same in-memory data for both paths (no database):
+
+- ``orders``: ``OrderListResponse`` built from unsaved ``Order`` rows with
+  items, products, farmers and restaurants. The current path is FastAPI's
+  ``response_model`` handling plus ``JSONResponse``; the fast path is
+  ``model_response`` (one ``TypeAdapter`` validation, pydantic-core JSON).
+- ``catalog``: consumer retail catalog dicts (``GET /api/retail-products``).
+  The current path is ``jsonable_encoder`` plus ``JSONResponse``; the fast
+  path is ``FastJSONResponse`` (orjson).
+- ``summary``: ``view=summary`` order rows. The current path builds one
+  ``OrderSummary`` per row (``model_construct`` + ``model_dump``); the fast
+  path is ``Projection.rows`` with ``SchemaJSONResponse``.
+
+Both paths must produce the same JSON; the benchmark exits with status 1
+otherwise.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import json
+import random
+import statistics
+import time
+
+from bench.catalog_shape import build_dataset as build_products
+
+
+def build_orders(count: int, products: list, seed: int = 7) -> list:
+    from app.models import Order, OrderItem, Restaurant
+    from app.models.enums import DeliveryTimeSlot, OrderStatus
+
+    rng = random.Random(seed)
+    created = datetime(2026, 9, 1, 10, 0, tzinfo=timezone(timedelta(hours=9)))
+    restaurants = [Restaurant(id=rid, name=f"レストラン {rid}") for rid in range(1, 51)]
+    orders = []
+    item_id = 0
+    for oid in range(1, count + 1):
+        restaurant = rng.choice(restaurants)
+        items = []
+        for product in rng.sample(products, k=4):
+            item_id += 1
+            quantity = rng.randrange(1, 10)
+            subtotal = product.price * quantity
+            items.append(OrderItem(
+                id=item_id, order_id=oid, product_id=product.id, product=product, quantity=quantity,
+                unit_price=product.price, tax_rate=8, subtotal=subtotal,
+                tax_amount=(subtotal * Decimal("0.08")).quantize(Decimal("1")),
+                total_amount=(subtotal * Decimal("1.08")).quantize(Decimal("1")),
+                product_name=product.name, product_unit=product.unit,
+                created_at=created, updated_at=created,
+            ))
+        subtotal = sum(item.subtotal for item in items)
+        orders.append(Order(
+            id=oid, restaurant_id=restaurant.id, restaurant=restaurant, order_items=items,
+            delivery_date=created + timedelta(days=2), delivery_time_slot=DeliveryTimeSlot.SLOT_12_14,
+            delivery_address="兵庫県神戸市中央区", delivery_phone="078-000-0000",
+            status=OrderStatus.CONFIRMED, subtotal=subtotal,
+            tax_amount=sum(item.tax_amount for item in items), shipping_fee=0,
+            total_amount=sum(item.total_amount for item in items), invoice_url=None,
+            confirmed_at=created, shipped_at=None, delivered_at=None, cancelled_at=None,
+            created_at=created, updated_at=created,
+        ))
+    return orders
+
+
+def summary_rows(orders: list, names: list) -> list:
+    values = {
+        "restaurant_name": lambda order: order.restaurant.name,
+        "item_count": lambda order: len(order.order_items),
+    }
+    return [
+        tuple(values[name](order) if name in values else getattr(order, name) for name in names)
+        for order in orders
+    ]
+
+
+def current_model(schema, content) -> bytes:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    field = _fields.get(schema)
+    if field is None:
+        # FastAPI builds the response field once per route
+        field = _fields[schema] = create_response_field(name=f"Response_{schema.__name__}", type_=schema)
+    return JSONResponse(asyncio.run(serialize_response(field=field, response_content=schema(**content)))).body
+
+
+_fields = {}
+
+
+def current_dicts(content) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def current_summary(projection, rows, names) -> bytes:
+    from fastapi.responses import JSONResponse
+
+    include = set(names)
+    items = [
+        projection.schema.model_construct(**dict(zip(names, row))).model_dump(mode="json", include=include)
+        for row in rows
+    ]
+    return JSONResponse({"items": items, "total": len(items)}).body
+
+
+def cases(size: int):
+    """``(name, current, fast)`` callables for a page of ``size`` items."""
+    from app.core.fast_json import FastJSONResponse, SchemaJSONResponse, model_response
+    from app.routers.orders import ORDER_SUMMARY
+    from app.routers.retail_products import _product_to_retail_dict
+    from app.schemas import OrderListResponse
+
+    products = build_products(max(size, 100), 25)
+    orders = build_orders(size, products)
+    page = {"items": orders, "total": size, "skip": 0, "limit": size}
+    catalog = {"items": [_product_to_retail_dict(p) for p in products[:size]], "total": size, "skip": 0, "limit": size}
+    names = ORDER_SUMMARY.default
+    rows = summary_rows(orders, names)
+    return [
+        ("orders",
+         lambda: current_model(OrderListResponse, page),
+         lambda: model_response(OrderListResponse, page).body),
+        ("catalog",
+         lambda: current_dicts(catalog),
+         lambda: FastJSONResponse(catalog).body),
+        ("summary",
+         lambda: current_summary(ORDER_SUMMARY, rows, names),
+         lambda: SchemaJSONResponse({"items": ORDER_SUMMARY.rows(rows, names), "total": len(rows)}).body),
+    ]
+
+
+def measure(fn, runs: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.serialization", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000", help="comma-separated page sizes")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<10}{'items':>7}{'bytes':>11}{'current ms':>12}{'fast ms':>10}{'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for name, current, fast in cases(size):
+            body = current()
+            if json.loads(body) != json.loads(fast()):
+                raise SystemExit(f"{name}: fast path output differs from the current path ({size} items)")
+            base, elapsed = measure(current, args.runs), measure(fast, args.runs)
+            print(f"{name:<10}{size:>7}{len(body):>11}{base:>12.2f}{elapsed:>10.2f}{base / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
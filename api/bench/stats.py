@@ -0,0 +1,131 @@
+"""
+Latency statistics, reporting and baseline comparison.
+"""
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# A percentile is only compared against its budget with at least this many samples
+MIN_SAMPLES = {"p50_ms": 5, "p95_ms": 20, "p99_ms": 100}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    """Collected samples for one endpoint label."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.latencies_ms: List[float] = []
+        self.errors = 0
+        self.status_codes: Dict[int, int] = {}
+
+    def record(self, latency_ms: float, status_code: int, ok: bool) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed_s: float) -> dict:
+        values = sorted(self.latencies_ms)
+        count = len(values)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "rps": round(count / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(values[-1], 2) if values else 0.0,
+        }
+
+
+class Recorder:
+    """Per-endpoint sample store shared by all virtual users."""
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    def record(self, name: str, latency_ms: float, status_code: int, ok: bool) -> None:
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats(name)
+        stats.record(latency_ms, status_code, ok)
+
+    def report(self, elapsed_s: float) -> Dict[str, dict]:
+        return {name: stats.summary(elapsed_s) for name, stats in sorted(self.endpoints.items())}
+
+
+def format_report(report: Dict[str, dict], elapsed_s: float) -> str:
+    header = f"{'endpoint':<42} {'count':>7} {'err':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}"
+    lines = [header, "-" * len(header)]
+    total = 0
+    for name, row in report.items():
+        total += row["count"]
+        lines.append(
+            f"{name:<42} {row['count']:>7} {row['errors']:>5} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f}ms {row['p95_ms']:>8.1f}ms {row['p99_ms']:>8.1f}ms"
+        )
+    lines.append("-" * len(header))
+    lines.append(f"total {total} requests in {elapsed_s:.1f}s ({total / elapsed_s if elapsed_s else 0:.1f} req/s)")
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {"tolerance": 0.2, "endpoints": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(report: Dict[str, dict], baseline: dict, tolerance: Optional[float] = None) -> List[str]:
+    """
+    Compare a run against baseline budgets.
+
+    Each baseline endpoint may define ``p50_ms`` / ``p95_ms`` / ``p99_ms``
+    ceilings and a ``min_rps`` floor. A metric regresses when it is worse
+    than its budget by more than ``tolerance`` (fraction, default from the
+    baseline file). Tail percentiles are only judged once enough samples
+    exist (see MIN_SAMPLES). Endpoints with errors always fail.
+    """
+    tol = baseline.get("tolerance", 0.2) if tolerance is None else tolerance
+    failures = []
+    for name, budget in baseline.get("endpoints", {}).items():
+        row = report.get(name)
+        if row is None:
+            continue
+        for metric, min_count in MIN_SAMPLES.items():
+            if row["count"] < min_count:
+                continue
+            if metric in budget and row[metric] > budget[metric] * (1 + tol):
+                failures.append(
+                    f"{name}: {metric} {row[metric]:.1f} > budget {budget[metric]:.1f} (+{tol:.0%})"
+                )
+        if "min_rps" in budget and row["rps"] < budget["min_rps"] * (1 - tol):
+            failures.append(f"{name}: rps {row['rps']:.1f} < budget {budget['min_rps']:.1f} (-{tol:.0%})")
+    for name, row in report.items():
+        if row["errors"]:
+            failures.append(f"{name}: {row['errors']} failed requests")
+    return failures
+
+
+def baseline_from_report(report: Dict[str, dict], tolerance: float, headroom: float = 2.0) -> dict:
+    """Build a baseline file from a run, with ``headroom`` on each latency."""
+    return {
+        "tolerance": tolerance,
+        "endpoints": {
+            name: {
+                "p50_ms": round(row["p50_ms"] * headroom, 1),
+                "p95_ms": round(row["p95_ms"] * headroom, 1),
+                "p99_ms": round(row["p99_ms"] * headroom, 1),
+            }
+            for name, row in report.items()
+        },
+    }
@@ -0,0 +1,29 @@
+"""add app_meta table for startup sentinels (seed gating)
+
+Revision ID: 20261018_1200
+Revises: 20260527_1200
+Create Date: 2026-10-18 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261018_1200'
+down_revision = '20260527_1200'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'app_meta',
+        sa.Column('key', sa.String(100), nullable=False, comment='キー'),
+        sa.Column('value', sa.String(500), nullable=True, comment='値'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='作成日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='更新日時'),
+        sa.PrimaryKeyConstraint('key'),
+        comment='アプリ内部メタ情報テーブル',
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('app_meta')
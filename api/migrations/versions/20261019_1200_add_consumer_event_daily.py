@@ -0,0 +1,34 @@
+"""add consumer_event_daily rollup table
+
+Revision ID: 20261019_1200
+Revises: 20261018_1200
+Create Date: 2026-10-19 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_1200'
+down_revision = '20261018_1200'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'consumer_event_daily',
+        sa.Column('day', sa.Date(), nullable=False, comment='集計日'),
+        sa.Column('total_events', sa.Integer(), nullable=False, comment='イベント総数'),
+        sa.Column('event_counts', sa.JSON(), nullable=False, comment='イベント種別ごとの件数'),
+        sa.Column('product_views', sa.JSON(), nullable=False, comment='商品閲覧数 [[商品ID, 商品名, 件数], ...]'),
+        sa.Column('search_counts', sa.JSON(), nullable=False, comment='検索キーワードごとの件数'),
+        sa.Column('unique_consumers', sa.Integer(), nullable=False, comment='ユニーク消費者数(推定)'),
+        sa.Column('consumer_sketch', sa.LargeBinary(), nullable=True, comment='ユニーク消費者のHyperLogLog'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='作成日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='更新日時'),
+        sa.PrimaryKeyConstraint('day'),
+        comment='消費者行動イベント日次集計テーブル',
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('consumer_event_daily')
@@ -0,0 +1,36 @@
+"""add consumer_event_sketches table for live analytics
+
+Revision ID: 20261019_1300
+Revises: 20261019_1200
+Create Date: 2026-10-19 13:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_1300'
+down_revision = '20261019_1200'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'consumer_event_sketches',
+        sa.Column('day', sa.Date(), nullable=False, comment='集計日'),
+        sa.Column('worker_id', sa.String(100), nullable=False, comment='ワーカー識別子 (ホスト名:PID)'),
+        sa.Column('total_events', sa.Integer(), nullable=False, comment='イベント総数'),
+        sa.Column('event_counts', sa.JSON(), nullable=False, comment='イベント種別ごとの件数'),
+        sa.Column('top_products', sa.JSON(), nullable=True, comment='商品閲覧 Space-Saving サマリー'),
+        sa.Column('top_searches', sa.JSON(), nullable=True, comment='検索キーワード Space-Saving サマリー'),
+        sa.Column('product_names', sa.JSON(), nullable=True, comment='追跡中の商品名'),
+        sa.Column('consumer_sketch', sa.LargeBinary(), nullable=True, comment='ユニーク消費者のHyperLogLog'),
+        sa.Column('session_sketch', sa.LargeBinary(), nullable=True, comment='ユニークセッションのHyperLogLog'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='作成日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='更新日時'),
+        sa.PrimaryKeyConstraint('day', 'worker_id'),
+        comment='消費者行動リアルタイム集計スケッチテーブル',
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('consumer_event_sketches')
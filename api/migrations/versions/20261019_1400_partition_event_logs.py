@@ -0,0 +1,132 @@
+"""partition consumer_events / access_logs by month and add (created_at, id) indexes
+
+PostgreSQL: both tables are rebuilt as RANGE(created_at) partitioned tables
+with one partition per month (plus a DEFAULT partition) so old months can
+be archived and dropped. The primary key becomes (id, created_at) because
+a partitioned table's unique keys must include the partition key; ids
+still come from the existing sequence.
+
+Other databases only get the (created_at, id) keyset index.
+
+Revision ID: 20261019_1400
+Revises: 20261019_1300
+Create Date: 2026-10-19 14:00:00.000000
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_1400'
+down_revision = '20261019_1300'
+branch_labels = None
+depends_on = None
+
+# Secondary indexes recreated on the rebuilt tables (name, columns)
+INDEXES = {
+    'consumer_events': [
+        ('ix_consumer_events_id', ['id']),
+        ('ix_consumer_events_consumer_id', ['consumer_id']),
+        ('ix_consumer_events_session_id', ['session_id']),
+        ('ix_consumer_events_event_type', ['event_type']),
+        ('ix_consumer_events_product_id', ['product_id']),
+        ('ix_consumer_events_type_created', ['event_type', 'created_at']),
+        ('ix_consumer_events_consumer_type', ['consumer_id', 'event_type']),
+    ],
+    'access_logs': [
+        ('ix_access_logs_actor_type', ['actor_type']),
+        ('ix_access_logs_actor_id', ['actor_id']),
+        ('ix_access_logs_line_user_id', ['line_user_id']),
+        ('ix_access_logs_created_at', ['created_at']),
+    ],
+}
+KEYSET_INDEXES = {
+    'consumer_events': 'ix_consumer_events_created_id',
+    'access_logs': 'ix_access_logs_created_id',
+}
+FOREIGN_KEYS = {
+    'consumer_events': [
+        "FOREIGN KEY (consumer_id) REFERENCES consumers(id) ON DELETE SET NULL",
+    ],
+    'access_logs': [],
+}
+TABLE_COMMENTS = {
+    'consumer_events': '消費者行動イベントログテーブル',
+    'access_logs': None,
+}
+MONTHS_AHEAD = 3
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def _create_month_partitions(table: str, parent: str, first: date, last: date) -> None:
+    month = date(first.year, first.month, 1)
+    while month <= last:
+        following = _next_month(month)
+        op.execute(
+            f"CREATE TABLE {table}_y{month.year}m{month.month:02d} PARTITION OF {parent} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    bind = op.get_bind()
+    staging = f"{table}_rebuild"
+    sequence = f"{table}_id_seq"
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING COMMENTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id, created_at)")
+        oldest = bind.execute(sa.text(f"SELECT min(created_at) FROM {table}")).scalar()
+        today = date.today()
+        first = oldest.date() if oldest else today
+        last = today
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last)
+        _create_month_partitions(table, staging, first, last)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {staging} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING COMMENTS)")
+        op.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id)")
+
+    op.execute(f"INSERT INTO {staging} SELECT * FROM {table}")
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+    op.execute(f"DROP TABLE {table} CASCADE")
+    op.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {staging}_pkey TO {table}_pkey")
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    if TABLE_COMMENTS[table]:
+        op.execute(f"COMMENT ON TABLE {table} IS '{TABLE_COMMENTS[table]}'")
+
+    for name, columns in INDEXES[table]:
+        op.create_index(name, table, columns)
+    op.create_index(KEYSET_INDEXES[table], table, ['created_at', 'id'])
+    for fk in FOREIGN_KEYS[table]:
+        op.execute(f"ALTER TABLE {table} ADD {fk}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        for table, name in KEYSET_INDEXES.items():
+            op.create_index(name, table, ['created_at', 'id'])
+        return
+
+    for table in ('consumer_events', 'access_logs'):
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        for table, name in KEYSET_INDEXES.items():
+            op.drop_index(name, table_name=table)
+        return
+
+    for table in ('consumer_events', 'access_logs'):
+        _rebuild(table, partitioned=False)
+        op.drop_index(KEYSET_INDEXES[table], table_name=table)
@@ -0,0 +1,57 @@
+"""add app_settings table and import the JSON settings files
+
+Delivery and general settings lived in app/data/settings.json and
+app/data/general_settings.json, one copy per container. They move into
+app_settings (keys "delivery" and "general"); files found on the host
+running the migration are imported, otherwise the defaults apply.
+
+Revision ID: 20261019_1500
+Revises: 20261019_1400
+Create Date: 2026-10-19 15:00:00.000000
+"""
+import json
+from pathlib import Path
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_1500'
+down_revision = '20261019_1400'
+branch_labels = None
+depends_on = None
+
+DATA_DIR = Path(__file__).resolve().parents[2] / 'app' / 'data'
+# app_settings key -> legacy file
+LEGACY_FILES = {
+    'delivery': 'settings.json',
+    'general': 'general_settings.json',
+}
+
+
+def upgrade() -> None:
+    app_settings = op.create_table(
+        'app_settings',
+        sa.Column('key', sa.String(100), nullable=False, comment='設定キー'),
+        sa.Column('value', sa.JSON(), nullable=False, comment='設定値'),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1', comment='更新バージョン'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='作成日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment='更新日時'),
+        sa.PrimaryKeyConstraint('key'),
+        comment='システム設定テーブル',
+    )
+
+    rows = []
+    for key, filename in LEGACY_FILES.items():
+        path = DATA_DIR / filename
+        try:
+            value = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if isinstance(value, dict):
+            rows.append({'key': key, 'value': value, 'version': 1})
+    if rows:
+        op.bulk_insert(app_settings, rows)
+
+
+def downgrade() -> None:
+    op.drop_table('app_settings')
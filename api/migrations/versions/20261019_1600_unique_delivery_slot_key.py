@@ -0,0 +1,61 @@
+"""unique (date, slot_type, time_text) on delivery_slots
+
+Checkout creates a slot on the fly when the consumer picks a label that has
+no slot yet. The unique key lets concurrent checkouts for the same label
+converge on one row instead of inserting duplicates. Existing duplicates
+are merged into the lowest id first (orders and procurement batches are
+re-pointed, the merged slot stays active if any duplicate was).
+
+Revision ID: 20261019_1600
+Revises: 20261019_1500
+Create Date: 2026-10-19 16:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_1600'
+down_revision = '20261019_1500'
+branch_labels = None
+depends_on = None
+
+REFERENCING_TABLES = ('consumer_orders', 'procurement_batches')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    duplicates = conn.execute(sa.text(
+        """
+        SELECT d.id, k.keep_id, d.is_active
+        FROM delivery_slots d
+        JOIN (
+            SELECT date, slot_type, time_text, MIN(id) AS keep_id
+            FROM delivery_slots
+            GROUP BY date, slot_type, time_text
+            HAVING COUNT(*) > 1
+        ) k ON d.date = k.date AND d.slot_type = k.slot_type AND d.time_text = k.time_text
+        WHERE d.id <> k.keep_id
+        """
+    )).all()
+    for dup_id, keep_id, is_active in duplicates:
+        for table in REFERENCING_TABLES:
+            conn.execute(
+                sa.text(f"UPDATE {table} SET delivery_slot_id = :keep WHERE delivery_slot_id = :dup"),
+                {"keep": keep_id, "dup": dup_id},
+            )
+        if is_active:
+            conn.execute(
+                sa.text("UPDATE delivery_slots SET is_active = :active WHERE id = :keep"),
+                {"active": True, "keep": keep_id},
+            )
+        conn.execute(sa.text("DELETE FROM delivery_slots WHERE id = :dup"), {"dup": dup_id})
+
+    op.create_index(
+        'uq_delivery_slots_date_type_text',
+        'delivery_slots',
+        ['date', 'slot_type', 'time_text'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_delivery_slots_date_type_text', table_name='delivery_slots')
@@ -0,0 +1,29 @@
+"""index updated_at / deleted_at on products, retail_products and farmers
+
+/api/catalog/changes selects rows changed since a client's change token
+(updated_at >= t OR deleted_at >= t) on these three tables.
+
+Revision ID: 20261019_1700
+Revises: 20261019_1600
+Create Date: 2026-10-19 17:00:00.000000
+"""
+from alembic import op
+
+revision = '20261019_1700'
+down_revision = '20261019_1600'
+branch_labels = None
+depends_on = None
+
+TABLES = ('products', 'retail_products', 'farmers')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'])
+        op.create_index(f'ix_{table}_deleted_at', table, ['deleted_at'])
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_deleted_at', table_name=table)
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
@@ -0,0 +1,31 @@
+"""add row_version to products, retail_products and farmers
+
+Catalog ETags (app.core.http_cache.table_state) include sum(row_version),
+which changes on every update even when updated_at does not.
+
+Revision ID: 20261019_1800
+Revises: 20261019_1700
+Create Date: 2026-10-19 18:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_1800'
+down_revision = '20261019_1700'
+branch_labels = None
+depends_on = None
+
+TABLES = ('products', 'retail_products', 'farmers')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column('row_version', sa.BigInteger(), nullable=False, server_default='1', comment='更新カウンタ'),
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'row_version')
@@ -0,0 +1,31 @@
+"""add failed_refunds to consumer_orders
+
+Refund idempotency keys include the number of failed refunds, so a new
+cancellation attempt after a failure is not answered with the replayed
+error.
+
+Revision ID: 20261019_1900
+Revises: 20261019_1800
+Create Date: 2026-10-19 19:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20261019_1900'
+down_revision = '20261019_1800'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'consumer_orders',
+        sa.Column(
+            'failed_refunds', sa.Integer(), nullable=False, server_default='0',
+            comment='失敗した返金の回数（返金の冪等キーに使用）',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('consumer_orders', 'failed_refunds')
@@ -0,0 +1,18 @@
+"""
+Test settings: a throwaway SQLite database and no startup side effects.
+
+Values already in the environment win, so the suite can also run against a
+real database (``DATABASE_URL=postgresql+asyncpg://... pytest``).
+"""
+import os
+import tempfile
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='refarm-tests-'), 'test.db')}",
+)
+for flag in ("RUN_MIGRATIONS_ON_STARTUP", "RUN_SEED_ON_STARTUP", "PDF_WARMUP_ON_STARTUP"):
+    os.environ.setdefault(flag, "false")
+
+pytest_plugins = ["pytester"]
@@ -0,0 +1,85 @@
+"""Guest telemetry buffer: rows for a visit flushed by another worker."""
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+
+from app.core.database import Base, engine
+from app.models import Restaurant
+from app.models.guest import GuestInteraction, GuestVisit
+from app.services.guest_telemetry import GuestTelemetryBuffer
+
+
+def _foreign_keys_on(dbapi_connection, _record):
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+@pytest_asyncio.fixture
+async def foreign_keys():
+    """Enforce guest_interactions.visit_id on SQLite like PostgreSQL does, for this test only."""
+    if engine.dialect.name != "sqlite":
+        yield
+        return
+    # Pooled connections opened without the pragma must not be reused
+    await engine.dispose()
+    event.listen(engine.sync_engine, "connect", _foreign_keys_on)
+    try:
+        yield
+    finally:
+        event.remove(engine.sync_engine, "connect", _foreign_keys_on)
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def restaurant_id(foreign_keys):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        result = await conn.execute(
+            Restaurant.__table__.insert().values(name="テスト店", phone_number="000", address="兵庫県神戸市")
+        )
+    yield result.inserted_primary_key[0]
+    await engine.dispose()
+
+
+async def _interactions(visit_id: int) -> int:
+    table = GuestInteraction.__table__
+    async with engine.connect() as conn:
+        return await conn.scalar(select(func.count()).where(table.c.visit_id == visit_id))
+
+
+@pytest.mark.asyncio
+async def test_interaction_waits_for_visit_buffered_in_another_worker(restaurant_id):
+    worker_a = GuestTelemetryBuffer()
+    worker_b = GuestTelemetryBuffer(visit_wait_flushes=2)
+
+    visit_id = await worker_a.add_visit(restaurant_id, "visitor-1")
+    worker_b.add_interaction({"visit_id": visit_id, "interaction_type": "MESSAGE", "comment": "美味しかった"})
+    worker_b.log_metrics(visit_id, stay_time=42, scroll_depth=80)
+
+    # B flushes before A: nothing to reference yet, so both rows stay queued
+    assert await worker_b.flush() == 0
+    assert worker_b.stats()["pending_interactions"] == 1
+    assert worker_b.stats()["pending_metrics"] == 1
+    assert worker_b.dropped == 0
+
+    assert await worker_a.flush() == 1
+    assert await worker_b.flush() == 2
+    assert worker_b.pending == 0
+    assert worker_b.dropped == 0
+    assert await _interactions(visit_id) == 1
+    visits = GuestVisit.__table__
+    async with engine.connect() as conn:
+        stay = await conn.scalar(select(visits.c.stay_time_seconds).where(visits.c.id == visit_id))
+    assert stay == 42
+
+
+@pytest.mark.asyncio
+async def test_rows_for_a_visit_that_never_appears_are_dropped(restaurant_id):
+    worker = GuestTelemetryBuffer(visit_wait_flushes=2)
+    worker.add_interaction({"visit_id": 999_999, "interaction_type": "STAMP", "stamp_type": "LIKE"})
+
+    for _ in range(2):
+        await worker.flush()
+        assert worker.pending == 1
+    await worker.flush()
+    assert worker.pending == 0
+    assert worker.dropped == 1
@@ -0,0 +1,16 @@
+"""Cold import of app.main stays within budget and keeps heavy integrations lazy."""
+import subprocess
+import sys
+
+from app.tools.importtime import API_DIR
+
+
+def test_import_budget():
+    result = subprocess.run(
+        [sys.executable, "-m", "app.tools.importtime", "--check"],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
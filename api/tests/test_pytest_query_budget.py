@@ -0,0 +1,54 @@
+"""The ``query_budget`` pytest plugin (``app.core.pytest_query_budget``)."""
+
+TESTS = '''
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import engine
+
+
+def run(statements):
+    async def execute():
+        async with engine.connect() as conn:
+            for i in range(statements):
+                await conn.execute(text(f"SELECT {i}"))
+        await engine.dispose()
+
+    asyncio.run(execute())
+
+
+run(0)  # connect once outside any budget
+
+
+@pytest.mark.query_budget(max_statements=3)
+def test_within_budget():
+    run(3)
+
+
+@pytest.mark.query_budget(max_statements=3)
+def test_over_budget():
+    run(4)
+
+
+@pytest.mark.query_budget(max_repeats=2)
+def test_repeated_statement():
+    run(3)
+
+
+def test_fixture(query_budget):
+    with query_budget("block", max_statements=1):
+        run(2)
+'''
+
+
+def test_budget_violations_fail_the_test(pytester):
+    pytester.makepyfile(TESTS)
+    result = pytester.runpytest("-p", "app.core.pytest_query_budget")
+    result.assert_outcomes(passed=1, failed=3)
+    result.stdout.fnmatch_lines([
+        "*QueryBudgetExceeded: Query budget exceeded for *test_over_budget: 4 statements executed (budget 3)",
+        "*QueryBudgetExceeded: Query budget exceeded for *test_repeated_statement: 3x repeated (possible N+1)*",
+        "*QueryBudgetExceeded: Query budget exceeded for block: 2 statements executed (budget 1)",
+    ])
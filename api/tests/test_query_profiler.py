@@ -0,0 +1,29 @@
+"""Query profiler listeners (``app.core.query_profiler``)."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import engine
+from app.core.query_profiler import profile_queries
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_does_not_leave_a_start_time():
+    async with engine.connect() as conn:
+        with profile_queries("failing", raise_on_violation=False) as profile:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM no_such_table"))
+            await conn.execute(text("SELECT 1"))
+        assert not conn.sync_connection.info.get("query_profiler_start")
+    await engine.dispose()
+    assert profile.statement_count == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_select_gets_a_plan_and_the_connection_stays_usable():
+    async with engine.connect() as conn:
+        with profile_queries("slow", slow_ms=0, raise_on_violation=False) as profile:
+            await conn.execute(text("SELECT 1"))
+            assert (await conn.execute(text("SELECT 2"))).scalar() == 2
+    await engine.dispose()
+    assert profile.slow_queries and profile.slow_queries[0]["plan"]
@@ -9,14 +9,16 @@ import { ja } from 'date-fns/locale'
 export default function AccessLogManagement() {
   const [actorType, setActorType] = useState<'all' | 'restaurant' | 'farmer'>('all')
   const [searchText, setSearchText] = useState('')
-  const [page, setPage] = useState(0)
+  // cursors[i] は i ページ目の開始カーソル (0ページ目は undefined)
+  const [cursors, setCursors] = useState<(string | undefined)[]>([undefined])
+  const page = cursors.length - 1
   const limit = 50
 
   const { data, isLoading } = useQuery({
-    queryKey: ['admin-access-logs', actorType, page],
+    queryKey: ['admin-access-logs', actorType, cursors[page]],
     queryFn: async () => {
       const res = await adminApi.getAccessLogs({
-        skip: page * limit,
+        cursor: cursors[page],
         limit,
         actor_type: actorType === 'all' ? undefined : actorType,
       })
@@ -26,6 +28,7 @@ export default function AccessLogManagement() {
 
   const logs = data?.items || []
   const total = data?.total || 0
+  const nextCursor = data?.next_cursor || undefined
 
   const filteredLogs = useMemo(() => {
     if (!searchText) return logs
@@ -50,7 +53,7 @@ export default function AccessLogManagement() {
             value={actorType}
             onChange={(e) => {
               setActorType(e.target.value as typeof actorType)
-              setPage(0)
+              setCursors([undefined])
             }}
             className="border border-gray-300 rounded-lg px-3 py-2 text-sm"
           >
@@ -106,19 +109,19 @@ export default function AccessLogManagement() {
 
       <div className="p-4 flex items-center justify-between text-sm text-gray-600">
         <div>
-          {total > 0 ? `全 ${total} 件` : '0 件'}
+          {total > 0 ? `全 ${total}${data?.total_is_estimate ? '+' : ''} 件` : '0 件'}
         </div>
         <div className="flex gap-2">
           <button
-            onClick={() => setPage((p) => Math.max(0, p - 1))}
+            onClick={() => setCursors((c) => (c.length > 1 ? c.slice(0, -1) : c))}
             disabled={page === 0}
             className="px-3 py-1 border rounded disabled:opacity-50"
           >
             前へ
           </button>
           <button
-            onClick={() => setPage((p) => (p + 1) * limit < total ? p + 1 : p)}
-            disabled={(page + 1) * limit >= total}
+            onClick={() => nextCursor && setCursors((c) => [...c, nextCursor])}
+            disabled={!nextCursor}
             className="px-3 py-1 border rounded disabled:opacity-50"
           >
             次へ
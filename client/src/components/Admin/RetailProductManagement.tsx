@@ -123,6 +123,7 @@ export default function RetailProductManagement() {
       const res = await adminRetailProductApi.suggestPrice({
         cost_price: sp.cost_price,
         conversion_factor: parseFloat(form.conversion_factor) || 1,
+        set_quantity: parseInt(form.set_quantity) || 1,
       })
       setForm(prev => ({ ...prev, retail_price: res.data.suggested_price }))
       toast.success(`推奨価格: ${res.data.suggested_price}円`)
@@ -572,7 +572,7 @@ export const adminApi = {
     apiClient.post('/admin/guest/visits/bulk-delete', { visitor_ids: visitorIds, before_date: beforeDate }),
 
   // Access Logs
-  getAccessLogs: (params?: { skip?: number; limit?: number; actor_type?: string; actor_id?: number }) =>
+  getAccessLogs: (params?: { skip?: number; limit?: number; cursor?: string; actor_type?: string; actor_id?: number }) =>
     apiClient.get<PaginatedResponse<AccessLog>>('/admin/access-logs', { params }),
 
   // Settlement Status
@@ -719,7 +719,7 @@ export const adminRetailProductApi = {
   delete: (id: number) =>
     apiClient.delete(`/admin/retail-products/${id}`),
 
-  suggestPrice: (data: { cost_price: number; conversion_factor: number; waste_margin_pct?: number; price_multiplier?: number }) =>
+  suggestPrice: (data: { cost_price: number; conversion_factor: number; waste_margin_pct?: number; price_multiplier?: number; set_quantity?: number }) =>
     apiClient.post<{ suggested_price: string; cost_per_retail_unit: string; breakdown: string }>('/admin/retail-products/suggest-price', data),
 }
 
@@ -405,6 +405,8 @@ export interface PaginatedResponse<T> {
   total: number
   skip: number
   limit: number
+  next_cursor?: string | null
+  total_is_estimate?: boolean
 }
 
 export interface ApiError {